@@ -11,13 +11,38 @@ from io import StringIO
 from contextlib import redirect_stdout
 
 from mitosheet.errors import MitoError, make_column_exists_error, make_exec_error
-from mitosheet.state import DATAFRAME_SOURCE_AI, State
+from mitosheet.state import (DATAFRAME_SOURCE_AI, State,
+                             is_pandas_copy_on_write_enabled)
 from mitosheet.step_performers.dataframe_steps.dataframe_delete import \
     delete_dataframe_from_state
 from mitosheet.types import (AITransformFrontendResult, ColumnHeader, ColumnID,
                              DataframeReconData, ModifiedDataframeReconData)
 
+def is_same_array(old_values: Any, new_values: Any) -> bool:
+    """
+    Returns True if the two arrays are views of exactly the same data, in which 
+    case they must be equal. This is much faster than comparing their values, and 
+    is the case for unchanged columns when pandas copy on write is enabled, as 
+    then dataframes share the data of any columns that are not changed.
+    """
+    if old_values is new_values:
+        return True
+
+    if isinstance(old_values, np.ndarray) and isinstance(new_values, np.ndarray):
+        return old_values.dtype == new_values.dtype \
+            and old_values.shape == new_values.shape \
+            and old_values.strides == new_values.strides \
+            and old_values.__array_interface__['data'][0] == new_values.__array_interface__['data'][0]
+
+    return False
+
+
 def is_df_changed(old: pd.DataFrame, new: pd.DataFrame) -> bool:
+    # If the dataframes have the same axes and share the data of all columns, they are equal
+    if old.index is new.index and old.columns is new.columns and old.flags == new.flags \
+        and all(is_same_array(old.iloc[:, i]._values, new.iloc[:, i]._values) for i in range(len(old.columns))):
+        return False
+
     try:
         assert_frame_equal(old, new, check_names=False)
         return False
@@ -53,7 +78,9 @@ def exec_for_recon(code: str, original_df_map: Dict[str, pd.DataFrame]) -> Dataf
             'prints': ''
         }
 
-    df_map = {df_name: df.copy(deep=True) for df_name, df in original_df_map.items()}
+    # If copy on write is enabled, pandas makes sure the original dataframes are not changed, 
+    # and the unchanged columns share data, which makes checking for changes faster
+    df_map = {df_name: df.copy(deep=not is_pandas_copy_on_write_enabled()) for df_name, df in original_df_map.items()}
     locals_before = copy(locals())
     try:
         ast_before = ast.parse(code)
@@ -190,11 +217,15 @@ def get_shared_column_headers(old_column_headers: List[ColumnHeader], new_column
     return shared_non_null + shared_null
 
 
-def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame) -> ModifiedDataframeReconData:
+def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame, detect_modified_columns: bool=True) -> ModifiedDataframeReconData:
     """
     Given a dataframe and a modified dataframe, this function tries to figure out what has happened
     to column headers dataframe. Specifically, because our state maps column headers to do others based on column
     id, we need to track which columns are added, which are removed, and which are renamed.
+
+    Finding the modified columns requires comparing all the values in the columns in both 
+    dataframes, so if detect_modified_columns is False, we skip this and report no modified
+    columns. Callers that do not use the modified columns should do so.
     """
 
     old_columns = old_df.columns.to_list()
@@ -236,8 +267,15 @@ def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame
 
     shared_columns = get_shared_column_headers(old_columns, new_columns)
 
-    if not rows_added_or_removed:
-        modified_columns = [ch for ch in shared_columns if not old_df[ch].equals(new_df[ch])]
+    if not detect_modified_columns:
+        modified_columns = []
+    elif not rows_added_or_removed:
+        # Columns with the same data are not modified, so we only compare the values of the rest
+        same_index = old_df.index.equals(new_df.index)
+        modified_columns = [
+            ch for ch in shared_columns 
+            if not (same_index and is_same_array(old_df[ch]._values, new_df[ch]._values)) and not old_df[ch].equals(new_df[ch])
+        ]
     else:
         # If rows were added or removed, then we don't want to detect every column as having changed
         # and instead we'd just like to report the row changes. As such, we only compare the rows not added or removed
@@ -287,13 +325,17 @@ def update_state_by_reconing_dataframes(
         sheet_index: int, 
         old_df: pd.DataFrame,
         new_df: pd.DataFrame,
-        column_headers_to_column_ids: Optional[Dict[ColumnHeader, ColumnID]]=None
+        column_headers_to_column_ids: Optional[Dict[ColumnHeader, ColumnID]]=None,
+        detect_modified_columns: bool=True
     ) -> Tuple[State, ModifiedDataframeReconData]:
     """
     This function is the work-horse for modified dataframes. It compares the old dataframe at the index 
     to the new dataframe, and then updates the state accordingly -- making sure all the metadata is correct.
 
     This includes: handling deleted columns, added columns, renamed columns, and modified columns.
+
+    The state does not depend on which columns are modified, so callers that do not use the
+    returned modified columns should set detect_modified_columns to False, which is much faster.
     """
     # Check there aren't any duplicated columns in the new dataframe
     c = Counter(new_df.columns)
@@ -302,7 +344,7 @@ def update_state_by_reconing_dataframes(
         if count > 1:
             raise make_column_exists_error(ch)
 
-    modified_dataframe_recon = get_modified_dataframe_recon_data(old_df, new_df)
+    modified_dataframe_recon = get_modified_dataframe_recon_data(old_df, new_df, detect_modified_columns=detect_modified_columns)
 
     # Add new columns to the state
     if len(modified_dataframe_recon['column_recon']['created_columns']) > 0:
@@ -6,10 +6,10 @@
 """
 Contains handlers for the Mito API
 """
-from queue import Queue
-from threading import Thread
+import json
+from threading import Condition, Lock, Thread
 from time import perf_counter
-from typing import Any, Callable, Dict, NoReturn, Optional
+from typing import Any, Callable, Dict, List, NoReturn, Optional
 
 from mitosheet.api.get_saved_analysis_code import get_saved_analysis_code
 from mitosheet.api.get_all_params_for_step_type import get_all_params_for_step_type
@@ -22,7 +22,9 @@ from mitosheet.api.get_column_summary_graph import get_column_summary_graph
 from mitosheet.api.get_csv_files_metadata import get_csv_files_metadata
 from mitosheet.api.get_dataframe_as_csv import get_dataframe_as_csv
 from mitosheet.api.get_dataframe_as_excel import get_dataframe_as_excel
+from mitosheet.api.get_dataframe_window import get_dataframe_window
 from mitosheet.api.get_defined_df_names import get_defined_df_names
+from mitosheet.api.get_excel_export_chunk import get_excel_export_chunk
 from mitosheet.api.get_excel_file_metadata import get_excel_file_metadata
 from mitosheet.api.get_imported_files_and_dataframes_from_analysis_name import \
     get_imported_files_and_dataframes_from_analysis_name
@@ -51,6 +53,35 @@ from mitosheet.user.location import is_dash, is_jupyterlite, is_streamlit
 # As the column summary statistics tab does three calls, we defaulted to this max
 MAX_QUEUED_API_CALLS = 3
 
+# The number of threads that handle API calls at once
+NUM_API_WORKER_THREADS = 3
+
+# API calls that can take a long time. At most NUM_API_WORKER_THREADS - 1 of these are
+# handled at once, so that there is always a thread free for the other API calls, which 
+# are also handled before any queued slow API calls
+SLOW_API_CALL_TYPES = {
+    'get_dataframe_as_csv',
+    'get_dataframe_as_excel',
+    'get_column_summary_graph',
+    'get_ai_completion',
+    'get_pr_url_of_new_pr',
+    'get_available_snowflake_options_and_defaults',
+    'get_validate_snowflake_credentials',
+    'get_code_snippets',
+}
+
+# For these API calls, the frontend only uses the response to the most recent call for 
+# each target (e.g. the summary graph of the column the user is looking at), so a new call
+# replaces any older queued calls of the same type for the same target, even if their other
+# params differ (e.g. the search string). This maps these types to the params that are the target 
+LATEST_ONLY_API_CALL_TYPE_TARGET_PARAMS: Dict[str, List[str]] = {
+    'get_column_summary_graph': ['sheet_index', 'column_id'],
+    'get_column_describe': ['sheet_index', 'column_id'],
+    'get_unique_value_counts': ['sheet_index', 'column_id'],
+    'get_search_matches': ['sheet_index'],
+    'get_split_text_to_columns_preview': ['sheet_index', 'column_id'],
+}
+
 # NOTE: BE CAREFUL WITH THIS. When in development mode, you can set it to False
 # so the API calls are handled in the main thread, to make printing easy.
 # In newer versions of JupyterLab, to see these print statements:
@@ -77,14 +108,56 @@ def get_api_should_be_threaded() -> bool:
     return True
 
 
+def get_api_call_key(event: Dict[str, Any]) -> str:
+    """
+    Returns a key for an API call, where API calls with the same key
+    always have the same response.
+    """
+    return event['type'] + json.dumps(event['params'], sort_keys=True, default=str)
+
+
+def get_api_call_target_key(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns a key for the target of an API call, where a new API call replaces any
+    older queued API calls with the same target key. Returns None for API calls
+    that are never replaced.
+    """
+    target_params = LATEST_ONLY_API_CALL_TYPE_TARGET_PARAMS.get(event['type'])
+    if target_params is None:
+        return None
+    return event['type'] + json.dumps([event['params'].get(param) for param in target_params], default=str)
+
+
+class QueuedAPICall:
+    """
+    An API call that is waiting to be handled, or is being handled, by 
+    a worker thread.
+    """
+
+    def __init__(self, event: Dict[str, Any]):
+        self.event = event
+        self.key = get_api_call_key(event)
+        self.target_key = get_api_call_target_key(event)
+        self.slow = event['type'] in SLOW_API_CALL_TYPES
+        # The ids of all the API calls that this call responds to, as identical API 
+        # calls that are queued at the same time are only handled once
+        self.ids: List[str] = [event['id']]
+
 
 class API:
     """
-    The API provides a wrapper around a thread that responds to API calls.
+    The API provides a wrapper around a pool of threads that respond to API calls.
 
     Some notes:
     -   We allow at most MAX_QUEUED_API_CALLS API calls to be in the queue, which practically
         Stops a backlog of calls from building up.
+    -   A new API call that is identical to a queued API call is handled together with it, 
+        and both get the same response.
+    -   A new API call replaces any queued API calls for the same target (see 
+        get_api_call_target_key), which get a response of None. API calls that are 
+        already running are never replaced, and so always get their actual response.
+    -   Slow API calls (see SLOW_API_CALL_TYPES) never stop other API calls from being 
+        handled.
     -   All API calls should only be reads. This stops us from having to worry
         about most concurrency issues
     -   Note that printing inside of a thread does not work properly! Use sys.stdout.flush() after the print statement.
@@ -92,34 +165,38 @@ class API:
     """
 
     def __init__(self, steps_manager: StepsManager, mito_backend: MitoWidgetType):
-        self.api_queue: Queue = Queue(MAX_QUEUED_API_CALLS)
+        self.queued_api_calls: List[QueuedAPICall] = []
+        self.running_api_calls: List[QueuedAPICall] = []
+        self.condition = Condition()
+        self.send_lock = Lock()
 
         # Save some variables for ease
         self.steps_manager = steps_manager
         self.mito_backend = mito_backend
 
-        self.thread: Optional[Thread] = None
+        self.threads: List[Thread] = []
         self.had_first_api_call = False
 
-    def start_api_thread(self) -> None:
-        # Note that we make the thread a daemon thread, which practically means that when
-        # The process that starts this thread terminate, our API will terminate as well.
-        self.thread = Thread(
-            target=handle_api_event_thread,
-            args=(self.api_queue, self.steps_manager, self.mito_backend),
-            daemon=True,
-        )
-
-        self.thread.start()
-
+    def start_api_threads(self) -> None:
+        # Note that we make the threads daemon threads, which practically means that when
+        # The process that starts these threads terminate, our API will terminate as well.
+        for _ in range(NUM_API_WORKER_THREADS):
+            thread = Thread(
+                target=self.handle_api_calls,
+                daemon=True,
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        # We make sure only one thread sends a message at once
+        with self.send_lock:
+            self.mito_backend.mito_send(message)
 
     def process_new_api_call(self, event: Dict[str, Any]) -> None:
         """
         We privilege new API calls over old calls, and evict the old ones
-        if the API queue is full.
-
-        Because we are using a queue, only events that have not been started
-        being processed will get removed.
+        if the API queue is full, or if the new call replaces them.
 
         If the key 'priority' is in the event, then we handle it in the main
         thread, as we don't want to drop the event. For example, lazy loading
@@ -129,8 +206,8 @@ class API:
         global THREADED
 
         if not self.had_first_api_call:
-            if self.thread is None and get_api_should_be_threaded():
-                self.start_api_thread()
+            if len(self.threads) == 0 and get_api_should_be_threaded():
+                self.start_api_threads()
                 THREADED = True
             else:
                 THREADED = False
@@ -138,41 +215,97 @@ class API:
             self.had_first_api_call = True
 
         if THREADED and "priority" not in event:
+            self.queue_api_call(event)
+        else:
+            handle_api_event(self.send, event, self.steps_manager)
 
-            if self.api_queue.full():
-                # If the queue is full, we drop the first event, and just return a None
-                lost_event = self.api_queue.get()
+    def queue_api_call(self, event: Dict[str, Any]) -> None:
+        """
+        Queues the API call to be handled by the worker threads, replacing any 
+        queued API calls for the same target.
+        """
+        queued_api_call = QueuedAPICall(event)
+        lost_api_calls: List[QueuedAPICall] = []
+
+        with self.condition:
+            identical_api_call = next((old_api_call for old_api_call in self.queued_api_calls if old_api_call.key == queued_api_call.key), None)
+            if identical_api_call is not None:
+                identical_api_call.ids.append(event['id'])
+                return
+
+            if queued_api_call.target_key is not None:
+                lost_api_calls = [old_api_call for old_api_call in self.queued_api_calls if old_api_call.target_key == queued_api_call.target_key]
+                self.queued_api_calls = [old_api_call for old_api_call in self.queued_api_calls if old_api_call.target_key != queued_api_call.target_key]
+
+            if len(self.queued_api_calls) >= MAX_QUEUED_API_CALLS:
+                # If the queue is full, we drop the oldest slow call if there is one, and otherwise the oldest call
+                slow_api_calls = [old_api_call for old_api_call in self.queued_api_calls if old_api_call.slow]
+                lost_api_call = slow_api_calls[0] if len(slow_api_calls) > 0 else self.queued_api_calls[0]
+                self.queued_api_calls.remove(lost_api_call)
+                lost_api_calls.append(lost_api_call)
+
+            self.queued_api_calls.append(queued_api_call)
+            self.condition.notify_all()
+
+        # We just return a None for each of the calls we dropped
+        for lost_api_call in lost_api_calls:
+            for lost_api_call_id in lost_api_call.ids:
+                self.send({"event": "api_response", "id": lost_api_call_id, "data": None})
+
+    def _get_next_api_call(self) -> QueuedAPICall:
+        """
+        Waits for, and then returns, the next API call that a worker thread should
+        handle. This is the oldest API call that is not slow, or otherwise the oldest
+        slow API call, if there is a thread free for the other API calls.
+        """
+        with self.condition:
+            while True:
+                num_running_slow_api_calls = len([api_call for api_call in self.running_api_calls if api_call.slow])
+                can_run_slow_api_call = num_running_slow_api_calls < NUM_API_WORKER_THREADS - 1
 
-                self.mito_backend.mito_send({"event": "api_response", "id": lost_event["id"], "data": None})
+                next_api_call = next((api_call for api_call in self.queued_api_calls if not api_call.slow), None)
+                if next_api_call is None and can_run_slow_api_call:
+                    next_api_call = next((api_call for api_call in self.queued_api_calls if api_call.slow), None)
 
-            self.api_queue.put(event)
-        else:
-            handle_api_event(self.mito_backend.mito_send, event, self.steps_manager)
+                if next_api_call is not None:
+                    self.queued_api_calls.remove(next_api_call)
+                    self.running_api_calls.append(next_api_call)
+                    return next_api_call
 
+                self.condition.wait()
 
-def handle_api_event_thread(
-    queue: Queue, steps_manager: StepsManager, mito_backend: MitoWidgetType
-) -> NoReturn:
-    """
-    This is the worker thread function, that actually is
-    responsible for handling at the API call events.
+    def handle_api_calls(self) -> NoReturn:
+        """
+        This is the worker thread function, that actually is
+        responsible for handling at the API call events.
 
-    It lives forever, and just handles events as it
-    receives them from the queue
-    """
-    while True:
-        # Note that this blocks when there is nothing in the queue,
-        # and waits till there is something there - so no infinite
-        # loop as it is waiting!
-        event = queue.get()
-        # We place the API handling inside of a try catch,
-        # because otherwise if an error is thrown, then the entire thread crashes,
-        # and then the API never works again
-        try:
-            handle_api_event(mito_backend.mito_send, event, steps_manager)
-        except:
-            # Log in error if it occurs
-            log_event_processed(event, steps_manager, failed=True)
+        It lives forever, and just handles events as it
+        receives them from the queue
+        """
+        while True:
+            # Note that this blocks when there is nothing in the queue,
+            # and waits till there is something there - so no infinite
+            # loop as it is waiting!
+            api_call = self._get_next_api_call()
+
+            def send(message: Dict[str, Any]) -> None:
+                # We send the response to each of the identical calls this call responds to
+                for api_call_id in api_call.ids:
+                    self.send({**message, "id": api_call_id})
+
+            # We place the API handling inside of a try catch,
+            # because otherwise if an error is thrown, then the entire thread crashes,
+            # and then the API never works again
+            try:
+                handle_api_event(send, api_call.event, self.steps_manager)
+            except:
+                # Log in error if it occurs
+                log_event_processed(api_call.event, self.steps_manager, failed=True)
+            finally:
+                with self.condition:
+                    self.running_api_calls.remove(api_call)
+                    # A slow call finishing may let another slow call run
+                    self.condition.notify_all()
 
 
 def handle_api_event(
@@ -239,6 +372,10 @@ def handle_api_event(
             result = get_pr_url_of_new_pr(params, steps_manager)
         elif event["type"] == "get_saved_analysis_code":
             result = get_saved_analysis_code(params, steps_manager)
+        elif event["type"] == "get_dataframe_window":
+            result = get_dataframe_window(params, steps_manager)
+        elif event["type"] == "get_excel_export_chunk":
+            result = get_excel_export_chunk(params, steps_manager)
         # AUTOGENERATED LINE: API.PY CALL (DO NOT DELETE)
         else:
             raise Exception(f"Event: {event} is not a valid API call")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains a cache of the statistics of columns that the frontend shows in the
+column control panel, so that these are computed once per version of a column,
+rather than each time the user searches, sorts or reopens the panel.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.is_type_utils import is_number_dtype
+from mitosheet.types import ColumnID, StepsManagerType
+
+# The number of columns we keep the statistics of.
+MAX_CACHED_COLUMN_STATISTICS = 64
+
+# The characters that mean a search string must be searched as a regex, rather
+# than with the search index of the unique values
+REGEX_SPECIAL_CHARACTERS = set('.^$*+?{}[]\\|()')
+
+# Separates the unique values in the search index, so that matches cannot span two values
+SEARCH_INDEX_SEPARATOR = '\x00'
+
+
+class ColumnStatistics():
+    """
+    The statistics of a single column. Each statistic is computed the first
+    time it is requested, and then reused.
+    """
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+        self.lock = threading.Lock()
+
+        self._unique_value_counts_df: Optional[pd.DataFrame] = None
+        self._unique_value_strings: Optional[pd.Series] = None
+        self._sorted_unique_value_counts_dfs: Dict[str, pd.DataFrame] = {}
+        self._sorted_unique_value_search_indexes: Dict[str, Optional[Tuple[str, np.ndarray]]] = {}
+        self._describe: Optional[Dict[str, str]] = None
+        self._summary_graph_figure: Optional[Any] = None
+
+    def get_unique_value_counts_df(self) -> pd.DataFrame:
+        """
+        Returns a dataframe with the values, percents and counts of each unique
+        value in the column, in descending order of counts.
+        """
+        with self.lock:
+            if self._unique_value_counts_df is None:
+                unique_value_counts_series = self.series.value_counts(dropna=False)
+                # This is the same as value_counts with normalize=True, without counting again
+                unique_value_counts_percents_series = unique_value_counts_series / unique_value_counts_series.sum()
+
+                self._unique_value_counts_df = pd.DataFrame({
+                    'values': unique_value_counts_percents_series.index,
+                    'percents': unique_value_counts_percents_series,
+                    'counts': unique_value_counts_series
+                })
+            return self._unique_value_counts_df
+
+    def get_unique_value_strings(self) -> pd.Series:
+        """
+        Returns the string representation of each unique value, with the same
+        index as the unique value counts dataframe.
+        """
+        unique_value_counts_df = self.get_unique_value_counts_df()
+        with self.lock:
+            if self._unique_value_strings is None:
+                self._unique_value_strings = unique_value_counts_df['values'].astype('str')
+            return self._unique_value_strings
+
+    def get_sorted_unique_value_counts_df(self, sort: str) -> pd.DataFrame:
+        """
+        Returns the unique value counts dataframe sorted in the order that the
+        frontend requests, with a values_strings column for filtering.
+        """
+        unique_value_counts_df = self.get_unique_value_counts_df()
+        unique_value_strings = self.get_unique_value_strings()
+
+        with self.lock:
+            if sort in self._sorted_unique_value_counts_dfs:
+                return self._sorted_unique_value_counts_dfs[sort]
+
+            # We turn the series into a string series, so that we can
+            # easily filter on it without issues (and sort in some cases)
+            new_unique_value_counts_df = unique_value_counts_df.copy(deep=True)
+            new_unique_value_counts_df['values_strings'] = unique_value_strings
+
+            # First, we sort in the order they want
+            try:
+                if sort == 'Ascending Value':
+                    new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values', ascending=True, na_position='first')
+                elif sort == 'Descending Value':
+                    new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values', ascending=False, na_position='first')
+                elif sort == 'Ascending Occurence':
+                    new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='counts', ascending=True, na_position='first')
+                elif sort == 'Descending Occurence':
+                    new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='counts', ascending=False, na_position='first')
+            except:
+                # If the sort values throws an exception, then this must be because we have a mixed value type, and so we instead
+                # sort on the string representation of the values (as this will always work)
+                if sort == 'Ascending Value':
+                    new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values_strings', ascending=True, na_position='first')
+                elif sort == 'Descending Value':
+                    new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values_strings', ascending=False, na_position='first')
+
+            self._sorted_unique_value_counts_dfs[sort] = new_unique_value_counts_df
+            return new_unique_value_counts_df
+
+    def get_sorted_unique_value_search_index(self, sort: str) -> Optional[Tuple[str, np.ndarray]]:
+        """
+        Returns an index for searching the sorted unique values. This is all the 
+        lowercased value strings in sorted order, joined by SEARCH_INDEX_SEPARATOR,
+        and the position that each value starts at in this string.
+
+        Returns None if some value contains the separator, so cannot be indexed.
+        """
+        sorted_unique_value_counts_df = self.get_sorted_unique_value_counts_df(sort)
+
+        with self.lock:
+            if sort not in self._sorted_unique_value_search_indexes:
+                lowercased_value_strings = sorted_unique_value_counts_df['values_strings'].str.lower().tolist()
+                search_index_string = SEARCH_INDEX_SEPARATOR.join(lowercased_value_strings)
+
+                if search_index_string.count(SEARCH_INDEX_SEPARATOR) != len(lowercased_value_strings) - 1:
+                    self._sorted_unique_value_search_indexes[sort] = None
+                else:
+                    value_lengths = np.fromiter((len(value_string) + 1 for value_string in lowercased_value_strings), dtype=np.int64, count=len(lowercased_value_strings))
+                    value_starts = np.concatenate([[0], np.cumsum(value_lengths)[:-1]])
+                    self._sorted_unique_value_search_indexes[sort] = (search_index_string, value_starts)
+
+            return self._sorted_unique_value_search_indexes[sort]
+
+    def search_sorted_unique_value_counts_df(self, sort: str, search_string: str, max_values: int) -> Tuple[pd.DataFrame, bool]:
+        """
+        Returns the first max_values of the sorted unique value counts whose value 
+        strings contain the search_string, ignoring case, and whether these are all
+        of the values that contain it.
+
+        The search_string is a regex, as with str.contains. If it is just text, we find
+        the matches with the search index, stopping after max_values matches, which is 
+        much faster than searching every value when there are many unique values.
+        """
+        sorted_unique_value_counts_df = self.get_sorted_unique_value_counts_df(sort)
+
+        search_index = None
+        if not any(character in REGEX_SPECIAL_CHARACTERS or character == SEARCH_INDEX_SEPARATOR for character in search_string):
+            search_index = self.get_sorted_unique_value_search_index(sort)
+
+        if search_index is None:
+            matching_df = sorted_unique_value_counts_df[sorted_unique_value_counts_df['values_strings'].str.contains(search_string, na=False, case=False)]
+            return matching_df.head(max_values), len(matching_df) <= max_values
+
+        search_index_string, value_starts = search_index
+        lowercased_search_string = search_string.lower()
+
+        matching_positions: List[int] = []
+        search_start = 0
+        while len(matching_positions) <= max_values:
+            match_start = search_index_string.find(lowercased_search_string, search_start)
+            if match_start == -1:
+                break
+            
+            # Find the value this match is in, and continue searching from the next value
+            position = int(np.searchsorted(value_starts, match_start, side='right')) - 1
+            matching_positions.append(position)
+            if position + 1 >= len(value_starts):
+                break
+            search_start = int(value_starts[position + 1])
+
+        return sorted_unique_value_counts_df.iloc[matching_positions[:max_values]], len(matching_positions) <= max_values
+
+    def get_describe(self) -> Dict[str, str]:
+        """
+        Returns _all_ the results from the series .describe function, as well as
+        some other statistics, all turned into strings.
+        """
+        with self.lock:
+            if self._describe is not None:
+                return self._describe
+
+            series = self.series
+            column_dtype = str(series.dtype)
+            describe = series.describe()
+
+            describe_obj = {}
+
+            for index, row in describe.items():
+                # We turn all the items to strings, as some items are not valid JSON
+                # e.g. some wacky numpy datatypes. This allows us to send all of this
+                # to the front-end.
+
+                # If the series is a number, round the statistics so they look good.
+                if is_number_dtype(column_dtype):
+                    row = round(row, 2)
+
+                describe_obj[index] = str(row)
+
+            # We fill in some specific values that dont get filled by default
+            describe_obj['count: NaN'] = str(series.isna().sum())
+
+            # NOTE: be careful adding things here, as we dont want to destroy performance
+            if is_number_dtype(column_dtype):
+                describe_obj['median'] = str(round(series.median(), 2))
+                describe_obj['sum'] = str(round(series.sum(), 2))
+
+            self._describe = describe_obj
+            return describe_obj
+
+    def get_summary_graph_figure(self, create_figure: Callable[[], Any]) -> Any:
+        """
+        Returns the summary graph figure for this column, creating it with
+        create_figure the first time it is requested.
+        """
+        with self.lock:
+            if self._summary_graph_figure is None:
+                self._summary_graph_figure = create_figure()
+            return self._summary_graph_figure
+
+
+# The statistics of the most recently used columns, by the version of their sheet (see
+# get_sheet_versions_after_step) and their column id. As each step that modifies a sheet
+# gives it a new version, cached statistics are never used after the column changes
+_column_statistics_cache: "OrderedDict[Tuple[int, ColumnID], ColumnStatistics]" = OrderedDict()
+_column_statistics_cache_lock = threading.Lock()
+
+
+def get_column_statistics(steps_manager: StepsManagerType, sheet_index: int, column_id: ColumnID) -> ColumnStatistics:
+    """
+    Returns the statistics for the column with column_id in the sheet at sheet_index
+    in the current step, reusing cached statistics if this column has not changed.
+    """
+    state = steps_manager.curr_step.final_defined_state
+    column_header = state.column_ids.get_column_header_by_id(sheet_index, column_id)
+    series: pd.Series = state.dfs[sheet_index][column_header]
+
+    if len(state.sheet_versions) != len(state.dfs):
+        # If we do not know the version of this sheet, we cannot cache the statistics
+        return ColumnStatistics(series)
+
+    key = (state.sheet_versions[sheet_index], column_id)
+    with _column_statistics_cache_lock:
+        column_statistics = _column_statistics_cache.get(key)
+        if column_statistics is None:
+            column_statistics = ColumnStatistics(series)
+            _column_statistics_cache[key] = column_statistics
+
+        _column_statistics_cache.move_to_end(key)
+        while len(_column_statistics_cache) > MAX_CACHED_COLUMN_STATISTICS:
+            _column_statistics_cache.popitem(last=False)
+
+        return column_statistics
@@ -9,6 +9,7 @@ import pandas as pd
 from typing import Any, Dict, List, Optional
 import plotly.express as px
 import plotly.graph_objects as go
+from mitosheet.api.column_statistics import get_column_statistics
 from mitosheet.step_performers.graph_steps.graph_utils import (
     get_html_and_script_from_figure,
 )
@@ -36,21 +37,28 @@ def get_column_summary_graph(params: Dict[str, Any], steps_manager: StepsManager
     include_plotlyjs = params['include_plotlyjs']
 
 
-    # Create a copy of the dataframe, just for safety.
-    df: pd.DataFrame = steps_manager.dfs[sheet_index].copy()
-
     column_header = steps_manager.curr_step.final_defined_state.column_ids.get_column_header_by_id(sheet_index, column_id)
-    fig = _get_column_summary_graph(df, column_header)
-        
-    # Get rid of some of the default white space
-    fig.update_layout(
-        margin=dict(
-            l=0,
-            r=0,
-            t=30,
-            b=30,
+
+    def create_figure() -> go.Figure:
+        # We only need this column to create the graph. Selecting it as a dataframe
+        # makes a copy, so creating the graph cannot change the dataframe.
+        df: pd.DataFrame = steps_manager.dfs[sheet_index][[column_header]]
+        fig = _get_column_summary_graph(df, column_header)
+            
+        # Get rid of some of the default white space
+        fig.update_layout(
+            margin=dict(
+                l=0,
+                r=0,
+                t=30,
+                b=30,
+            )
         )
-    )
+        return fig
+
+    # The figure only changes when the column changes, so we cache it along with 
+    # the other statistics of this column
+    fig = get_column_statistics(steps_manager, sheet_index, column_id).get_summary_graph_figure(create_figure)
 
     return_object = get_html_and_script_from_figure(fig, height, width, include_plotlyjs)
 
@@ -9,7 +9,7 @@ from typing import Any, Dict
 
 import pandas as pd
 from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import DEFAULT_DECIMAL, DEFAULT_DELIMITER, DEFAULT_ENCODING, DEFAULT_SKIPROWS
-from mitosheet.step_performers.import_steps.simple_import import read_csv_get_delimiter_and_encoding
+from mitosheet.step_performers.import_steps.simple_import import get_csv_delimiter_and_encoding
 from mitosheet.types import StepsManagerType
 
 
@@ -28,7 +28,7 @@ def get_csv_files_metadata(params: Dict[str, Any], steps_manager: StepsManagerTy
     skiprows = []
     for file_name in file_names:
         try:
-            _, delimiter, encoding = read_csv_get_delimiter_and_encoding(file_name)
+            delimiter, encoding = get_csv_delimiter_and_encoding(file_name)
             delimeters.append(delimiter)
             encodings.append(encoding)
         except:
@@ -3,19 +3,108 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
-import base64
-import io
-from typing import Any, Dict
+import atexit
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from mitosheet.types import StepsManagerType
 from mitosheet.user import is_pro
 from mitosheet.user.utils import is_running_test
 from mitosheet.utils import write_to_excel
 
+# The number of bytes of the excel file we send to the frontend at once. This is
+# a multiple of 3, so each chunk can be base64 decoded on its own
+EXCEL_EXPORT_CHUNK_SIZE = 3 * 1024 * 1024
 
-def get_dataframe_as_excel(params: Dict[str, Any], steps_manager: StepsManagerType) -> str:
+# The number of excel files we keep for the frontend to read. As the user changes
+# the export configuration, the frontend creates new exports and stops reading old
+# ones, so we delete the oldest exports after this, once they are idle
+MAX_EXCEL_EXPORTS = 3
+
+# The number of seconds since an export was created or last read after which it is idle. 
+# The frontend reads the chunks of an export one after another, so an export that has
+# not been read for this long is no longer being read
+EXCEL_EXPORT_IDLE_SECONDS = 60
+
+# The paths of the excel files that have been exported, and the time they were last
+# created or read, by their export id
+_excel_exports: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_excel_exports_lock = threading.Lock()
+
+
+def add_excel_export(path: str) -> str:
+    """
+    Saves the path of an exported excel file so the frontend can read it, and
+    returns the id of the export.
+    """
+    export_id = str(uuid.uuid4())
+    with _excel_exports_lock:
+        _excel_exports[export_id] = (path, time.time())
+
+        # Delete the oldest exports that are idle, so we never delete an export the frontend is reading
+        for old_export_id, (old_path, last_used_time) in list(_excel_exports.items()):
+            if len(_excel_exports) <= MAX_EXCEL_EXPORTS:
+                break
+            if time.time() - last_used_time < EXCEL_EXPORT_IDLE_SECONDS:
+                continue
+            del _excel_exports[old_export_id]
+            _delete_excel_export_file(old_path)
+
+    return export_id
+
+
+def get_excel_export_chunk_bytes(export_id: str, chunk_index: int) -> Optional[bytes]:
+    """
+    Returns the bytes of the chunk at chunk_index of the exported excel file. Once
+    the last chunk is read, the file is deleted.
+
+    Returns None if there is no export with this id, as it has been fully read
+    or has expired.
     """
-    Sends a dataframe as a excel string.
+    with _excel_exports_lock:
+        if export_id not in _excel_exports:
+            return None
+
+        path, _ = _excel_exports[export_id]
+        with open(path, 'rb') as f:
+            f.seek(chunk_index * EXCEL_EXPORT_CHUNK_SIZE)
+            chunk = f.read(EXCEL_EXPORT_CHUNK_SIZE)
+
+        if (chunk_index + 1) * EXCEL_EXPORT_CHUNK_SIZE >= os.path.getsize(path):
+            del _excel_exports[export_id]
+            _delete_excel_export_file(path)
+        else:
+            _excel_exports[export_id] = (path, time.time())
+
+    return chunk
+
+
+def _delete_excel_export_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@atexit.register
+def _delete_all_excel_export_files() -> None:
+    with _excel_exports_lock:
+        for path, _ in _excel_exports.values():
+            _delete_excel_export_file(path)
+        _excel_exports.clear()
+
+
+def get_dataframe_as_excel(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Exports the dataframes to an excel file, and returns the id of the export
+    and the number of chunks the frontend should read it in with the
+    get_excel_export_chunk API call.
     """
     sheet_indexes = params['sheet_indexes']
 
@@ -23,15 +112,20 @@ def get_dataframe_as_excel(params: Dict[str, Any], steps_manager: StepsManagerTy
     export_formatting = params.get('export_formatting', False)
     allow_formatting = (is_pro() or is_running_test()) and export_formatting
 
-    # We write to a buffer so that we don't have to save the file
-    # to the file system for no reason
-    buffer = io.BytesIO()
-    write_to_excel(buffer, sheet_indexes, steps_manager.curr_step.post_state, allow_formatting=allow_formatting)    
-    # Go back to the start of the buffer
-    buffer.seek(0)
-    
-    # First, we take the buffer, and base64 encode it in bytes,
-    # and then we covert this to ASCII. On the front-end, we 
-    # turn it back into base64, then back to bytes, before 
-    # creating a Blob out of it
-    return base64.b64encode(buffer.read()).decode('ascii')
+    # We write to a temporary file rather than a buffer, so that large exports
+    # are never held in memory
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        write_to_excel(path, sheet_indexes, steps_manager.curr_step.post_state, allow_formatting=allow_formatting)
+    except:
+        _delete_excel_export_file(path)
+        raise
+
+    num_chunks = max(1, math.ceil(os.path.getsize(path) / EXCEL_EXPORT_CHUNK_SIZE))
+    export_id = add_excel_export(path)
+
+    return {
+        'export_id': export_id,
+        'num_chunks': num_chunks
+    }
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from mitosheet.state import State
+from mitosheet.types import StepsManagerType
+from mitosheet.utils import MAX_COLUMNS, MAX_ROWS, df_to_json_dumpsable
+
+# The maximum number of windows we keep cached, across all sheets
+MAX_CACHED_SHEET_DATA_WINDOWS = 32
+
+# The windows of sheet data that were requested most recently, keyed by the state they were 
+# read from, the sheet index and the window. We only keep a weak reference to the state, so 
+# the cache does not keep old states in memory, and windows of a state that is no longer 
+# displayed are never used again. API calls are handled by multiple threads, so we lock it
+_sheet_data_window_cache: "OrderedDict[Tuple[weakref.ref[State], int, int, int, int, int], Dict[str, Any]]" = OrderedDict()
+_sheet_data_window_cache_lock = threading.Lock()
+
+
+def get_dataframe_window(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Returns a window of the dataframe at sheet_index, in the same format as the
+    sheet data that is sent to the frontend, so that the frontend can display
+    rows and columns beyond the ones sent in the sheet data.
+
+    The window starts at start_row and start_column, and contains at most num_rows
+    rows and num_columns columns.
+
+    The most recently requested windows are cached along with the state they are read
+    from, so scrolling back and forth through a sheet does not reserialize the same rows.
+    """
+    sheet_index = params['sheet_index']
+    start_row = max(params.get('start_row', 0), 0)
+    num_rows = min(params.get('num_rows', MAX_ROWS), MAX_ROWS)
+    start_column = max(params.get('start_column', 0), 0)
+    num_columns = min(params.get('num_columns', MAX_COLUMNS), MAX_COLUMNS)
+
+    state = steps_manager.curr_step.final_defined_state
+
+    key = (weakref.ref(state), sheet_index, start_row, num_rows, start_column, num_columns)
+    with _sheet_data_window_cache_lock:
+        if key in _sheet_data_window_cache:
+            _sheet_data_window_cache.move_to_end(key)
+            return _sheet_data_window_cache[key]
+
+    sheet_data_window = df_to_json_dumpsable(
+        state,
+        state.dfs[sheet_index],
+        sheet_index,
+        state.df_names[sheet_index],
+        state.df_sources[sheet_index],
+        state.column_formulas[sheet_index],
+        state.column_filters[sheet_index],
+        state.column_ids.column_header_to_column_id[sheet_index],
+        state.df_formats[sheet_index],
+        max_rows=num_rows,
+        max_columns=num_columns,
+        start_row=start_row,
+        start_column=start_column
+    )
+    sheet_data_window['startRow'] = start_row
+    sheet_data_window['startColumn'] = start_column
+
+    with _sheet_data_window_cache_lock:
+        _sheet_data_window_cache[key] = sheet_data_window
+        while len(_sheet_data_window_cache) > MAX_CACHED_SHEET_DATA_WINDOWS:
+            _sheet_data_window_cache.popitem(last=False)
+
+    return sheet_data_window
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+import base64
+from typing import Any, Dict, Union
+
+from mitosheet.api.get_dataframe_as_excel import get_excel_export_chunk_bytes
+from mitosheet.types import StepsManagerType
+
+EXCEL_EXPORT_EXPIRED_ERROR = 'This export has expired, as it was not read for too long. Please export again.'
+
+
+def get_excel_export_chunk(params: Dict[str, Any], steps_manager: StepsManagerType) -> Union[str, Dict[str, str]]:
+    """
+    Sends a chunk of an excel file exported with get_dataframe_as_excel as
+    a base64 encoded string, or an error if the export has expired.
+    """
+    export_id = params['export_id']
+    chunk_index = params['chunk_index']
+
+    chunk = get_excel_export_chunk_bytes(export_id, chunk_index)
+    if chunk is None:
+        return {
+            'error': EXCEL_EXPORT_EXPIRED_ERROR
+        }
+
+    # On the front-end, we turn this back into bytes, and create a
+    # Blob out of all the chunks
+    return base64.b64encode(chunk).decode('ascii')
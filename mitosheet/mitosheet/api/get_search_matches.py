@@ -4,47 +4,99 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 import re
+import threading
+import weakref
+import numpy as np
 import pandas as pd
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 from mitosheet.types import StepsManagerType
 
+# By default, we only return the matches in the first 1500 rows, because
+# the editor only shows the first 1500 rows
+DEFAULT_SEARCH_MATCHES_NUM_ROWS = 1500
+
+# The factorized string views of the columns of the last dataframe that was searched, so
+# that searching the same dataframe again as the user types does not convert it again. We
+# only keep a weak reference to the dataframe, so the cache does not keep it in memory
+_cached_string_views: Optional[Tuple['weakref.ref[pd.DataFrame]', Dict[int, Tuple[np.ndarray, pd.Series]]]] = None
+_cached_string_views_lock = threading.Lock()
+
+
+def get_string_view_of_column(df: pd.DataFrame, column_index: int) -> Tuple[np.ndarray, pd.Series]:
+    """
+    Returns the column at column_index as the strings that we search, which are the str 
+    of each value. As columns often contain the same value many times, we return the 
+    unique strings, and the codes of the unique string in each row, which is -1 for 
+    missing values. These are cached for the last searched dataframe.
+    """
+    global _cached_string_views
+
+    with _cached_string_views_lock:
+        if _cached_string_views is None or _cached_string_views[0]() is not df:
+            _cached_string_views = (weakref.ref(df), {})
+        string_views = _cached_string_views[1]
+
+        if column_index not in string_views:
+            series = df.iloc[:, column_index]
+            try:
+                codes, uniques = pd.factorize(series)
+            except TypeError:
+                # Some values (e.g. lists) cannot be factorized, so we factorize their strings
+                codes, uniques = pd.factorize(series.astype(str))
+                codes[series.isna().to_numpy()] = -1
+            string_views[column_index] = (codes, pd.Series(uniques).map(str))
+
+        return string_views[column_index]
+
+
+def get_column_search_matches(df: pd.DataFrame, column_index: int, search_regex: 're.Pattern[str]') -> np.ndarray:
+    """
+    Returns a boolean array of which values in the column at column_index match
+    the search_regex. Missing values never match.
+    """
+    codes, unique_strings = get_string_view_of_column(df, column_index)
+    # We add a False to the end of the unique matches, so missing values with code -1 never match
+    unique_matches = np.append(unique_strings.str.contains(search_regex).to_numpy(dtype=bool), False)
+    return unique_matches[codes]
+
 
 def get_search_matches(params: Dict[str, Any], steps_manager: StepsManagerType) -> Any:
     """
-    Finds the number of matches to a given search value in the dataframe.
+    Finds the number of matches to a given search value in the dataframe,
+    as well as the matches in the num_rows rows starting at start_row_index.
     """
     sheet_index = params['sheet_index']
     search_value = params['search_value']
+    start_row_index = params.get('start_row_index', 0)
+    num_rows = params.get('num_rows', DEFAULT_SEARCH_MATCHES_NUM_ROWS)
     df = steps_manager.dfs[sheet_index]
 
-    # First, generate a count for each value in the dataframe:
-    unique_value_counts = df.stack().value_counts()
-
     escaped_search_value = re.escape(search_value)
 
     # Use the same regex for all searching
     search_regex = re.compile(escaped_search_value, re.IGNORECASE)
 
-    # Then, filter for the search value:
-    matches = unique_value_counts.filter(regex=search_regex, axis=0)
-
-    # Then, sum the matches:
-    total_number_matches = int(matches.sum())
-
-    # Then, add the column names to the matches:
-    total_number_matches += len([col for col in df.columns if re.search(search_regex,str(col)) is not None])
+    # Find the indices of columns containing the search value
+    column_matches = [{'rowIndex': -1, 'colIndex': j} for j, column in enumerate(df.columns) if (re.search(search_regex,str(column)) is not None)]
 
-    # Get the number of rows and columns so that we don't have to calculate the length in each iteration
-    num_rows = len(df.index)
-    num_cols = len(df.columns)
+    # Then, find the cells containing the search value, one column at a time
+    total_number_matches = len(column_matches)
+    end_row_index = min(start_row_index + num_rows, len(df.index))
+    cell_matches_in_rows: List[np.ndarray] = []
+    for column_index in range(len(df.columns)):
+        column_search_matches = get_column_search_matches(df, column_index, search_regex)
+        total_number_matches += int(column_search_matches.sum())
+        cell_matches_in_rows.append(column_search_matches[start_row_index:end_row_index])
 
-    # Find the indices of cells containing the search value
-    # Only search the first 1500 rows because the editor only shows the first 1500 rows. 
-    cell_matches = [{'rowIndex': i, 'colIndex': j} for i in range(min(1500, num_rows)) for j in range(num_cols) if (re.search(search_regex,str(df.iat[i, j])) is not None)]
+    # We return the cell matches in each row in order, after the column matches
+    cell_matches: List[Dict[str, int]] = []
+    if len(cell_matches_in_rows) > 0 and end_row_index > start_row_index:
+        row_offsets, column_indexes = np.nonzero(np.column_stack(cell_matches_in_rows))
+        cell_matches = [
+            {'rowIndex': int(row_offset) + start_row_index, 'colIndex': int(column_index)}
+            for row_offset, column_index in zip(row_offsets, column_indexes)
+        ]
 
-    # Find the indices of columns containing the search value
-    column_matches = [{'rowIndex': -1, 'colIndex': j} for j, column in enumerate(df.columns) if (re.search(search_regex,str(column)) is not None)]
-    
     # We want the columns to come first
     all_matches = column_matches + cell_matches
-    return {'total_number_matches': total_number_matches, 'matches': all_matches }
\ No newline at end of file
+    return {'total_number_matches': total_number_matches, 'matches': all_matches }
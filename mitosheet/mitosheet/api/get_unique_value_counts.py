@@ -3,10 +3,9 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
-import json
 from typing import Any, Dict
 
-import pandas as pd
+from mitosheet.api.column_statistics import get_column_statistics
 from mitosheet.types import StepsManagerType
 from mitosheet.utils import get_row_data_array
 
@@ -33,57 +32,19 @@ def get_unique_value_counts(params: Dict[str, Any], steps_manager: StepsManagerT
     search_string = params['search_string']
     sort = params['sort']
 
-    column_header = steps_manager.curr_step.column_ids.get_column_header_by_id(sheet_index, column_id)
-    
-    series: pd.Series = steps_manager.dfs[sheet_index][column_header]
-
-    unique_value_counts_percents_series = series.value_counts(normalize=True, dropna=False)
-    unique_value_counts_series = series.value_counts(dropna=False)
-    
-    unique_value_counts_df = pd.DataFrame({
-        'values': unique_value_counts_percents_series.index,
-        'percents': unique_value_counts_percents_series, 
-        'counts': unique_value_counts_series
-    })
+    column_statistics = get_column_statistics(steps_manager, sheet_index, column_id)
+    unique_value_counts_df = column_statistics.get_unique_value_counts_df()
 
     if len(unique_value_counts_df) > MAX_UNIQUE_VALUES:
-        # First, we turn the series into a string series, so that we can
-        # easily filter on it without issues (and sort in some cases)
-        new_unique_value_counts_df = unique_value_counts_df.copy(deep=True)
-        new_unique_value_counts_df['values_strings'] = new_unique_value_counts_df['values'].astype('str')
-
-        # First, we sort in the order they want
-        try:
-            if sort == 'Ascending Value':
-                new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values', ascending=True, na_position='first')
-            elif sort == 'Descending Value':
-                new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values', ascending=False, na_position='first')
-            elif sort == 'Ascending Occurence':
-                new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='counts', ascending=True, na_position='first')
-            elif sort == 'Descending Occurence':
-                new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='counts', ascending=False, na_position='first')
-        except:
-            # If the sort values throws an exception, then this must be because we have a mixed value type, and so we instead
-            # sort on the string representation of the values (as this will always work)
-            if sort == 'Ascending Value':
-                new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values_strings', ascending=True, na_position='first')
-            elif sort == 'Descending Value':
-                new_unique_value_counts_df = new_unique_value_counts_df.sort_values(by='values_strings', ascending=False, na_position='first')
-
-        # Then, we filter with the string. Note that we always filter on the string representation
+        # We sort in the order they want, filter with the string, and only take the first 
+        # MAX_UNIQUE_VALUES. Note that we always filter on the string representation
         # because the front-end sends a string
-        new_unique_value_counts_df = new_unique_value_counts_df[new_unique_value_counts_df['values_strings'].str.contains(search_string, na=False, case=False)]
-
-        # Finially, we only take the first MAX_UNIQUE_VALUES
-        if len(new_unique_value_counts_df) > MAX_UNIQUE_VALUES:
-            new_unique_value_counts_df = new_unique_value_counts_df.head(MAX_UNIQUE_VALUES)
-            is_all_data = False
-        else:
-            is_all_data = True
+        new_unique_value_counts_df, is_all_data = column_statistics.search_sorted_unique_value_counts_df(
+            sort, search_string, MAX_UNIQUE_VALUES
+        )
 
         # And then we filter the unique values down to these specific values
         unique_value_counts_df = unique_value_counts_df.loc[new_unique_value_counts_df.index]
-        unique_value_counts_df.reset_index(drop=True)
 
     else:
         is_all_data = True
@@ -92,4 +53,3 @@ def get_unique_value_counts(params: Dict[str, Any], steps_manager: StepsManagerT
         'uniqueValueRowDataArray': get_row_data_array(unique_value_counts_df),
         'isAllData': is_all_data
     }
-
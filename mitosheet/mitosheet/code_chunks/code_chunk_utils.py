@@ -6,9 +6,11 @@
 
 
 from copy import copy
-from typing import TYPE_CHECKING, List, Optional, Any, Type
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple, Type
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.column_steps.delete_column_code_chunk import DeleteColumnsCodeChunk
+from mitosheet.code_chunks.step_performers.dataframe_steps.dataframe_delete_code_chunk import DataframeDeleteCodeChunk
 from mitosheet.code_chunks.step_performers.filter_code_chunk import FilterCodeChunk
 from mitosheet.code_chunks.step_performers.sort_code_chunk import SortCodeChunk
 from mitosheet.pro.code_chunks.code_chunk_pro_utils import optimize_code_chunks
@@ -17,30 +19,108 @@ if TYPE_CHECKING:
     from mitosheet.step import Step
 else:
     Step = Any
+
+# The number of optimized code chunk lists we keep for the steps before the 
+# most recent step, which are used after an undo or after editing a recent step
+MAX_OPTIMIZED_CODE_CHUNKS_PREFIXES = 10
+
+# Deleting a dataframe optimizes out the code chunks that create it, however far
+# back they are. These may have already been combined with other code chunks when
+# the steps before were optimized, so we optimize all the code chunks when these 
+# are added, to get the same code as we would otherwise
+CODE_CHUNKS_THAT_OPTIMIZE_ALL_PREVIOUS_CODE_CHUNKS: List[Type[CodeChunk]] = [
+    DataframeDeleteCodeChunk
+]
+
+
+class OptimizedCodeChunksCache():
+    """
+    Caches the optimized code chunks of the steps in an analysis, so that when new
+    steps are added, we only have to optimize their code chunks together with the 
+    already optimized code chunks of the steps before them, rather than optimizing
+    all of the code chunks again.
+
+    The code chunks of each step are compared by identity, which is valid as steps
+    cache their code chunks until they are executed again (see Step.get_code_chunks).
+    """
+
+    def __init__(self) -> None:
+        self.step_code_chunks: List[Tuple[CodeChunk, ...]] = []
+        # The optimized code chunks of the first n steps in step_code_chunks, by n
+        self.optimized_code_chunks_prefixes: Dict[int, List[CodeChunk]] = {}
+        # The code is also transpiled by API calls, which run in other threads
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lock cannot be pickled (e.g. when the steps manager is snapshotted), so we
+        # pickle an empty cache, which is filled again the next time the code is transpiled
+        return {}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__() # type: ignore
+
+    def get_optimized_code_chunks(self, step_code_chunks: List[Tuple[CodeChunk, ...]]) -> List[CodeChunk]:
+        with self.lock:
+            return self._get_optimized_code_chunks(step_code_chunks)
+
+    def _get_optimized_code_chunks(self, step_code_chunks: List[Tuple[CodeChunk, ...]]) -> List[CodeChunk]:
+        # Find how many of the steps at the start are the same as last time, and forget
+        # the optimized code chunks of any steps after these
+        num_same_steps = 0
+        while num_same_steps < min(len(step_code_chunks), len(self.step_code_chunks)) \
+                and step_code_chunks[num_same_steps] is self.step_code_chunks[num_same_steps]:
+            num_same_steps += 1
+
+        self.step_code_chunks = copy(step_code_chunks)
+        self.optimized_code_chunks_prefixes = {
+            num_steps: optimized_code_chunks for num_steps, optimized_code_chunks in self.optimized_code_chunks_prefixes.items()
+            if num_steps <= num_same_steps
+        }
+
+        if len(step_code_chunks) in self.optimized_code_chunks_prefixes:
+            return copy(self.optimized_code_chunks_prefixes[len(step_code_chunks)])
+
+        num_prefix_steps = max(self.optimized_code_chunks_prefixes.keys(), default=0)
+        new_code_chunks = [code_chunk for code_chunks in step_code_chunks[num_prefix_steps:] for code_chunk in code_chunks]
+
+        if any(isinstance(code_chunk, tuple(CODE_CHUNKS_THAT_OPTIMIZE_ALL_PREVIOUS_CODE_CHUNKS)) for code_chunk in new_code_chunks):
+            num_prefix_steps = 0
+            new_code_chunks = [code_chunk for code_chunks in step_code_chunks for code_chunk in code_chunks]
+
+        optimized_code_chunks = optimize_code_chunks(self.optimized_code_chunks_prefixes.get(num_prefix_steps, []) + new_code_chunks)
+        
+        self.optimized_code_chunks_prefixes[len(step_code_chunks)] = optimized_code_chunks
+        for num_steps in sorted(self.optimized_code_chunks_prefixes.keys())[:-(MAX_OPTIMIZED_CODE_CHUNKS_PREFIXES + 1)]:
+            del self.optimized_code_chunks_prefixes[num_steps]
+
+        return copy(optimized_code_chunks)
     
 
-def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChunk]:
+def get_code_chunks(all_steps: List[Step], optimize: bool=True, optimized_code_chunks_cache: Optional[OptimizedCodeChunksCache]=None) -> List[CodeChunk]:
     """
     A utility for taking all the steps in the steps manager, and returning a list
     of CodeChunks that correspond to these steps. 
 
     optimize is by default True, which results in these CodeChunks being optimized
     down to the smallest possible list of CodeChunks that implements the same ops.
+    If an optimized_code_chunks_cache is passed, it is used to only optimize the 
+    code chunks of the steps that have changed since it was last used.
     """
     from mitosheet.steps_manager import get_step_indexes_to_skip
     step_indexes_to_skip = get_step_indexes_to_skip(all_steps)
 
-    all_code_chunks: List[CodeChunk] = []
+    step_code_chunks: List[Tuple[CodeChunk, ...]] = []
     for step_index, step in enumerate(all_steps):
         # Skip the initalize step, or any step we should skip
         if step.step_type == 'initialize' or step_index in step_indexes_to_skip:
             continue
 
-        all_code_chunks.extend(step.step_performer.transpile(
-            step.prev_state, # type: ignore
-            step.params,
-            step.execution_data,
-        ))
+        step_code_chunks.append(step.get_code_chunks())
+
+    if optimize and optimized_code_chunks_cache is not None:
+        return optimized_code_chunks_cache.get_optimized_code_chunks(step_code_chunks)
+
+    all_code_chunks: List[CodeChunk] = [code_chunk for code_chunks in step_code_chunks for code_chunk in code_chunks]
 
     if optimize:
         code_chunks_list = optimize_code_chunks(all_code_chunks)
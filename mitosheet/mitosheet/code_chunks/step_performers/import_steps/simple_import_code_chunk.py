@@ -21,7 +21,7 @@ DEFAULT_DECIMAL = '.'
 DEFAULT_SKIPROWS = 0
 DEFAULT_ERROR_BAD_LINES = True
 
-def get_read_csv_params(delimeter: str, encoding: str, decimal: Optional[str], skiprows: Optional[int], error_bad_lines: Optional[bool]) -> Dict[str, Any]:
+def get_read_csv_params(delimeter: str, encoding: str, decimal: Optional[str], skiprows: Optional[int], error_bad_lines: Optional[bool], engine: Optional[str]=None) -> Dict[str, Any]:
     params: Dict[str, Any] = {}
 
     if encoding != DEFAULT_ENCODING:
@@ -38,6 +38,8 @@ def get_read_csv_params(delimeter: str, encoding: str, decimal: Optional[str], s
             params['error_bad_lines'] = error_bad_lines
         else:
             params['on_bad_lines'] = 'skip'
+    if engine is not None:
+        params['engine'] = engine
     
     return params
 
@@ -50,14 +52,15 @@ def generate_read_csv_code(
         decimal: Optional[str], 
         skiprows: Optional[int], 
         error_bad_lines: Optional[bool],
-        file_name_is_variable: bool = False
+        file_name_is_variable: bool = False,
+        engine: Optional[str] = None
     ) -> str:
     """
     Helper function for generating minimal read_csv code 
     depending on the delimeter and the encoding of a file
     """
 
-    params = get_read_csv_params(delimeter, encoding, decimal=decimal, skiprows=skiprows, error_bad_lines=error_bad_lines)
+    params = get_read_csv_params(delimeter, encoding, decimal=decimal, skiprows=skiprows, error_bad_lines=error_bad_lines, engine=engine)
     params_string = ', '.join(f'{key}={get_column_header_as_transpiled_code(value)}' for key, value in params.items())
 
     transpiled_file_path = 'r' + get_column_header_as_transpiled_code(file_name) if not file_name_is_variable else file_name
@@ -68,7 +71,7 @@ def generate_read_csv_code(
 class SimpleImportCodeChunk(CodeChunk):
 
     
-    def __init__(self, prev_state: State, file_names: List[str], file_delimeters: List[str], file_encodings: List[str], file_decimals: List[str], file_skiprows: List[int], file_error_bad_lines: List[bool], new_df_names: List[str]):
+    def __init__(self, prev_state: State, file_names: List[str], file_delimeters: List[str], file_encodings: List[str], file_decimals: List[str], file_skiprows: List[int], file_error_bad_lines: List[bool], new_df_names: List[str], file_engines: Optional[List[Optional[str]]]=None):
         super().__init__(prev_state)
         self.file_names = file_names
         self.file_delimeters = file_delimeters
@@ -77,6 +80,8 @@ class SimpleImportCodeChunk(CodeChunk):
         self.file_skiprows = file_skiprows
         self.file_error_bad_lines = file_error_bad_lines
         self.new_df_names = new_df_names
+        # The engine used to read each file, where None is the pandas default engine
+        self.file_engines = file_engines if file_engines is not None else [None] * len(file_names)
 
     def get_display_name(self) -> str:
         return 'Imported'
@@ -97,9 +102,10 @@ class SimpleImportCodeChunk(CodeChunk):
             decimal = self.file_decimals[index]
             skiprows = self.file_skiprows[index]
             error_bad_lines = self.file_error_bad_lines[index]
+            engine = self.file_engines[index]
 
             code.append(
-                generate_read_csv_code(file_name, df_name, delimeter, encoding, decimal, skiprows, error_bad_lines)
+                generate_read_csv_code(file_name, df_name, delimeter, encoding, decimal, skiprows, error_bad_lines, engine=engine)
             )
             
             index += 1
@@ -118,6 +124,7 @@ class SimpleImportCodeChunk(CodeChunk):
         new_file_skiprows = self.file_skiprows + other_code_chunk.file_skiprows
         new_error_bad_lines = self.file_error_bad_lines + other_code_chunk.file_error_bad_lines
         new_df_names = self.new_df_names + other_code_chunk.new_df_names
+        new_file_engines = self.file_engines + other_code_chunk.file_engines
 
         return SimpleImportCodeChunk(
             self.prev_state,
@@ -127,7 +134,8 @@ class SimpleImportCodeChunk(CodeChunk):
             new_file_decimals,
             new_file_skiprows,
             new_error_bad_lines,
-            new_df_names
+            new_df_names,
+            new_file_engines
         )
 
     def combine_right(self, other_code_chunk: "CodeChunk") -> Optional["CodeChunk"]:
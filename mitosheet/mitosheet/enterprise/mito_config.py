@@ -7,7 +7,7 @@
 from ast import List
 import datetime
 import pprint
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 import os
 from mitosheet.enterprise.license_key import decode_license_to_date
 from mitosheet.telemetry.telemetry_utils import log
@@ -37,6 +37,8 @@ MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH = 'MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PA
 MITO_CONFIG_CUSTOM_IMPORTERS_PATH = 'MITO_CONFIG_CUSTOM_IMPORTERS_PATH'
 MITO_CONFIG_LOG_SERVER_URL = 'MITO_CONFIG_LOG_SERVER_URL'
 MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL = 'MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL'
+MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB = 'MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB'
+MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE = 'MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE'
 
 
 # Note: The below keys can change since they are not set by the user.
@@ -73,6 +75,8 @@ MEC_VERSION_KEYS = {
         MITO_CONFIG_ENTERPRISE_TEMP_LICENSE,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH,
         MITO_CONFIG_CUSTOM_IMPORTERS_PATH,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB,
+        MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE,
     ]
 }
 
@@ -397,6 +401,37 @@ class MitoConfig:
             self.mec[MITO_CONFIG_ENTERPRISE_TEMP_LICENSE]
         )
 
+    @property
+    def step_history_memory_limit_mb(self) -> Optional[int]:
+        """
+        The number of megabytes of dataframes that the states of previous steps 
+        can use before they are evicted and recomputed when needed. If not set, 
+        the states of previous steps are never evicted.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB] is None:
+            return None
+        
+        try:
+            step_history_memory_limit_mb = int(self.mec[MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB])
+        except (ValueError, TypeError):
+            # If the limit is not a number, we ignore it rather than breaking the sheet
+            return None
+        
+        return step_history_memory_limit_mb if step_history_memory_limit_mb >= 0 else None
+
+    @property
+    def enable_pyarrow_csv_engine(self) -> bool:
+        """
+        If True, and pyarrow is installed, CSV files are imported with the much faster
+        pyarrow engine. This is off by default, as the pyarrow engine can infer different 
+        dtypes than the default engine, and the generated code then needs pyarrow to run.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE] is None:
+            return False
+
+        enable_pyarrow_csv_engine = is_env_variable_set_to_true(self.mec[MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE])
+        return enable_pyarrow_csv_engine
+
     # Add new mito configuration options here ...
 
     @property
@@ -418,7 +453,32 @@ class MitoConfig:
             MITO_CONFIG_FEATURE_TELEMETRY: self.feature_telemetry,
             MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: self.custom_sheet_functions_path,
             MITO_CONFIG_CUSTOM_IMPORTERS_PATH: self.custom_importers_path,
+            MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB: self.step_history_memory_limit_mb,
+            MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE: self.enable_pyarrow_csv_engine,
             MITO_CONFIG_PRO: self.pro,
             MITO_CONFIG_ENTERPRISE: self.enterprise
         }
 
+
+
+# The last MitoConfig we created, along with the environment variables it was created
+# from, so that we only create a new one if these environment variables change
+_cached_mito_config: Optional[Tuple[Tuple[Optional[str], ...], MitoConfig]] = None
+
+def get_mito_config() -> MitoConfig:
+    """
+    Returns a MitoConfig for the current environment variables, reusing the 
+    previous MitoConfig if none of the Mito config environment variables 
+    have changed since it was created.
+    """
+    global _cached_mito_config
+
+    all_mito_config_keys = sorted(set(key for keys in MEC_VERSION_KEYS.values() for key in keys))
+    environment_variables = tuple(os.environ.get(key) for key in all_mito_config_keys)
+
+    if _cached_mito_config is not None and _cached_mito_config[0] == environment_variables:
+        return _cached_mito_config[1]
+
+    mito_config = MitoConfig()
+    _cached_mito_config = (environment_variables, mito_config)
+    return mito_config
@@ -19,7 +19,7 @@ That's it! We can continue to optimize this over time, but that is fine for now.
 import json
 from typing import Dict, Optional
 
-from mitosheet.user.db import USER_JSON_PATH, get_user_field
+from mitosheet.user.db import USER_JSON_PATH, get_user_field, set_user_json_object
 
 def get_random_variant() -> str:
     """Returns "A" or "B" with 50% probability
@@ -58,5 +58,4 @@ def set_experiment(experiment_id: str, variant: str) -> None:
         old_user_json[UJ_EXPERIMENT]['experiment_id'] = experiment_id
         old_user_json[UJ_EXPERIMENT]['variant'] = variant
 
-        with open(USER_JSON_PATH, 'w+') as f:
-            f.write(json.dumps(old_user_json))
+    set_user_json_object(old_user_json)
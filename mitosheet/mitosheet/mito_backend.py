@@ -22,7 +22,7 @@ from mitosheet.enterprise.telemetry.mito_log_uploader import MitoLogUploader
 
 from mitosheet.kernel_utils import get_current_kernel_id, Comm
 from mitosheet.api import API
-from mitosheet.enterprise.mito_config import MitoConfig
+from mitosheet.enterprise.mito_config import get_mito_config
 from mitosheet.errors import (MitoError, get_recent_traceback,
                               make_execution_error)
 from mitosheet.saved_analyses import write_save_analysis_file
@@ -69,7 +69,7 @@ class MitoBackend():
         super(MitoBackend, self).__init__()
 
         # Setup the MitoConfig class
-        self.mito_config = MitoConfig() # type: ignore
+        self.mito_config = get_mito_config()
 
         # Set up the Mito Logger class
         log_server_url = self.mito_config.log_server_url
@@ -193,6 +193,8 @@ class MitoBackend():
             'shared_variables': self.get_shared_state_variables()
         })
 
+        self.steps_manager.evict_states_over_memory_limit()
+
 
     def handle_update_event(self, event: Dict[str, Any]) -> None:
         """
@@ -231,6 +233,8 @@ class MitoBackend():
             'shared_variables': self.get_shared_state_variables()
         })
 
+        self.steps_manager.evict_states_over_memory_limit()
+
     def receive_message(self, content: Dict[str, Any]) -> bool:
         """
         Handles all incoming messages from the JS widget. There are three main
@@ -1,12 +1,17 @@
 import json
+from typing import Optional
 from mitosheet.mito_backend import MitoBackend
 from mitosheet.saved_analyses import get_saved_analysis_string
 
 
-def flatten_mito_backend_to_json(mito_backend: MitoBackend) -> str:
-    saved_analysis_string = get_saved_analysis_string(mito_backend.steps_manager)
+def get_backend_state_string(mito_backend: MitoBackend) -> str:
+    return get_saved_analysis_string(mito_backend.steps_manager)
+
+def flatten_mito_backend_to_json(mito_backend: MitoBackend, backend_state_string: Optional[str]=None) -> str:
+    if backend_state_string is None:
+        backend_state_string = get_backend_state_string(mito_backend)
     return json.dumps({
-        'backend_state': saved_analysis_string,
+        'backend_state': backend_state_string,
         'shared_state_variables': mito_backend.get_shared_state_variables()
     })
 
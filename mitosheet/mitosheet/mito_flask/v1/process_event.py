@@ -1,8 +1,14 @@
 from typing import Any, Dict, Optional
 from mitosheet.mito_backend import MitoBackend
-from mitosheet.mito_flask.v1.flatten_utils import (flatten_mito_backend_to_json, read_backend_state_string_to_mito_backend)
+from mitosheet.mito_flask.v1.flatten_utils import (flatten_mito_backend_to_json, get_backend_state_string, read_backend_state_string_to_mito_backend)
+from mitosheet.mito_flask.v1.session_store import MitoBackendSessionStore
 
-def process_mito_event(backend_state: Optional[str], mito_event: Optional[Dict[str, Any]]) -> Any:
+def process_mito_event(backend_state: Optional[str], mito_event: Optional[Dict[str, Any]], session_store: Optional[MitoBackendSessionStore]=None) -> Any:
+    """
+    Processes the event for the analysis with the given backend state. If a session_store 
+    is passed, the backend for this backend state is resumed from it if it is stored there, 
+    rather than replaying the entire analysis, and the backend is stored in it afterwards.
+    """
 
     if backend_state is None:
         mito_backend = MitoBackend()
@@ -12,7 +18,9 @@ def process_mito_event(backend_state: Optional[str], mito_event: Optional[Dict[s
             "response": None,
         })
 
-    mito_backend = read_backend_state_string_to_mito_backend(backend_state)
+    # Resume the backend for this backend state if we have it, and otherwise replay the analysis
+    stored_mito_backend = session_store.take(backend_state) if session_store is not None else None
+    mito_backend = stored_mito_backend if stored_mito_backend is not None else read_backend_state_string_to_mito_backend(backend_state)
 
     response = None
     def mito_send(message):
@@ -23,8 +31,13 @@ def process_mito_event(backend_state: Optional[str], mito_event: Optional[Dict[s
     if mito_event:
         mito_backend.receive_message(mito_event)
 
+    new_backend_state = get_backend_state_string(mito_backend)
+    state = flatten_mito_backend_to_json(mito_backend, backend_state_string=new_backend_state)
+    if session_store is not None:
+        session_store.put(new_backend_state, mito_backend)
+
     from flask import jsonify
     return jsonify({
-        "state": flatten_mito_backend_to_json(mito_backend),
+        "state": state,
         "response": response,
-    })
\ No newline at end of file
+    })
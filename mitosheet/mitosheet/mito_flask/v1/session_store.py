@@ -0,0 +1,110 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from mitosheet.api import API
+from mitosheet.mito_backend import MitoBackend
+from mitosheet.steps_manager import StepsManager
+
+# The number of backends we keep in memory by default. Each backend holds
+# all the dataframes in its analysis, so this should not be too large
+DEFAULT_MAX_SESSIONS = 16
+
+
+def get_session_token(backend_state: str) -> str:
+    """
+    Returns the token that a backend with the given backend state is stored under.
+
+    As the backend state is sent back with each request, using a hash of it as the
+    token means that clients do not need to keep track of any other session id.
+    """
+    return hashlib.sha256(backend_state.encode('utf-8')).hexdigest()
+
+
+class MitoBackendSessionStore():
+    """
+    Stores the live MitoBackend for each backend state, so that processing an event
+    can resume the backend rather than replaying the entire analysis.
+
+    The most recently used max_sessions backends are kept in memory. If a snapshot_folder
+    is given, backends are also pickled to this folder, so they can be resumed by other
+    processes (e.g. other workers of the same server), or after being evicted from memory.
+
+    Backends are removed from the store when they are taken, as processing an event
+    changes the backend, and so its backend state.
+
+    NOTE: snapshots are pickled when backends are put in the store, which takes time
+    proportional to the size of the analysis, so only pass a snapshot_folder if backends
+    need to be resumed by other processes.
+    """
+
+    def __init__(self, max_sessions: int=DEFAULT_MAX_SESSIONS, snapshot_folder: Optional[str]=None):
+        self.max_sessions = max_sessions
+        self.snapshot_folder = snapshot_folder
+        self.mito_backends: "OrderedDict[str, MitoBackend]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        if self.snapshot_folder is not None:
+            os.makedirs(self.snapshot_folder, exist_ok=True)
+
+    def take(self, backend_state: str) -> Optional[MitoBackend]:
+        """
+        Removes and returns the backend with the given backend state from the
+        store, or returns None if there is no such backend.
+        """
+        token = get_session_token(backend_state)
+        with self.lock:
+            mito_backend = self.mito_backends.pop(token, None)
+
+        snapshot_path = self._get_snapshot_path(token)
+        if snapshot_path is None or not os.path.exists(snapshot_path):
+            return mito_backend
+
+        try:
+            if mito_backend is None:
+                with open(snapshot_path, 'rb') as f:
+                    mito_backend = get_mito_backend_from_steps_manager(pickle.load(f))
+            os.remove(snapshot_path)
+        except Exception:
+            # If another process took this snapshot first, or it cannot be read, we
+            # just treat it as missing
+            pass
+
+        return mito_backend
+
+    def put(self, backend_state: str, mito_backend: MitoBackend) -> None:
+        """
+        Stores the backend, which must have the given backend state.
+        """
+        token = get_session_token(backend_state)
+        with self.lock:
+            self.mito_backends[token] = mito_backend
+            self.mito_backends.move_to_end(token)
+            while len(self.mito_backends) > self.max_sessions:
+                self.mito_backends.popitem(last=False)
+
+        snapshot_path = self._get_snapshot_path(token)
+        if snapshot_path is not None:
+            try:
+                with open(snapshot_path, 'wb') as f:
+                    pickle.dump(mito_backend.steps_manager, f)
+            except Exception:
+                # Some backends cannot be pickled (e.g. if they contain user defined functions
+                # that are not importable), in which case they are only stored in memory
+                if os.path.exists(snapshot_path):
+                    os.remove(snapshot_path)
+
+    def _get_snapshot_path(self, token: str) -> Optional[str]:
+        if self.snapshot_folder is None:
+            return None
+        return os.path.join(self.snapshot_folder, f'{token}.pickle')
+
+
+def get_mito_backend_from_steps_manager(steps_manager: StepsManager) -> MitoBackend:
+    mito_backend = MitoBackend()
+    mito_backend.steps_manager = steps_manager
+    mito_backend.api = API(steps_manager, mito_backend)
+    return mito_backend
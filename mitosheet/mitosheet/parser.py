@@ -12,7 +12,8 @@ import datetime
 from distutils.version import LooseVersion
 import re
 import warnings
-from typing import Any, List, Optional, Set, Tuple, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import pandas as pd
 
@@ -419,6 +420,56 @@ def get_index_match_from_string_index(formula: str, formula_label: Union[str, bo
     return None
 
 
+# The key in the column header trie for the positions of the column headers that end at a node
+COLUMN_HEADER_TRIE_END = ''
+
+@lru_cache(maxsize=100)
+def get_column_header_trie(column_headers: Tuple[ColumnHeader, ...], column_header_types: Tuple[type, ...]) -> Tuple[List[ColumnHeader], Dict[str, Any]]:
+    """
+    Returns the column headers sorted from longest to shortest, and a trie of how they
+    are displayed on the front-end, where the column headers that end at each node are
+    stored under COLUMN_HEADER_TRIE_END by their position in the sorted column headers.
+
+    As the user types a formula, it is parsed on every keystroke with the same column 
+    headers, so we cache this. NOTE: the types of the column headers are part of the
+    cache key, as True == 1, but they are displayed differently.
+    """
+    column_headers_sorted = sorted(column_headers, key=lambda ch: len(str(ch)), reverse=True)
+
+    column_header_trie: Dict[str, Any] = {}
+    for column_header_position, column_header in enumerate(column_headers_sorted):
+        # NOTE: for booleans, and for multi-index headers, we need to make the same transformation 
+        # that we make on the frontend
+        node = column_header_trie
+        for char in get_column_header_display(column_header):
+            node = node.setdefault(char, {})
+        node.setdefault(COLUMN_HEADER_TRIE_END, []).append(column_header_position)
+
+    return column_headers_sorted, column_header_trie
+
+
+def get_column_header_matches(formula: str, column_header_trie: Dict[str, Any]) -> Dict[int, List[ParserMatchSubstringRange]]:
+    """
+    Returns all the ranges of the formula that match a column header in the column_header_trie,
+    including overlapping ones, by the position of the column header. The ranges of each column
+    header are in order of where they start.
+    """
+    column_header_matches: Dict[int, List[ParserMatchSubstringRange]] = {}
+    for start in range(len(formula) + 1):
+        node = column_header_trie
+        end = start
+        while True:
+            for column_header_position in node.get(COLUMN_HEADER_TRIE_END, []):
+                column_header_matches.setdefault(column_header_position, []).append((start, end))
+            
+            if end == len(formula) or formula[end] not in node:
+                break
+            node = node[formula[end]]
+            end += 1
+
+    return column_header_matches
+
+
 def get_raw_parser_matches(
         formula: str,
         formula_label: Union[str, bool, int, float], # Where the formula is written,
@@ -492,68 +543,68 @@ def get_raw_parser_matches(
     # We look for column headers from longest to shortest, to enable us
     # to issues if one column header is a substring of another
     # column header
-    column_headers_sorted = sorted(column_headers, key=lambda ch: len(str(ch)), reverse=True)
+    column_headers_sorted, column_header_trie = get_column_header_trie(tuple(column_headers), tuple(type(ch) for ch in column_headers))
 
-    # First, we go through and replace all the column headers
-    for column_header in column_headers_sorted:
-        def find_column_headers(match: Any) -> Any:
-            found_column_header: str = match.group() # type:ignore
-            start = match.start()
-            end = match.end()
-            match_range = (start, end)
-
-            # Do not replace the column header if it is in a string
-            if match_covered_by_matches(string_matches, match_range):
-                is_string = isinstance(column_header, str)
-                starts_with_quote = is_quote(str(column_header)[0])
-                ends_with_quote = is_quote(str(column_header)[-1])
-
-                if is_string and not (starts_with_quote and ends_with_quote):
-                    return found_column_header
-
-            # If this column header was already covered by another column header
-            # that has been found, then this column header is just a substring
-            # of another column header, so we avoid matching it
-            if match_covered_by_matches([match['substring_range'] for match in raw_parser_matches], match_range):
-                return found_column_header
-
-            # First, we check if it's an unqualified column header with no index
-            if is_no_index_after_column_header_match(formula, index, start, end):
-                raw_parser_matches.append({
-                    'type': '{HEADER}',
-                    'substring_range': match_range,
-                    'parsed': column_header,
-                    'unparsed': found_column_header,
-                    'row_offset': 0
-                })
+    def find_column_header(column_header: ColumnHeader, start: int, end: int) -> None:
+        found_column_header = formula[start:end]
+        match_range = (start, end)
+
+        # Do not replace the column header if it is in a string
+        if match_covered_by_matches(string_matches, match_range):
+            is_string = isinstance(column_header, str)
+            starts_with_quote = is_quote(str(column_header)[0])
+            ends_with_quote = is_quote(str(column_header)[-1])
+
+            if is_string and not (starts_with_quote and ends_with_quote):
                 return
 
-            # Second, check if column header is follwed by an index of any variety
-            number_index_label_match = get_index_match_from_number_index(formula, formula_label, index, end)
-            datetime_index_label_match = get_index_match_from_datetime_index(formula, formula_label, index, end)
-            string_index_label_match = get_index_match_from_string_index(formula, formula_label, index, end)
+        # If this column header was already covered by another column header
+        # that has been found, then this column header is just a substring
+        # of another column header, so we avoid matching it
+        if match_covered_by_matches([match['substring_range'] for match in raw_parser_matches], match_range):
+            return
 
-            index_label_match = number_index_label_match or datetime_index_label_match or string_index_label_match or None
-            if index_label_match is not None:
-                raw_parser_matches.append({
-                    'type': '{HEADER}',
-                    'substring_range': match_range,
-                    'parsed': column_header,
-                    'unparsed': found_column_header,
-                    'row_offset': index_label_match['row_offset']
-                })
-                raw_parser_matches.append(index_label_match)
-                return 
-            
+        # First, we check if it's an unqualified column header with no index
+        if is_no_index_after_column_header_match(formula, index, start, end):
+            raw_parser_matches.append({
+                'type': '{HEADER}',
+                'substring_range': match_range,
+                'parsed': column_header,
+                'unparsed': found_column_header,
+                'row_offset': 0
+            })
+            return
+
+        # Second, check if column header is follwed by an index of any variety
+        number_index_label_match = get_index_match_from_number_index(formula, formula_label, index, end)
+        datetime_index_label_match = get_index_match_from_datetime_index(formula, formula_label, index, end)
+        string_index_label_match = get_index_match_from_string_index(formula, formula_label, index, end)
+
+        index_label_match = number_index_label_match or datetime_index_label_match or string_index_label_match or None
+        if index_label_match is not None:
             # NOTE: we add the column_header, not the found column header
             # as the found column header is a string, and the column_header 
             # may not be
-            return found_column_header
-
-        # First, just find all of the matches, without changing the string, as this shifts indexes
-        # NOTE: for booleans, and for multi-index headers, we need to make the same transformation 
-        # that we make on the frontend
-        re.sub(re.escape(get_column_header_display(column_header)), find_column_headers, formula)
+            raw_parser_matches.append({
+                'type': '{HEADER}',
+                'substring_range': match_range,
+                'parsed': column_header,
+                'unparsed': found_column_header,
+                'row_offset': index_label_match['row_offset']
+            })
+            raw_parser_matches.append(index_label_match)
+
+    # Then, we go through the column headers in this order, and find the matches of each of them from
+    # the start to the end of the formula. NOTE: like searching for each column header on its own, 
+    # the matches of a single column header do not overlap
+    column_header_matches = get_column_header_matches(formula, column_header_trie)
+    for column_header_position in sorted(column_header_matches.keys()):
+        next_start = 0
+        for start, end in column_header_matches[column_header_position]:
+            if start < next_start:
+                continue
+            find_column_header(column_headers_sorted[column_header_position], start, end)
+            next_start = end if end > start else start + 1
 
     # Sort the matches from start to end
     raw_parser_matches = sorted(raw_parser_matches, key=lambda x: x['substring_range'][0])
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Any, Dict, Collection, List, Optional, Tuple
 import pandas as pd
 from mitosheet.preprocessing.preprocess_step_performer import \
     PreprocessStepPerformer
+from mitosheet.state import is_pandas_copy_on_write_enabled
 from mitosheet.types import StepsManagerType
 
 
@@ -31,8 +32,10 @@ class CopyPreprocessStepPerformer(PreprocessStepPerformer):
         new_args = []
         for arg in args:
             if isinstance(arg, pd.DataFrame):
-                # Do a pandas copy if it's a dataframe
-                arg_copy = arg.copy(deep=True)
+                # Do a pandas copy if it's a dataframe. If pandas copy on write mode is 
+                # turned on, a shallow copy is enough, as the data is only copied if the 
+                # passed dataframe or the copy is changed, so we avoid copying large dataframes
+                arg_copy = arg.copy(deep=not is_pandas_copy_on_write_enabled())
             else:
                 # Simple deepcopy if it's a string
                 arg_copy = deepcopy(arg)
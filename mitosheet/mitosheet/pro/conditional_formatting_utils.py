@@ -11,12 +11,17 @@ def get_conditonal_formatting_result(
         df: pd.DataFrame,
         conditional_formatting_rules: List[Dict[str, Any]],
         max_rows: Optional[int]=MAX_ROWS,
+        start_row: int=0,
     ) -> ConditionalFormattingResult: 
     from mitosheet.step_performers.filter import check_filters_contain_condition_that_needs_full_df
 
     invalid_conditional_formats: ConditionalFormattingInvalidResults = dict()
     formatted_result: ConditionalFormattingCellResults = dict()
 
+    # We only return results for the rows that are displayed in the frontend
+    end_row = start_row + max_rows if max_rows is not None else None
+    windowed_df = df.iloc[start_row:end_row]
+
     for conditional_format in conditional_formatting_rules:
         try:
 
@@ -30,22 +35,22 @@ def get_conditonal_formatting_result(
                 filters  = conditional_format["filters"]
                 backgroundColor = conditional_format.get("backgroundColor", None)
                 color = conditional_format.get("color", None)
-                
-                # Certain filter conditions require the entire dataframe to be present, as they calculate based
-                # on the full dataframe. In other cases, we only operate on the first 1500 rows, for speed
-                _df = df
-                if not check_filters_contain_condition_that_needs_full_df(filters):
-                    df = df.head(max_rows)
 
                 column_header = state.column_ids.get_column_header_by_id(sheet_index, column_id)
 
                 # Use the get_applied_filter function from our filtering infrastructure
                 from mitosheet.step_performers.filter import \
                     get_full_applied_filter
-                full_applied_filter, _ = get_full_applied_filter(_df, column_header, 'And', filters)
+                
+                # Certain filter conditions require the entire dataframe to be present, as they calculate based
+                # on the full dataframe. In other cases, we only operate on the displayed rows, for speed
+                if check_filters_contain_condition_that_needs_full_df(filters):
+                    full_applied_filter, _ = get_full_applied_filter(df, column_header, 'And', filters)
+                    full_applied_filter = full_applied_filter.iloc[start_row:end_row]
+                else:
+                    full_applied_filter, _ = get_full_applied_filter(windowed_df, column_header, 'And', filters)
 
-                # We can only take the first max_rows here, as this is all we need
-                applied_indexes = _df[full_applied_filter].head(max_rows).index.tolist()
+                applied_indexes = windowed_df[full_applied_filter.to_numpy()].index.tolist()
 
                 for index in applied_indexes:
                     # We need to make this index valid json, and do so in a way that is consistent with how indexes
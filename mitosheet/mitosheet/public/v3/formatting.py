@@ -1,4 +1,4 @@
-from typing import Any, List, Optional, Dict
+from typing import Any, List, Optional, Dict, Tuple
 
 from openpyxl.styles import Font, PatternFill
 from openpyxl.styles import NamedStyle
@@ -97,6 +97,10 @@ def add_conditional_formats(
     if conditional_formats is None:
         return
 
+    # The data is below the header row. We get this from the dataframe rather than
+    # the sheet, as write only sheets do not know how many rows they have
+    max_row = len(df.index) + 1
+
     for conditional_format in conditional_formats:
         for filter in conditional_format.get('filters', []):
             # Create the conditional formatting color objects
@@ -113,7 +117,7 @@ def add_conditional_formats(
             for column_header in conditional_format['columns']:
                 column_index = df.columns.tolist().index(column_header)
                 column = get_column_from_column_index(column_index)
-                cell_range = f'{column}2:{column}{sheet.max_row}'
+                cell_range = f'{column}2:{column}{max_row}'
                 column_conditional_rule = get_conditional_format_rule(
                     filter_condition=filter['condition'],
                     fill=cond_fill,
@@ -126,41 +130,53 @@ def add_conditional_formats(
                     sheet.conditional_formatting.add(cell_range, column_conditional_rule)
 
 
-def add_number_formatting(
+def get_column_number_formats(
     number_formats: Optional[Dict[str, str]],
-    sheet: Worksheet,
     df: DataFrame
-) -> None:
-    default_number_format_column_indexes = set(range(len(df.columns)))
+) -> Dict[int, str]:
+    """
+    Returns the number format of each column index that has one. These are the user 
+    defined number formats, and otherwise the default number formats for float columns,
+    which have comma separators and 2 decimal places, and int columns.
+    """
+    column_headers = df.columns.tolist()
+    column_number_formats: Dict[int, str] = {}
+
+    for column_index, column_header in enumerate(column_headers):
+        dtype = str(df[column_header].dtype)
+        if is_float_dtype(dtype):
+            column_number_formats[column_index] = '#,##0.00'
+        if is_int_dtype(dtype):
+            column_number_formats[column_index] = '#,##0'
 
-    # For all the columns that have user defined number formats 
-    # apply those
     if number_formats is not None:
         for column_header, number_format in number_formats.items():
-            column_index = df.columns.tolist().index(column_header)
-            column = get_column_from_column_index(column_index)
-            cell_range = f'{column}2:{column}{sheet.max_row}'
-            for cell in sheet[cell_range]:
-                cell[0].number_format = number_format
+            column_number_formats[column_headers.index(column_header)] = number_format
+    
+    return column_number_formats
 
-            default_number_format_column_indexes.remove(column_index)
 
-    # For all the float columns that have default number formats
-    # and contain numbers, apply the default number format
-    # which has comma separators and 2 decimal places
-    column_headers = df.columns.tolist()
-    for column_index in default_number_format_column_indexes:
-        column_header = column_headers[column_index]
-        dtype = str(df[column_header].dtype)
-        column = get_column_from_column_index(column_index)
-        cell_range = f'{column}2:{column}{sheet.max_row}'
+def add_number_formatting(
+    number_formats: Optional[Dict[str, str]],
+    sheet: Worksheet,
+    df: DataFrame
+) -> None:
+    for column_index, number_format in get_column_number_formats(number_formats, df).items():
+        for row in sheet.iter_rows(min_row=2, max_row=sheet.max_row, min_col=column_index + 1, max_col=column_index + 1):
+            row[0].number_format = number_format
 
-        if is_float_dtype(dtype):
-            for cell in sheet[cell_range]:
-                cell[0].number_format = '#,##0.00'
-        if is_int_dtype(dtype):
-            for cell in sheet[cell_range]:
-                cell[0].number_format = '#,##0'
+def get_header_font_and_fill(
+    header_background_color: Optional[str]=None,
+    header_font_color: Optional[str]=None
+) -> Tuple[Font, Optional[PatternFill]]:
+    """
+    Returns the font and fill of the header row, or a None fill if there is no
+    header background color.
+    """
+    # Remove the # from the colors
+    font = Font(color=header_font_color[1:]) if header_font_color else Font()
+    fill = PatternFill(start_color=header_background_color[1:], end_color=header_background_color[1:], fill_type="solid") if header_background_color else None
+    return font, fill
 
 def add_header_formatting_to_excel_sheet(
     writer: ExcelWriter,
@@ -178,12 +194,9 @@ def add_header_formatting_to_excel_sheet(
     # Add formatting to the header row   
     header_name = f"{sheet_name}_Header"
     header_format = NamedStyle(name=header_name)
-    if header_font_color:
-        # Remove the # from the color
-        header_format.font = Font(color=header_font_color[1:])
-    if header_background_color:
-        # Remove the # from the color
-        header_format.fill = PatternFill(start_color=header_background_color[1:], end_color=header_background_color[1:], fill_type="solid")
+    header_format.font, header_fill = get_header_font_and_fill(header_background_color, header_font_color)
+    if header_fill is not None:
+        header_format.fill = header_fill
     
     # Only add format if there is a header color or background color
     has_header_formatting = header_background_color or header_font_color 
@@ -195,6 +208,34 @@ def add_header_formatting_to_excel_sheet(
         for col in range(1, sheet.max_column + 1):
             sheet.cell(row=1, column=col).style = header_name
 
+def add_banded_row_formats(
+    sheet: Worksheet,
+    num_rows: int,
+    num_columns: int,
+    even_background_color: Optional[str]=None,
+    even_font_color: Optional[str]=None,
+    odd_background_color: Optional[str]=None,
+    odd_font_color: Optional[str]=None
+) -> None:
+    """
+    Adds the even and odd row formatting to the num_rows rows below the header as two
+    conditional formats, rather than giving each cell a style, which is very slow for
+    large sheets. As with the header, the first row below the header is even.
+
+    These should be added after any other conditional formats, so that those take priority.
+    """
+    if num_rows == 0 or num_columns == 0:
+        return
+
+    cell_range = f'A2:{get_column_from_column_index(num_columns - 1)}{num_rows + 1}'
+    for remainder, background_color, font_color in [(0, even_background_color, even_font_color), (1, odd_background_color, odd_font_color)]:
+        if not background_color and not font_color:
+            continue
+        # Remove the # from the colors
+        fill = PatternFill(start_color=background_color[1:], end_color=background_color[1:], fill_type="solid") if background_color else None
+        font = Font(color=font_color[1:]) if font_color else None
+        sheet.conditional_formatting.add(cell_range, FormulaRule(formula=[f'MOD(ROW(),2)={remainder}'], fill=fill, font=font))
+
 def add_row_formatting_to_excel_sheet(
     writer: ExcelWriter,
     sheet_name: str,
@@ -210,36 +251,15 @@ def add_row_formatting_to_excel_sheet(
     workbook = writer.book
     sheet = workbook.get_sheet_by_name(sheet_name)
 
-    # Add formatting to the rows
-    even_name = f"{sheet_name}_Even"
-    odd_name = f"{sheet_name}_Odd"
-    even_format = NamedStyle(name=even_name)
-    odd_format = NamedStyle(name=odd_name)
-
-    # Remove the # from the colors and define the formatting objects
-    if even_background_color:
-        even_format.fill = PatternFill(start_color=even_background_color[1:], end_color=even_background_color[1:], fill_type="solid")
-    if even_font_color:
-        even_format.font = Font(color=even_font_color[1:])
-    if odd_background_color:
-        odd_format.fill = PatternFill(start_color=odd_background_color[1:], end_color=odd_background_color[1:], fill_type="solid")
-    if odd_font_color:
-        odd_format.font = Font(color=odd_font_color[1:])
-    
-    # Only add format if there is a background color or font color
-    has_row_formatting = even_background_color or even_font_color or odd_background_color or odd_font_color
-    if not has_row_formatting:
-        return
-
-    workbook.add_named_style(even_format)
-    workbook.add_named_style(odd_format)
-
-    for row in range(2, sheet.max_row + 1):
-        for col in range(1, sheet.max_column + 1):
-            if row % 2 == 0:
-                sheet.cell(row=row, column=col).style = even_name
-            else:
-                sheet.cell(row=row, column=col).style = odd_name
+    add_banded_row_formats(
+        sheet,
+        sheet.max_row - 1,
+        sheet.max_column,
+        even_background_color=even_background_color,
+        even_font_color=even_font_color,
+        odd_background_color=odd_background_color,
+        odd_font_color=odd_font_color
+    )
 
 
 def add_formatting_to_excel_sheet(
@@ -271,6 +291,9 @@ def add_formatting_to_excel_sheet(
         header_font_color=header_font_color
     )
 
+    # The conditional formats are added before the row formatting, so they take priority
+    add_conditional_formats(conditional_formats, sheet, df)
+
     add_row_formatting_to_excel_sheet(
         writer=writer,
         sheet_name=sheet_name,
@@ -280,6 +303,4 @@ def add_formatting_to_excel_sheet(
         odd_font_color=odd_font_color
     )
 
-    add_conditional_formats(conditional_formats, sheet, df)
-
     add_number_formatting(number_formats, sheet, df)
\ No newline at end of file
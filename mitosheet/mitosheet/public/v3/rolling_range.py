@@ -2,8 +2,19 @@
 from datetime import datetime, timedelta
 from typing import Callable, Union
 
+import numpy as np
 import pandas as pd
 
+# The aggregations that a RollingRange can compute for all windows at once, 
+# rather than calling a function on each window. 
+# NOTE: std and var are not included, as pandas computes rolling variances by adding and
+# removing values from running totals, which loses a lot of precision when the values
+# are large compared to their spread (e.g. 1e9 + small changes)
+VECTORIZED_AGGREGATIONS = ['sum', 'count', 'min', 'max']
+
+# The largest integer that can be stored in a float without losing precision
+MAX_SAFE_INTEGER_IN_FLOAT = 2 ** 53
+
 
 class RollingRange():
     """
@@ -47,7 +58,7 @@ class RollingRange():
         end = start + self.window
 
         while (start - self.offset) < len(self.obj): 
-            df_subset = self.obj[max(0, start):end] # avoid negative start, as this wraps around to the end
+            df_subset = self.obj[max(0, start):max(0, end)] # avoid negative start and end, as these wrap around to the end
 
             # We manually detect the default value case, as it messes up types otherwise (e.g. .sum().sum() returns a float with an empty df)
             if len(df_subset) == 0:
@@ -67,4 +78,70 @@ class RollingRange():
             else:
                 result = result + default_values
 
-        return pd.Series(result, index=self.obj.index)
\ No newline at end of file
+        return pd.Series(result, index=self.obj.index)
+
+    def aggregate(self, aggregation: str, func: Callable[[pd.DataFrame], Union[str, float, int, bool, datetime, timedelta]], default_value: Union[str, float, int, bool, datetime, timedelta]=0) -> pd.Series:
+        """
+        Returns a series with the aggregation of all the values in each window, with the
+        same index as the original dataframe. aggregation must be one of VECTORIZED_AGGREGATIONS, 
+        and func must compute the same aggregation for a single window.
+
+        If the dataframe only contains numbers, this is computed for all windows at once, 
+        which is much faster than calling func on each window. Otherwise, we fall back to 
+        calling func on each window with apply.
+        """
+        dtype_kinds = set(dtype.kind for dtype in self.obj.dtypes)
+        if aggregation not in VECTORIZED_AGGREGATIONS or len(self.obj.columns) == 0 or not dtype_kinds.issubset({'i', 'u', 'f'}):
+            return self.apply(func, default_value=default_value)
+
+        values = self.obj.to_numpy()
+        only_integers = 'f' not in dtype_kinds
+
+        num_rows, num_columns = values.shape
+        row_positions = np.arange(num_rows)
+        window_starts = np.clip(row_positions + self.offset, 0, num_rows)
+        window_ends = np.clip(row_positions + self.offset + self.window, 0, num_rows)
+        empty_windows = window_starts >= window_ends
+
+        # If all windows are empty, there is nothing to compute, and apply gets the types right
+        if empty_windows.all():
+            return self.apply(func, default_value=default_value)
+
+        if aggregation == 'count' or (aggregation == 'sum' and only_integers):
+            # For counts and sums of integers, we can compute exactly with cumulative sums
+            if aggregation == 'count':
+                row_totals = num_columns - np.isnan(values.astype(float)).sum(axis=1) if not only_integers else np.full(num_rows, num_columns)
+            else:
+                row_totals = values.sum(axis=1)
+            cumulative_totals = np.concatenate([[0], np.cumsum(row_totals)])
+            result = cumulative_totals[window_ends] - cumulative_totals[window_starts]
+            return pd.Series(np.where(empty_windows, default_value, result), index=self.obj.index)
+
+        if only_integers and np.abs(values).max(initial=0) >= MAX_SAFE_INTEGER_IN_FLOAT:
+            # These integers would lose precision in the floats we compute the rolling windows on
+            return self.apply(func, default_value=default_value)
+
+        with np.errstate(over='ignore'):
+            absolute_sum = np.nansum(np.abs(values.astype(float)))
+        if np.isinf(values).any() or not np.isfinite(absolute_sum):
+            # Rolling windows turn infinite values into NaN, and a running total that
+            # overflows stays infinite for all the later windows
+            return self.apply(func, default_value=default_value)
+
+        # We flatten all the values in the dataframe row by row, so that a window of rows is a 
+        # window of values of a fixed size. We pad the end with NaN so that the windows that run 
+        # off the end of the dataframe still have the right values, as NaN values are skipped
+        window_size = self.window * num_columns
+        flat_values = np.concatenate([values.astype(float).ravel(), np.full(window_size, np.nan)])
+        rolling = pd.Series(flat_values).rolling(window_size, min_periods=0 if aggregation == 'sum' else 1)
+        rolling_result = getattr(rolling, aggregation)().to_numpy()
+
+        # The window for each row ends right before the first value in the row after the window
+        window_last_value_positions = (row_positions + self.offset + self.window) * num_columns - 1
+        window_last_value_positions = np.clip(window_last_value_positions, 0, len(flat_values) - 1)
+        result = np.where(empty_windows, default_value, rolling_result[window_last_value_positions])
+
+        if only_integers and (aggregation == 'min' or aggregation == 'max'):
+            result = result.astype(values.dtype)
+
+        return pd.Series(result, index=self.obj.index)
@@ -28,7 +28,7 @@ from mitosheet.public.v3.errors import handle_sheet_function_errors
 from mitosheet.public.v3.rolling_range import RollingRange
 from mitosheet.public.v3.sheet_functions.utils import (
     get_final_result_series_or_primitive, get_index_from_series,
-    get_series_from_primitive_or_series)
+    get_series_from_primitive_or_series, get_series_rounded_half_up)
 from mitosheet.public.v3.types.decorators import (
     cast_values_in_all_args_to_type, cast_values_in_arg_to_type)
 from mitosheet.public.v3.types.sheet_function_types import (
@@ -104,7 +104,7 @@ def AVG(*argv: Optional[NumberInputType]) -> NumberFunctionReturnType:
             num_entries += int(num_non_null_values)
 
         elif isinstance(arg, RollingRange):
-            num_non_null_values_series = arg.apply(lambda df: df.count().sum())
+            num_non_null_values_series = arg.aggregate('count', lambda df: df.count().sum())
             num_entries += num_non_null_values_series
             
         elif isinstance(arg, pd.Series):
@@ -349,7 +349,8 @@ def MAX(*argv: Union[NumberInputType, None, DatetimeRestrictedInputType]) -> Uni
         argv,
         lambda df: df.max().max(),
         lambda previous_value, new_value: max(previous_value, new_value),
-        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).max(axis=1)
+        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).max(axis=1),
+        rolling_range_aggregation='max'
     )
 
     # If we don't find any arguements, we default to 0 -- like Excel -- even for numbers
@@ -408,7 +409,8 @@ def MIN(*argv: Union[NumberInputType, None, DatetimeRestrictedInputType]) -> Uni
         argv,
         lambda df: df.min().min(),
         lambda previous_value, new_value: min(previous_value, new_value),
-        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).min(axis=1)
+        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).min(axis=1),
+        rolling_range_aggregation='min'
     )
 
     # If we don't find any arguements, we default to 0 -- like Excel
@@ -526,6 +528,12 @@ def ROUND(arg: NumberRestrictedInputType, decimals: Optional[IntRestrictedInputT
     if (isinstance(arg, int) or isinstance(arg, float)) and isinstance(decimals, int):
         return excel_round(arg, decimals) 
 
+    # If all numbers are rounded to the same number of decimals, try to round them all at once
+    if isinstance(arg, pd.Series) and isinstance(decimals, int):
+        rounded_series = get_series_rounded_half_up(arg, decimals, excel_round)
+        if rounded_series is not None:
+            return rounded_series
+
     index = get_index_from_series(arg, decimals)
     arg = get_series_from_primitive_or_series(arg, index).fillna(np.nan)
     decimals = get_series_from_primitive_or_series(decimals, index).fillna(0)
@@ -625,7 +633,8 @@ def SUM(*argv: Optional[NumberInputType]) -> NumberFunctionReturnType:
         argv,
         lambda df: df.sum().sum(),
         lambda previous_value, new_value: previous_value + new_value,
-        lambda previous_series, new_series: previous_series + new_series
+        lambda previous_series, new_series: previous_series + new_series,
+        rolling_range_aggregation='sum'
     )
 
 @cast_values_in_all_args_to_type('number')
@@ -14,8 +14,8 @@ import pandas as pd
 
 from mitosheet.public.v3.errors import handle_sheet_function_errors
 from mitosheet.public.v3.sheet_functions.utils import (
-    get_final_result_series_or_primitive, get_index_from_series,
-    get_series_from_primitive_or_series)
+    can_use_str_accessor, get_final_result_series_or_primitive,
+    get_index_from_series, get_series_from_primitive_or_series)
 from mitosheet.public.v3.types.decorators import (
     cast_values_in_all_args_to_type, cast_values_in_arg_to_type)
 from mitosheet.public.v3.types.sheet_function_types import (
@@ -121,6 +121,11 @@ def FIND(string: StringRestrictedInputType, substrings: StringRestrictedInputTyp
     # otherwise, turn them into series
     index = get_index_from_series(string, substrings)
     string = get_series_from_primitive_or_series(string, index).fillna('')
+
+    # If we search for the same substring in every string, we can search all of them at once
+    if isinstance(substrings, str) and can_use_str_accessor(string):
+        return (string.str.find(substrings) + 1).rename(None)
+
     substrings = get_series_from_primitive_or_series(substrings, index).fillna('XTREME_MITOSHEET_NULL_VALUE_1234567890_0987654321_NULL_VALUE_MITOSHEET_XTREME') # This is a hack to make sure that the find function returns 0 for null values
     
     return pd.Series(
@@ -167,6 +172,11 @@ def LEFT(string: StringRestrictedInputType, num_chars: Optional[IntRestrictedInp
     # otherwise, turn them into series for simplicity
     index = get_index_from_series(string, num_chars)
     string_series = get_series_from_primitive_or_series(string, index).fillna('')
+
+    # If we take the same number of characters from every string, we can slice all of them at once
+    if isinstance(num_chars, int) and can_use_str_accessor(string_series):
+        return string_series.str.slice(stop=num_chars).rename(None)
+
     num_chars_series = get_series_from_primitive_or_series(num_chars, index).fillna(0)
 
     return pd.Series(
@@ -270,6 +280,11 @@ def MID(string: StringRestrictedInputType, start_loc: IntRestrictedInputType, nu
     # Turn all of them into a series to simplify things
     index = get_index_from_series(string, start_loc, num_chars)
     string = get_series_from_primitive_or_series(string, index).fillna('')
+
+    # If we take the same segment from every string, we can slice all of them at once
+    if isinstance(start_loc, int) and isinstance(num_chars, int) and can_use_str_accessor(string):
+        return string.str.slice(start_loc - 1, start_loc + num_chars - 1).rename(None)
+
     start_loc = get_series_from_primitive_or_series(start_loc, index).fillna(0)
     num_chars = get_series_from_primitive_or_series(num_chars, index).fillna(0)
     
@@ -343,6 +358,13 @@ def RIGHT(string: StringRestrictedInputType, num_chars: Optional[IntRestrictedIn
     
     index = get_index_from_series(string, num_chars)
     string_series = get_series_from_primitive_or_series(string, index).fillna('')
+
+    # If we take the same number of characters from every string, we can slice all of them at once
+    if isinstance(num_chars, int) and can_use_str_accessor(string_series):
+        if num_chars == 0:
+            return pd.Series([''] * len(index), index=index)
+        return string_series.str.slice(start=-num_chars).rename(None)
+
     num_chars_series = get_series_from_primitive_or_series(num_chars, index).fillna(0)
 
     return pd.Series(
@@ -396,6 +418,11 @@ def SUBSTITUTE(string: StringRestrictedInputType, old_text: StringRestrictedInpu
 
     index = get_index_from_series(string, old_text, new_text, count)
     string_series = get_series_from_primitive_or_series(string, index).fillna('')
+
+    # If we make the same substitution in every string, we can replace in all of them at once
+    if isinstance(old_text, str) and isinstance(new_text, str) and isinstance(count, int) and can_use_str_accessor(string_series):
+        return string_series.str.replace(old_text, new_text, n=count, regex=False).rename(None)
+
     old_text_series = get_series_from_primitive_or_series(old_text, index).fillna('')
     new_text_series = get_series_from_primitive_or_series(new_text, index).fillna('')
     count_series = get_series_from_primitive_or_series(count, index).fillna(0)
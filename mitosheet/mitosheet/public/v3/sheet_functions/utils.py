@@ -62,7 +62,8 @@ def __get_new_result_series_or_primitive(
         arg: Union[PrimitiveType, None, pd.Series, RollingRange, pd.DataFrame], 
         get_primitive_value_from_dataframe: Callable[[pd.DataFrame], PrimitiveType],
         get_new_result_from_primitive_values: Callable[[PrimitiveType, PrimitiveType], PrimitiveType],
-        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series]
+        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series],
+        rolling_range_aggregation: Optional[str]
     ) -> ResultType:
     """
     This helper function does the preprocessing for a single arg, and then combines it
@@ -83,7 +84,10 @@ def __get_new_result_series_or_primitive(
         return get_new_result(previous_result, reduced_df)
 
     elif isinstance(arg, RollingRange):
-        new_series = arg.apply(lambda df: get_primitive_value_from_dataframe(df))
+        if rolling_range_aggregation is not None:
+            new_series = arg.aggregate(rolling_range_aggregation, get_primitive_value_from_dataframe)
+        else:
+            new_series = arg.apply(lambda df: get_primitive_value_from_dataframe(df))
         return get_new_result(previous_result, new_series)
         
     elif isinstance(arg, pd.Series):
@@ -101,7 +105,8 @@ def get_final_result_series_or_primitive(
         argv: Tuple[Union[PrimitiveType, None, pd.Series, RollingRange, pd.DataFrame], ...], 
         get_primitive_value_from_dataframe: Callable[[pd.DataFrame], PrimitiveType],
         get_new_result_from_primitive_values: Callable[[PrimitiveType, PrimitiveType], PrimitiveType],
-        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series]
+        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series],
+        rolling_range_aggregation: Optional[str]=None
     ) -> ResultType:
     """
     This function is the main workhorse of many sheet functions that fit a common pattern:
@@ -121,6 +126,9 @@ def get_final_result_series_or_primitive(
     Notably, to make get_new_result_from_primitive_values and get_new_result_from_series easier, we fill all NaN and None
     values in the primitive values and series results being combined with the default_value before sending them to 
     these functions in step (4).
+
+    If get_primitive_value_from_dataframe computes one of the aggregations that a RollingRange can vectorize, pass
+    its name as rolling_range_aggregation, so rolling ranges are computed for all windows at once in step (3).
     """
 
     result: ResultType = default_value
@@ -132,7 +140,8 @@ def get_final_result_series_or_primitive(
             arg,
             get_primitive_value_from_dataframe,
             get_new_result_from_primitive_values,
-            get_new_result_from_series
+            get_new_result_from_series,
+            rolling_range_aggregation
         )
 
     return result 
@@ -153,4 +162,68 @@ def get_series_from_primitive_or_series(
     if isinstance(arg, pd.Series):
         return arg
     else:
-        return pd.Series([arg] * len(index), index=index)
\ No newline at end of file
+        return pd.Series([arg] * len(index), index=index)
+
+def can_use_str_accessor(series: pd.Series) -> bool:
+    """
+    Returns True if the .str accessor can be used on the series of strings, which is
+    much faster than calling a str method on each element in a loop, and gives the 
+    same result. Expects that all values in the series have already been cast to strings.
+    """
+    return len(series) > 0 and series.dtype == object
+
+
+def get_series_rounded_half_up(
+        series: pd.Series, 
+        decimals: int,
+        round_value: Callable[[float, int], Optional[Union[int, float]]]
+    ) -> Optional[pd.Series]:
+    """
+    Rounds all the numbers in the series to the given number of decimals at once, rounding 
+    halves away from zero like Excel does. round_value must round a single number in the same
+    way, and is used for the few numbers that are too close to a half to be rounded exactly
+    with floats.
+
+    Returns None if the series cannot be rounded at once, in which case each number should
+    be rounded with round_value instead.
+    """
+    if len(series) == 0:
+        return None
+
+    if series.dtype.kind == 'i':
+        # Rounding an integer to a positive number of decimals does not change it. We only
+        # handle few enough decimals that rounding with a decimal.Decimal would not error
+        if decimals < 0 or decimals > 9:
+            return None
+        return pd.Series(series.to_numpy(dtype='int64'), index=series.index)
+    
+    if series.dtype.kind != 'f' or abs(decimals) > 22:
+        return None
+    
+    values = series.to_numpy(dtype='float64')
+    nan_values = np.isnan(values)
+    if nan_values.all() or np.isinf(values).any():
+        return None
+
+    # Powers of ten up to 10^22 are exact as floats
+    scale = 10.0 ** abs(decimals)
+    absolute_values = np.abs(values)
+
+    # Huge numbers may overflow when scaled, but these are rounded one by one below anyways
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled_values = absolute_values * scale if decimals >= 0 else absolute_values / scale
+        integer_parts = np.floor(scaled_values)
+        fractional_parts = scaled_values - integer_parts
+        rounded_values = integer_parts + (fractional_parts >= .5)
+        result = rounded_values / scale if decimals >= 0 else rounded_values * scale
+        result = np.copysign(result, values)
+
+    # Scaling a float may be off by half a unit in the last place, so we round any numbers 
+    # whose fractional part is within that error of a half one by one. We do the same for 
+    # numbers too large to have exact fractional parts
+    tolerance = 0 if decimals == 0 else scaled_values * 1e-15
+    inexact_values = ((np.abs(fractional_parts - .5) < tolerance) | (scaled_values >= 2 ** 52)) & ~nan_values
+    for position in np.flatnonzero(inexact_values):
+        result[position] = round_value(values[position].item(), decimals)
+
+    return pd.Series(result, index=series.index)
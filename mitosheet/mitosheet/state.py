@@ -4,7 +4,9 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 from collections import OrderedDict
-from copy import deepcopy
+from copy import copy, deepcopy
+from itertools import count
+import random
 from typing import Any, Callable, Collection, List, Dict, Optional, Set, Union
 import pandas as pd
 
@@ -32,6 +34,27 @@ NUMBER_FORMAT_PERCENTAGE = "percentage"
 NUMBER_FORMAT_SCIENTIFIC_NOTATION = "scientific notation"
 
 
+# Every time a sheet is changed, it is given a new version from this counter. States can be
+# pickled and loaded in another process, so we start the counter at a random place, so that
+# versions from different processes are not the same
+_sheet_version_counter = count(random.getrandbits(62))
+
+def get_new_sheet_version() -> int:
+    return next(_sheet_version_counter)
+
+
+def is_pandas_copy_on_write_enabled() -> bool:
+    """
+    Returns True if the user has turned on pandas copy on write mode, in which
+    case shallow copies of dataframes are never modified by changes to the copy.
+    """
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except (KeyError, pd.errors.OptionError):
+        # Versions of pandas before 1.5 do not have copy on write
+        return False
+
+
 def get_default_dataframe_format() -> DataframeFormat:
     return {
         "columns": {},
@@ -70,9 +93,13 @@ class State:
         user_defined_functions: Optional[List[Callable]]=None,
         user_defined_importers: Optional[List[Callable]]=None,
         user_defined_editors: Optional[List[Callable]]=None,
+        sheet_versions: Optional[List[int]]=None,
     ):
 
-        # The dataframes that are in the state
+        # The dataframes that are in the state. To save memory, these can be
+        # evicted and recomputed when they are next used (see evict_dfs)
+        self._recompute_dfs: Optional[Callable[[], List[pd.DataFrame]]] = None
+        self.dfs_recomputed = False
         self.dfs = list(dfs)
 
         self.public_interface_version = public_interface_version
@@ -144,30 +171,98 @@ class State:
         self.user_defined_importers = user_defined_importers if user_defined_importers is not None else []
         self.user_defined_editors = user_defined_editors if user_defined_editors is not None else []
 
+        # Each sheet has a version, which changes every time a step changes that sheet (see
+        # get_sheet_versions_after_step). This lets us tell which sheets are the same in two 
+        # states without comparing them, and so skip reexecuting steps that only use those sheets
+        self.sheet_versions: List[int] = (
+            sheet_versions
+            if sheet_versions is not None
+            else [get_new_sheet_version() for _ in range(len(self.dfs))]
+        )
+
+    @property
+    def dfs(self) -> List[pd.DataFrame]:
+        if self._dfs is None:
+            self._dfs = self._recompute_dfs() if self._recompute_dfs is not None else []
+            self.dfs_recomputed = True
+        return self._dfs
+
+    @dfs.setter
+    def dfs(self, dfs: List[pd.DataFrame]) -> None:
+        self._dfs: Optional[List[pd.DataFrame]] = dfs
+
+    @property
+    def dfs_evicted(self) -> bool:
+        return self._dfs is None
+
+    def evict_dfs(self, recompute_dfs: Callable[[], List[pd.DataFrame]]) -> None:
+        """
+        Drops the dataframes in this state to free memory. The next time the
+        dataframes are used, recompute_dfs is called to recreate them, and so
+        it must return the exact same dataframes. To be able to pickle the 
+        state, recompute_dfs must be picklable as well.
+
+        Only the dataframes are evicted, so all other metadata in the state
+        remains usable while the dataframes are evicted.
+        """
+        self._recompute_dfs = recompute_dfs
+        self._dfs = None
+
     def copy(self, deep_sheet_indexes: Optional[Union[List[int], Set[int], None]]=None) -> "State":
         """
         Returns a copy of the state, while only making deep copies of
-        those dataframes in the deep_sheet_indexes. Ideally, we'd copy
-        even less than that deeply.
+        those dataframes in the deep_sheet_indexes. If pandas copy on write
+        mode is turned on, no dataframes are copied deeply, as pandas will
+        only copy the data if it is actually changed.
+
+        To keep copies cheap, some pieces of the state are shared between
+        the state and its copy, and so must never be changed in place:
+        1. The entries in the graph_data_array, which contain the rendered graphs. 
+           Steps replace the entry for a graph instead of editing it.
+        2. The index and location of each formula in column_formulas, which
+           can be as long as the dataframe itself.
         """
-        if deep_sheet_indexes is None:
+        if deep_sheet_indexes is None or is_pandas_copy_on_write_enabled():
             deep_sheet_indexes = []
         
         return State(
             [df.copy(deep=index in deep_sheet_indexes) for index, df in enumerate(self.dfs)],
             self.public_interface_version,
-            df_names=deepcopy(self.df_names),
-            df_sources=deepcopy(self.df_sources),
+            df_names=copy(self.df_names),
+            df_sources=copy(self.df_sources),
             column_ids=deepcopy(self.column_ids),
-            column_formulas=deepcopy(self.column_formulas),
+            column_formulas=copy_column_formulas(self.column_formulas),
             column_filters=deepcopy(self.column_filters),
             df_formats=deepcopy(self.df_formats),
-            graph_data_array=deepcopy(self.graph_data_array),
-            user_defined_functions=deepcopy(self.user_defined_functions),
-            user_defined_importers=deepcopy(self.user_defined_importers),
-            user_defined_editors=deepcopy(self.user_defined_editors),
+            graph_data_array=copy(self.graph_data_array),
+            user_defined_functions=copy(self.user_defined_functions),
+            user_defined_importers=copy(self.user_defined_importers),
+            user_defined_editors=copy(self.user_defined_editors),
+            sheet_versions=copy(self.sheet_versions),
         )
 
+    def copy_with_sheets_from(self, other_state: "State", sheet_indexes: Set[int]) -> "State":
+        """
+        Returns a copy of the state, where the dataframes and all the metadata for 
+        the sheets at sheet_indexes are taken from the other_state instead.
+
+        Both states must have the same number of sheets.
+        """
+        new_state = self.copy()
+
+        for sheet_index in sheet_indexes:
+            new_state.dfs[sheet_index] = other_state.dfs[sheet_index]
+            new_state.df_names[sheet_index] = other_state.df_names[sheet_index]
+            new_state.df_sources[sheet_index] = other_state.df_sources[sheet_index]
+            new_state.column_ids.column_id_to_column_header[sheet_index] = deepcopy(other_state.column_ids.column_id_to_column_header[sheet_index])
+            new_state.column_ids.column_header_to_column_id[sheet_index] = deepcopy(other_state.column_ids.column_header_to_column_id[sheet_index])
+            new_state.column_formulas[sheet_index] = copy_column_formulas([other_state.column_formulas[sheet_index]])[0]
+            new_state.column_filters[sheet_index] = deepcopy(other_state.column_filters[sheet_index])
+            new_state.df_formats[sheet_index] = deepcopy(other_state.df_formats[sheet_index])
+            new_state.sheet_versions[sheet_index] = other_state.sheet_versions[sheet_index]
+
+        return new_state
+
     def add_df_to_state(
         self,
         new_df: pd.DataFrame,
@@ -220,6 +315,7 @@ class State:
                 if df_format is None
                 else df_format
             )
+            self.sheet_versions.append(get_new_sheet_version())
 
             # Return the index of this sheet
             return len(self.dfs) - 1
@@ -270,6 +366,7 @@ class State:
                 if df_format is None
                 else df_format
             )
+            self.sheet_versions[sheet_index] = get_new_sheet_version()
 
             # Return the index of this sheet
             return sheet_index
@@ -322,4 +419,44 @@ class State:
                 self.__setattr__(key, new_value)
 
         # Then, update the column ids mapping object itself
-        self.column_ids.move_to_deprecated_id_format()
\ No newline at end of file
+        self.column_ids.move_to_deprecated_id_format()
+
+def copy_column_formulas(column_formulas: List[Dict[ColumnID, List[FrontendFormulaAndLocation]]]) -> List[Dict[ColumnID, List[FrontendFormulaAndLocation]]]:
+    """
+    Copies the column formulas, without copying the index and location of each formula,
+    as these are never changed once the formula is set.
+    """
+    return [
+        {
+            column_id: [copy(formula_and_location) for formula_and_location in formulas_and_locations]
+            for column_id, formulas_and_locations in sheet_column_formulas.items()
+        }
+        for sheet_column_formulas in column_formulas
+    ]
+
+
+def get_sheet_versions_after_step(prev_state: State, post_state: State, modified_dataframe_indexes: Set[int]) -> List[int]:
+    """
+    Given the prev_state and post_state of a step, and the sheet indexes that the 
+    step says it modified, returns the versions of the sheets in the post_state.
+
+    Sheets that the step did not modify keep their version from the prev_state, 
+    and all other sheets get a new version. If we cannot tell which sheets were 
+    modified, then every sheet gets a new version.
+    """
+    num_prev_sheets = len(prev_state.dfs)
+    num_post_sheets = len(post_state.dfs)
+
+    if len(prev_state.sheet_versions) == num_prev_sheets:
+        # Only some existing sheets were modified
+        if len(modified_dataframe_indexes) > 0 and -1 not in modified_dataframe_indexes and num_prev_sheets == num_post_sheets:
+            return [
+                get_new_sheet_version() if sheet_index in modified_dataframe_indexes else sheet_version
+                for sheet_index, sheet_version in enumerate(prev_state.sheet_versions)
+            ]
+        
+        # Only new sheets were created, or no sheets were changed at all (e.g. by a graph step)
+        if modified_dataframe_indexes == {-1} and num_post_sheets >= num_prev_sheets:
+            return prev_state.sheet_versions + [get_new_sheet_version() for _ in range(num_post_sheets - num_prev_sheets)]
+
+    return [get_new_sheet_version() for _ in range(num_post_sheets)]
@@ -4,13 +4,15 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
-from typing import Any, Dict, List, Optional, Set, Type
+from copy import copy
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 import json
+import threading
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.column_steps.set_column_formula import SetColumnFormulaStepPerformer
 from mitosheet.step_performers.filter import FilterStepPerformer
-from mitosheet.state import State
+from mitosheet.state import State, get_sheet_versions_after_step
 from mitosheet.step_performers import STEP_TYPE_TO_STEP_PERFORMER
 from mitosheet.types import FORMULA_SPECIFIC_INDEX_LABELS_TYPE, ColumnHeader, ColumnID, FORMULA_ENTIRE_COLUMN_TYPE
 
@@ -64,6 +66,10 @@ class Step:
         # work if it has already been done. See simple_import for an example
         self.execution_data = execution_data if execution_data is not None else {}
 
+        # The code chunks from transpiling this step, which we keep until the step
+        # is executed again, as transpiling every step after each edit is slow
+        self.cached_code_chunks: Optional[Tuple[CodeChunk, ...]] = None
+
 
     @property
     def dfs(self):
@@ -131,6 +137,19 @@ class Step:
         return self.post_state if self.post_state is not None else \
             (self.prev_state if self.prev_state is not None else State([], 1))
 
+    def get_code_chunks(self) -> Tuple[CodeChunk, ...]:
+        """
+        Returns the code chunks that this step transpiles to. These are cached
+        until the step is executed again.
+        """
+        if self.cached_code_chunks is None:
+            self.cached_code_chunks = tuple(self.step_performer.transpile(
+                self.prev_state, # type: ignore
+                self.params,
+                self.execution_data,
+            ))
+        return self.cached_code_chunks
+
     def set_prev_state_and_execute(self, new_prev_state: State, previous_steps: List["Step"]) -> bool:
         """
         Changes the prev_state of this step, which in turns triggers
@@ -158,6 +177,15 @@ class Step:
             # step a no-op, and don't do anything
             (new_post_state, execution_data) = post_state_and_execution_data
 
+            # Track which sheets this step changed, so later steps that don't use them
+            # can be reused rather than reexecuted
+            if new_post_state is not new_prev_state:
+                new_post_state.sheet_versions = get_sheet_versions_after_step(
+                    new_prev_state, 
+                    new_post_state,
+                    self.step_performer.get_modified_dataframe_indexes(params)
+                )
+
         else:
             # Sometimes step execution returns None, which functionally means that 
             # nothing changed in the step (but we need not error). In this case, we
@@ -169,6 +197,7 @@ class Step:
         self.post_state = new_post_state
         self.execution_data = execution_data if execution_data is not None else {}
         self.params = params
+        self.cached_code_chunks = None
 
         return post_state_and_execution_data is not None
     
@@ -199,23 +228,31 @@ class Step:
                 step_indexes_to_skip.add(step_index)
 
         if len(all_steps_before_this_step) > 0:
-            previous_step: Step = all_steps_before_this_step[-1]
-            
             # Check (3) and (4)
-            if self.step_type == SetColumnFormulaStepPerformer.step_type() and previous_step.step_type == SetColumnFormulaStepPerformer.step_type():
-                both_entire_column = self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE
-                same_indexes = (
-                    self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE \
-                    and self.params['index_labels_formula_is_applied_to']['index_labels'] == previous_step.params['index_labels_formula_is_applied_to']['index_labels']
-                )
-                
-                if (both_entire_column or same_indexes) \
-                    and self.params['sheet_index'] == previous_step.params['sheet_index'] \
-                    and self.params['column_id'] == previous_step.params['column_id']:
-                    step_indexes_to_skip.add(len(all_steps_before_this_step) - 1)
+            if self.overwrites_formula_of_step(all_steps_before_this_step[-1]):
+                step_indexes_to_skip.add(len(all_steps_before_this_step) - 1)
 
         return step_indexes_to_skip
 
+    def overwrites_formula_of_step(self, previous_step: 'Step') -> bool:
+        """
+        Returns True if this step and the step just before it are both formula steps
+        that set the same column, and either both set the entire column or both set 
+        the same indexes, and so this step overwrites the step before it.
+        """
+        if self.step_type != SetColumnFormulaStepPerformer.step_type() or previous_step.step_type != SetColumnFormulaStepPerformer.step_type():
+            return False
+
+        both_entire_column = self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE
+        same_indexes = (
+            self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE \
+            and self.params['index_labels_formula_is_applied_to']['index_labels'] == previous_step.params['index_labels_formula_is_applied_to']['index_labels']
+        )
+
+        return (both_entire_column or same_indexes) \
+            and self.params['sheet_index'] == previous_step.params['sheet_index'] \
+            and self.params['column_id'] == previous_step.params['column_id']
+
     def get_column_headers_by_ids(self, sheet_index: int, column_ids: List[ColumnID]) -> List[Any]:
         """
         Utility for getting the column headers from column ids in a step.
@@ -242,3 +279,106 @@ class Step:
             'step_type': self.step_type,
             'params': self.params
         })
+
+
+class StepIndexesToSkipCache():
+    """
+    Computes the indexes of the steps that are skipped in a list of steps, the
+    same as calling Step.step_indexes_to_skip with the steps before each step.
+
+    Rather than having each step check every step before it, the steps that can
+    still be skipped are indexed by their step id and by the column they filter,
+    so each step only looks at the steps it skips. The steps from the last list 
+    are kept, so when steps are added or undone, only these steps are added to 
+    or removed from the index.
+    """
+
+    def __init__(self) -> None:
+        self.steps: List[Step] = []
+        self.step_indexes_to_skip: Set[int] = set()
+
+        # The indexes of steps that are not skipped yet, by their step id and if they 
+        # are a filter step, and for filter steps, by the column they filter. Once a step 
+        # is skipped, it does not need to be skipped again, so is removed from these
+        self.unskipped_step_indexes_by_step_id: Dict[Tuple[str, bool], List[int]] = {}
+        self.unskipped_filter_step_indexes_by_column: Dict[Tuple[int, ColumnID], List[int]] = {}
+
+        # For each step, the changes it made to the above, so they can be undone. Each
+        # change is a tuple of the indexes dictionary and the key changed, with the list
+        # that was removed from it, or None if the step was added to the list
+        self.changes_by_step: List[List[Tuple[Dict[Any, List[int]], Any, Optional[List[int]]]]] = []
+        self.newly_skipped_step_indexes_by_step: List[List[int]] = []
+
+        # Steps are also transpiled by API calls, which run in other threads
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lock cannot be pickled, so we pickle an empty cache instead
+        return {}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__() # type: ignore
+
+    def get_step_indexes_to_skip(self, step_list: List[Step]) -> Set[int]:
+        with self.lock:
+            num_same_steps = 0
+            while num_same_steps < min(len(step_list), len(self.steps)) and step_list[num_same_steps] is self.steps[num_same_steps]:
+                num_same_steps += 1
+
+            while len(self.steps) > num_same_steps:
+                self._remove_last_step()
+            for step in step_list[num_same_steps:]:
+                self._add_step(step)
+
+            return copy(self.step_indexes_to_skip)
+
+    def _add_step(self, step: Step) -> None:
+        step_index = len(self.steps)
+        is_filter = step.step_type == FilterStepPerformer.step_type()
+        changes: List[Tuple[Dict[Any, List[int]], Any, Optional[List[int]]]] = []
+        newly_skipped_step_indexes: List[int] = []
+
+        def skip_step_indexes(indexes: Dict[Any, List[int]], key: Any) -> None:
+            skipped_step_indexes = indexes.pop(key, None)
+            if skipped_step_indexes is not None:
+                changes.append((indexes, key, skipped_step_indexes))
+                for skipped_step_index in skipped_step_indexes:
+                    if skipped_step_index not in self.step_indexes_to_skip:
+                        self.step_indexes_to_skip.add(skipped_step_index)
+                        newly_skipped_step_indexes.append(skipped_step_index)
+
+        def add_step_index(indexes: Dict[Any, List[int]], key: Any) -> None:
+            indexes.setdefault(key, []).append(step_index)
+            changes.append((indexes, key, None))
+
+        # See Step.step_indexes_to_skip for when steps are skipped. Filter steps skip 
+        # filter steps on the same column, and other steps with the same id
+        if is_filter:
+            filter_column = (step.params['sheet_index'], step.params['column_id'])
+            skip_step_indexes(self.unskipped_filter_step_indexes_by_column, filter_column)
+        else:
+            skip_step_indexes(self.unskipped_step_indexes_by_step_id, (step.step_id, True))
+        skip_step_indexes(self.unskipped_step_indexes_by_step_id, (step.step_id, False))
+
+        if step_index > 0 and step.overwrites_formula_of_step(self.steps[-1]) and step_index - 1 not in self.step_indexes_to_skip:
+            self.step_indexes_to_skip.add(step_index - 1)
+            newly_skipped_step_indexes.append(step_index - 1)
+
+        add_step_index(self.unskipped_step_indexes_by_step_id, (step.step_id, is_filter))
+        if is_filter:
+            add_step_index(self.unskipped_filter_step_indexes_by_column, filter_column)
+
+        self.steps.append(step)
+        self.changes_by_step.append(changes)
+        self.newly_skipped_step_indexes_by_step.append(newly_skipped_step_indexes)
+
+    def _remove_last_step(self) -> None:
+        self.steps.pop()
+        for indexes, key, removed_step_indexes in reversed(self.changes_by_step.pop()):
+            if removed_step_indexes is not None:
+                indexes[key] = removed_step_indexes
+            else:
+                indexes[key].pop()
+                if len(indexes[key]) == 0:
+                    del indexes[key]
+        self.step_indexes_to_skip.difference_update(self.newly_skipped_step_indexes_by_step.pop())
@@ -46,4 +46,8 @@ class ColumnHeadersTransformStepPerformer(StepPerformer):
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {get_param(params, 'sheet_index')}
+
+    @classmethod
+    def get_source_dataframe_indexes(cls, params: Dict[str, Any]) -> Optional[Set[int]]:
+        return set()
     
\ No newline at end of file
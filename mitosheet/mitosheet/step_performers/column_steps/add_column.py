@@ -71,4 +71,8 @@ class AddColumnStepPerformer(StepPerformer):
 
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
-        return {get_param(params, 'sheet_index')}
\ No newline at end of file
+        return {get_param(params, 'sheet_index')}
+
+    @classmethod
+    def get_source_dataframe_indexes(cls, params: Dict[str, Any]) -> Optional[Set[int]]:
+        return set()
\ No newline at end of file
@@ -180,6 +180,13 @@ class SetColumnFormulaStepPerformer(StepPerformer):
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {get_param(params, 'sheet_index')}
 
+    @classmethod
+    def get_source_dataframe_indexes(cls, params: Dict[str, Any]) -> Optional[Set[int]]:
+        # Formulas that reference other sheets (e.g. df2!A) might read from any sheet
+        if '!' in get_param(params, 'new_formula'):
+            return None
+        return set()
+
 
 def _get_fixed_invalid_formula(
         new_formula: str, 
@@ -73,4 +73,5 @@ def delete_dataframe_from_state(state: State, sheet_index: int) -> None:
     state.df_formats.pop(sheet_index)
     state.dfs.pop(sheet_index)
     state.df_names.pop(sheet_index)
-    state.df_sources.pop(sheet_index)
\ No newline at end of file
+    state.df_sources.pop(sheet_index)
+    state.sheet_versions.pop(sheet_index)
\ No newline at end of file
@@ -4,6 +4,9 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
+import json
+import threading
+from collections import OrderedDict
 from time import perf_counter
 from typing import Any, Dict, List, Optional, Set, Tuple
 
@@ -23,6 +26,55 @@ from mitosheet.step_performers.utils.utils import get_param
 from mitosheet.types import GraphID
 
 
+# The number of rendered graphs that we keep, so that reexecuting a graph step does not
+# render the graph again if its data and params have not changed
+MAX_CACHED_GRAPH_OUTPUTS = 32
+
+# The most recently rendered graphs, by the version of the sheet they graph (see 
+# get_sheet_versions_after_step), and their params and column headers. NOTE: these are
+# shared between states, and so must never be changed in place
+_graph_output_cache: "OrderedDict[Tuple[int, str, str], Dict[str, str]]" = OrderedDict()
+_graph_output_cache_lock = threading.Lock()
+
+
+def get_graph_output_cache_key(prev_state: State, sheet_index: int, params: Dict[str, Any], column_headers: List[Any]) -> Optional[Tuple[int, str, str]]:
+    """
+    Returns the key to cache the graph output of a graph step with, or None if
+    we do not know the version of the sheet, and so cannot cache it.
+    """
+    if len(prev_state.sheet_versions) != len(prev_state.dfs):
+        return None
+    
+    return (
+        prev_state.sheet_versions[sheet_index],
+        # The column headers and dataframe name are used in the generated code
+        repr((prev_state.df_names[sheet_index], column_headers)),
+        json.dumps(params, sort_keys=True, default=str),
+    )
+
+
+def get_cached_graph_output(key: Optional[Tuple[int, str, str]]) -> Optional[Dict[str, str]]:
+    if key is None:
+        return None
+
+    with _graph_output_cache_lock:
+        graph_output = _graph_output_cache.get(key)
+        if graph_output is not None:
+            _graph_output_cache.move_to_end(key)
+        return graph_output
+
+
+def set_cached_graph_output(key: Optional[Tuple[int, str, str]], graph_output: Dict[str, str]) -> None:
+    if key is None:
+        return
+
+    with _graph_output_cache_lock:
+        _graph_output_cache[key] = graph_output
+        _graph_output_cache.move_to_end(key)
+        while len(_graph_output_cache) > MAX_CACHED_GRAPH_OUTPUTS:
+            _graph_output_cache.popitem(last=False)
+
+
 class GraphStepPerformer(StepPerformer):
     """
     Creates a graph of the passed parameters and update the graph_data_array
@@ -125,8 +177,6 @@ class GraphStepPerformer(StepPerformer):
         histfunc = graph_creation.get('histfunc', None)
         nbins = graph_creation.get('nbins', None)
 
-        # Create a copy of the dataframe, just for safety.
-        df: pd.DataFrame = prev_state.dfs[sheet_index].copy()
         df_name: str = prev_state.df_names[sheet_index]
 
         # If the graph tab already exists, use its name. Otherwise, create a new graph tab name.
@@ -149,68 +199,86 @@ class GraphStepPerformer(StepPerformer):
             }
             pandas_processing_time = 0.0 # no processing time
         else: 
-            pandas_start_time = perf_counter()
-            fig = get_plotly_express_graph(
-                graph_type,
-                df,
-                safety_filter_turned_on_by_user,
-                x_axis_column_headers,
-                y_axis_column_headers,
-                color_column_header,
-                facet_col_column_header,
-                facet_row_column_header,
-                facet_col_wrap,
-                facet_col_spacing,
-                facet_row_spacing,
-                points,
-                line_shape,
-                histnorm,
-                histfunc,
-                nbins,
-                graph_styling
+            # If this graph was already made from the same data with the same params, 
+            # we reuse it, as creating and rendering graphs is slow
+            graph_output_cache_key = get_graph_output_cache_key(
+                prev_state, 
+                sheet_index, 
+                params, 
+                [x_axis_column_headers, y_axis_column_headers, color_column_header, facet_col_column_header, facet_row_column_header]
             )
-            pandas_processing_time = perf_counter() - pandas_start_time
-
-            # Get rid of some of the default white space
-            fig.update_layout(
-                margin=dict(
-                    l=0,
-                    r=0,
-                    t=30,
-                    b=35, # This gives enough space so that the x axis label is not cutoff
+            graph_output = get_cached_graph_output(graph_output_cache_key)
+            pandas_processing_time = 0.0
+
+            if graph_output is None:
+                # Create a copy of the dataframe, just for safety.
+                df: pd.DataFrame = prev_state.dfs[sheet_index].copy()
+
+                pandas_start_time = perf_counter()
+                fig = get_plotly_express_graph(
+                    graph_type,
+                    df,
+                    safety_filter_turned_on_by_user,
+                    x_axis_column_headers,
+                    y_axis_column_headers,
+                    color_column_header,
+                    facet_col_column_header,
+                    facet_row_column_header,
+                    facet_col_wrap,
+                    facet_col_spacing,
+                    facet_row_spacing,
+                    points,
+                    line_shape,
+                    histnorm,
+                    histfunc,
+                    nbins,
+                    graph_styling
                 )
-            )
+                pandas_processing_time = perf_counter() - pandas_start_time
 
-            html_and_script = get_html_and_script_from_figure(fig, height, width, include_plotlyjs)
-
-            graph_generation_code = get_plotly_express_graph_code(
-                graph_type,
-                df,
-                safety_filter_turned_on_by_user,
-                x_axis_column_headers,
-                y_axis_column_headers,
-                color_column_header,
-                facet_col_column_header,
-                facet_row_column_header,
-                facet_col_wrap,
-                facet_col_spacing,
-                facet_row_spacing,
-                points,
-                line_shape,
-                histnorm,
-                histfunc,
-                nbins,
-                graph_styling,
-                df_name,
-            )
+                # Get rid of some of the default white space
+                fig.update_layout(
+                    margin=dict(
+                        l=0,
+                        r=0,
+                        t=30,
+                        b=35, # This gives enough space so that the x axis label is not cutoff
+                    )
+                )
 
-            post_state.graph_data_array[graph_index] = {
-                "graph_id": graph_id,
-                "graph_output": {
+                html_and_script = get_html_and_script_from_figure(fig, height, width, include_plotlyjs)
+
+                graph_generation_code = get_plotly_express_graph_code(
+                    graph_type,
+                    df,
+                    safety_filter_turned_on_by_user,
+                    x_axis_column_headers,
+                    y_axis_column_headers,
+                    color_column_header,
+                    facet_col_column_header,
+                    facet_row_column_header,
+                    facet_col_wrap,
+                    facet_col_spacing,
+                    facet_row_spacing,
+                    points,
+                    line_shape,
+                    histnorm,
+                    histfunc,
+                    nbins,
+                    graph_styling,
+                    df_name,
+                )
+
+                graph_output = {
                     "graphGeneratedCode": graph_generation_code,
                     "graphHTML": html_and_script["html"],
                     "graphScript": html_and_script["script"],
-                },
+                }
+                set_cached_graph_output(graph_output_cache_key, graph_output)
+
+            post_state.graph_data_array[graph_index] = {
+                "graph_id": graph_id,
+                "graph_output": graph_output,
                 "graph_tab_name": graph_tab_name
             }
 
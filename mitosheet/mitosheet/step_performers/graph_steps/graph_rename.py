@@ -48,7 +48,11 @@ class GraphRenameStepPerformer(StepPerformer):
         # Create a new step and save the parameters
         post_state = prev_state.copy()
 
-        post_state.graph_data_array[graph_data_index]["graph_tab_name"] = new_graph_tab_name
+        # Graph data is shared between states, so we replace it rather than editing it
+        post_state.graph_data_array[graph_data_index] = {
+            **old_graph_data,
+            "graph_tab_name": new_graph_tab_name
+        }
         
         return post_state, {
             'pandas_processing_time': 0 # No time spent on pandas, only metadata changes
@@ -3,10 +3,15 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import codecs
 import csv
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from os.path import basename, normpath
-from typing import Any, Dict, List, Optional, Set, Tuple
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 
 import chardet
 import pandas as pd
@@ -14,14 +19,27 @@ import pandas as pd
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import (
     DEFAULT_DECIMAL, DEFAULT_DELIMITER, DEFAULT_ENCODING,
-    DEFAULT_ERROR_BAD_LINES, DEFAULT_SKIPROWS, SimpleImportCodeChunk)
+    DEFAULT_ERROR_BAD_LINES, DEFAULT_SKIPROWS, SimpleImportCodeChunk,
+    get_read_csv_params)
+from mitosheet.enterprise.mito_config import get_mito_config
 from mitosheet.errors import (make_file_not_found_error,
                               make_invalid_simple_import_error,
                               make_is_directory_error)
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils.utils import get_param
-from mitosheet.utils import get_valid_dataframe_names
+from mitosheet.utils import get_valid_dataframe_names, is_prev_version
+
+# pyarrow is not a dependency of mitosheet, but if it is installed and turned on in the
+# mito config, we use it to read CSV files much faster
+try:
+    import pyarrow
+    PYARROW_INSTALLED = True
+    # The errors the pyarrow engine raises when it cannot read a file that the default engine might
+    PYARROW_READ_CSV_ERRORS: Tuple[Type[Exception], ...] = (ValueError, NotImplementedError, pyarrow.ArrowException)
+except ImportError:
+    PYARROW_INSTALLED = False
+    PYARROW_READ_CSV_ERRORS = (ValueError, NotImplementedError)
 
 
 class SimpleImportStepPerformer(StepPerformer):
@@ -62,14 +80,15 @@ class SimpleImportStepPerformer(StepPerformer):
 
         file_delimeters = []
         file_encodings = []
+        file_encodings_guessed = []
         file_decimals = []
         file_skiprows = []
         file_error_bad_lines = []
+        file_engines = []
         new_df_names = []
 
         just_final_file_names = [basename(normpath(file_name)) for file_name in file_names]
 
-        pandas_processing_time = 0.0
         for index, (file_name, df_name) in enumerate(zip(file_names, get_valid_dataframe_names(post_state.df_names, just_final_file_names))):
             
             # We try to read the csv with the parameters that the user specified. 
@@ -85,8 +104,10 @@ class SimpleImportStepPerformer(StepPerformer):
                 # This approach of handling optional step params instead of writing a step upgrader is also used in graphs.
                 delimeter = delimeters[index]
                 encoding = encodings[index]
+                encoding_guessed = False
             else:
-                _, delimeter, encoding = read_csv_get_delimiter_and_encoding(file_name)
+                delimeter, encoding = get_csv_delimiter_and_encoding(file_name)
+                encoding_guessed = True
                 
             decimal = decimals[index] if decimals is not None else DEFAULT_DECIMAL
             _skiprows = skiprows[index] if skiprows is not None else DEFAULT_SKIPROWS
@@ -96,37 +117,42 @@ class SimpleImportStepPerformer(StepPerformer):
             # Save the delimeter and encodings for transpiling
             file_delimeters.append(delimeter)
             file_encodings.append(encoding)
+            file_encodings_guessed.append(encoding_guessed)
             file_decimals.append(decimal)
             file_skiprows.append(_skiprows)
             file_error_bad_lines.append(_error_bad_lines)
+            file_engines.append(get_read_csv_engine(decimal, _skiprows, _error_bad_lines))
             
             new_df_names.append(df_name)
 
-        execution_data = {
+        try:
+            pandas_start_time = perf_counter()
+            dfs, file_engines, file_encodings = read_csv_files(
+                file_names, file_delimeters, file_encodings, file_encodings_guessed, file_decimals, file_skiprows, file_error_bad_lines, file_engines
+            )
+            pandas_processing_time = perf_counter() - pandas_start_time
+        except:
+            raise make_invalid_simple_import_error()
+
+        for df, df_name in zip(dfs, new_df_names):
+            post_state.add_df_to_state(
+                df, 
+                df_name=df_name, 
+                df_source=DATAFRAME_SOURCE_IMPORTED, 
+                use_deprecated_id_algorithm=use_deprecated_id_algorithm
+            )
+
+        return post_state, {
             'file_delimeters': file_delimeters,
             'file_encodings': file_encodings,
             'file_decimals': file_decimals,
             'file_skiprows': file_skiprows,
             'file_error_bad_lines': file_error_bad_lines,
+            'file_engines': file_engines,
             'pandas_processing_time': pandas_processing_time,
             'new_df_names': new_df_names
         }
 
-        try:
-            return cls.execute_through_transpile(
-                prev_state,
-                params,
-                execution_data,
-                new_dataframe_params={
-                    'df_source': DATAFRAME_SOURCE_IMPORTED,
-                    'new_df_names': new_df_names,
-                    'overwrite': None
-                },
-                use_deprecated_id_algorithm=use_deprecated_id_algorithm
-            )
-        except:
-            raise make_invalid_simple_import_error()
-
     @classmethod
     def transpile(
         cls,
@@ -143,7 +169,8 @@ class SimpleImportStepPerformer(StepPerformer):
                 get_param(execution_data if execution_data is not None else {}, 'file_decimals'), 
                 get_param(execution_data if execution_data is not None else {}, 'file_skiprows'), 
                 get_param(execution_data if execution_data is not None else {}, 'file_error_bad_lines'),
-                get_param(execution_data if execution_data is not None else {}, 'new_df_names')
+                get_param(execution_data if execution_data is not None else {}, 'new_df_names'),
+                get_param(execution_data if execution_data is not None else {}, 'file_engines')
             )
         ]
     
@@ -152,57 +179,245 @@ class SimpleImportStepPerformer(StepPerformer):
         return {-1}
 
 
+# The most CSV files that we read at the same time
+MAX_CONCURRENT_CSV_READS = 8
+
+
+def get_read_csv_engine(decimal: str, skiprows: int, error_bad_lines: bool) -> Optional[str]:
+    """
+    Returns the engine to read a CSV file with. We use the much faster pyarrow
+    engine if it is installed and turned on in the mito config, unless the file 
+    needs a parameter that the pyarrow engine does not support. None means the 
+    pandas default engine.
+    """
+    if not PYARROW_INSTALLED or is_prev_version(pd.__version__, '1.4.0') or not get_mito_config().enable_pyarrow_csv_engine:
+        return None
+    
+    if decimal != DEFAULT_DECIMAL or skiprows != DEFAULT_SKIPROWS or error_bad_lines != DEFAULT_ERROR_BAD_LINES:
+        return None
+    
+    return 'pyarrow'
+
+
+def read_csv_files(
+        file_names: List[str], 
+        file_delimeters: List[str], 
+        file_encodings: List[str], 
+        file_encodings_guessed: List[bool], 
+        file_decimals: List[str], 
+        file_skiprows: List[int], 
+        file_error_bad_lines: List[bool], 
+        file_engines: List[Optional[str]]
+    ) -> Tuple[List[pd.DataFrame], List[Optional[str]], List[str]]:
+    """
+    Reads the CSV files with the given parameters, reading multiple files
+    at the same time in a thread pool, as pandas does most of the reading 
+    without holding the GIL.
+
+    Returns the dataframes, as well as the engine and encoding that were 
+    actually used to read each file. If an encoding was guessed rather than 
+    chosen by the user, and the file fails to decode with it, we use latin-1.
+    """
+
+    def read_csv_file_with_encoding(index: int, encoding: str) -> Tuple[pd.DataFrame, Optional[str]]:
+        engine = file_engines[index]
+        read_csv_params = get_read_csv_params(
+            file_delimeters[index], encoding, file_decimals[index], file_skiprows[index], file_error_bad_lines[index], engine=engine
+        )
+
+        try:
+            df = pd.read_csv(file_names[index], **read_csv_params)
+            if engine is not None and has_bytes_column(df):
+                # Rather than failing, the pyarrow engine reads columns that cannot be decoded as bytes
+                raise ValueError(f'Could not decode {file_names[index]} with {encoding}')
+            return df, engine
+        except PYARROW_READ_CSV_ERRORS:
+            if engine is None:
+                raise
+
+            # The pyarrow engine is stricter about the files it reads, and so 
+            # if it fails, we try again with the pandas default engine
+            del read_csv_params['engine']
+            return pd.read_csv(file_names[index], **read_csv_params), None
+
+    def read_csv_file(index: int) -> Tuple[pd.DataFrame, Optional[str], str]:
+        encoding = file_encodings[index]
+        try:
+            df, engine = read_csv_file_with_encoding(index, encoding)
+        except UnicodeDecodeError:
+            # If the user chose this encoding, we let them know it is wrong
+            if not file_encodings_guessed[index]:
+                raise
+
+            # The encoding is guessed from samples of the file, which might not contain the 
+            # characters that fail to decode, so we fall back to latin-1, which can decode any file
+            encoding = 'latin-1'
+            df, engine = read_csv_file_with_encoding(index, encoding)
+
+        return df, engine, encoding
+
+    if len(file_names) <= 1:
+        results = [read_csv_file(index) for index in range(len(file_names))]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(file_names), MAX_CONCURRENT_CSV_READS)) as executor:
+            results = list(executor.map(read_csv_file, range(len(file_names))))
+
+    return [df for df, _, _ in results], [engine for _, engine, _ in results], [encoding for _, _, encoding in results]
+
+
+def has_bytes_column(df: pd.DataFrame) -> bool:
+    """
+    Returns True if any column of the dataframe contains bytes, which we check
+    with the first value in each column that is not missing.
+    """
+    for column_index in range(len(df.columns)):
+        series = df.iloc[:, column_index]
+        if series.dtype != object:
+            continue
+        first_valid_index = series.first_valid_index()
+        if first_valid_index is not None and isinstance(series.loc[first_valid_index], bytes):
+            return True
+    return False
+
+
+# The number of bytes we read from the start and end of a CSV file to guess its delimiter and
+# encoding, so that we never have to read an entire (potentially very large) file to do so
+CSV_HEAD_SAMPLE_SIZE_BYTES = 64 * 1024
+CSV_TAIL_SAMPLE_SIZE_BYTES = 16 * 1024
+
+# The confidence chardet must have in an encoding for us to use it 
+MIN_ENCODING_GUESS_CONFIDENCE = .5
+
+
 def read_csv_get_delimiter_and_encoding(file_name: str) -> Tuple[pd.DataFrame, str, str]:
     """
     Given a file_name, will read in the file as a CSV, and
     return the df, delimeter, decimal separator, and encoding of the file
     """
-    encoding = DEFAULT_ENCODING
-    delimeter = DEFAULT_DELIMITER
-
     if is_url_to_file(file_name):
         df = pd.read_csv(file_name)
-        return df, delimeter, encoding
+        return df, DEFAULT_DELIMITER, DEFAULT_ENCODING
+
+    delimeter, encoding = get_csv_delimiter_and_encoding(file_name)
 
     try:
-        # First attempt to read csv without specifying an encoding, just with a delimeter
-        delimeter = guess_delimeter(file_name)
-        df = pd.read_csv(file_name, sep=delimeter)
+        df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
     except UnicodeDecodeError:
-        # If we have an encoding error, try and get the encoding
-        try: 
-            encoding = guess_encoding(file_name)
-            delimeter = guess_delimeter(file_name, encoding=encoding)
+        # The samples we guess the encoding from might not contain the characters that 
+        # fail to decode, so we fall back to latin-1, which can decode any file
+        encoding = 'latin-1'
+        df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
+        
+    return df, delimeter, encoding
+
+
+def get_csv_delimiter_and_encoding(file_name: str) -> Tuple[str, str]:
+    """
+    Given a file_name, returns a guess for the delimeter and encoding of
+    the CSV file, without reading the entire file. 
+
+    These guesses are cached until the file is modified, so it's cheap to 
+    call this repeatedly for the same file.
+    """
+    if is_url_to_file(file_name):
+        return DEFAULT_DELIMITER, DEFAULT_ENCODING
+
+    file_stat = os.stat(file_name)
+    return _get_csv_delimiter_and_encoding_from_samples(file_name, file_stat.st_mtime_ns, file_stat.st_size)
+
 
-            # Read the file as dataframe 
-            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
-        except: 
+@lru_cache(maxsize=128)
+def _get_csv_delimiter_and_encoding_from_samples(file_name: str, mtime_ns: int, file_size: int) -> Tuple[str, str]:
+    # NOTE: mtime_ns and file_size are part of the arguments so that the cached 
+    # result is not used once the file is changed
+    head_sample, tail_sample = read_csv_samples(file_name, file_size)
+
+    # First attempt to decode the samples without specifying an encoding
+    encoding = DEFAULT_ENCODING
+    text = decode_csv_samples(head_sample, tail_sample, encoding)
+
+    if text is None:
+        # If we have an encoding error, try and get the encoding
+        guessed_encoding = guess_encoding(head_sample + (tail_sample if tail_sample is not None else b''))
+        text = decode_csv_samples(head_sample, tail_sample, guessed_encoding) if guessed_encoding is not None else None
+        
+        if text is not None and guessed_encoding is not None:
+            encoding = guessed_encoding
+        else:
             # Sometimes guess_encoding, guesses 'ascii' when we want 'latin-1', 
             # so if guess_encoding fails, we try latin-1
             encoding = 'latin-1'
-            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
-        
-    return df, delimeter, encoding
+            text = head_sample.decode(encoding)
+
+    return guess_delimeter(text), encoding
 
 
-def guess_delimeter(file_name: str, encoding: Optional[str]=None) -> str:
+def read_csv_samples(file_name: str, file_size: int) -> Tuple[bytes, Optional[bytes]]:
     """
-    Given a path to a file that is assumed to exist and be a CSV, this
+    Returns the bytes at the start and end of the file. If the file is small
+    enough, the start is the entire file, and the end is None.
+    """
+    with open(file_name, 'rb') as f:
+        if file_size <= CSV_HEAD_SAMPLE_SIZE_BYTES + CSV_TAIL_SAMPLE_SIZE_BYTES:
+            return f.read(), None
+
+        head_sample = f.read(CSV_HEAD_SAMPLE_SIZE_BYTES)
+        f.seek(file_size - CSV_TAIL_SAMPLE_SIZE_BYTES)
+        tail_sample = f.read()
+        return head_sample, tail_sample
+
+
+def decode_csv_samples(head_sample: bytes, tail_sample: Optional[bytes], encoding: str) -> Optional[str]:
+    """
+    Decodes the start of the file with the given encoding, and checks that the end 
+    of the file decodes as well. Returns None if the samples cannot be decoded.
+    """
+    try:
+        # The head sample might end part way through a character, which is not an error
+        text: str = codecs.getincrementaldecoder(encoding)().decode(head_sample, final=tail_sample is None)
+
+        # We can only decode from the middle of a file if the encoding lets us find the
+        # start of a character, which is the case for utf-8, where we skip continuation bytes
+        if tail_sample is not None and codecs.lookup(encoding).name == 'utf-8':
+            tail_sample = tail_sample.lstrip(bytes(range(0x80, 0xC0)))
+            tail_sample.decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return None
+
+    if tail_sample is not None and '\n' in text:
+        # Remove the last line, as it is likely incomplete
+        text = text[:text.rindex('\n')]
+
+    return text
+
+
+def guess_delimeter(text: str) -> str:
+    """
+    Given the text at the start of a file that is assumed to be a CSV, this
     function guesses the delimeter that is used by that file
     """
     s = csv.Sniffer()
-    with open(file_name, 'r', encoding=encoding) as f:
-        return s.sniff(f.readline()).delimiter
+    # Make sure all lines end in \n, like they do when a file is read as text
+    text = re.sub('\r\n?', '\n', text)
+    try:
+        return s.sniff(text).delimiter
+    except csv.Error:
+        # If the lines are not consistent enough to find the delimiter, which is the 
+        # case if there is only a single column, we use the default delimiter
+        return DEFAULT_DELIMITER
 
-def guess_encoding(file_name: str) -> str:
+def guess_encoding(sample: bytes) -> Optional[str]:
     """
     Uses chardet to guess the encoding of the the file
-    at the given file_name
+    the sample is from
     """
-    # Attempt to determine the encoding and try again. 
-    with open(file_name, 'rb') as f:
-        result = chardet.detect(f.readline())
-        return result['encoding']
+    result = chardet.detect(sample)
+
+    # Guesses with a low confidence are usually wrong, and so we don't return them
+    if result['confidence'] < MIN_ENCODING_GUESS_CONFIDENCE:
+        return None
+
+    return result['encoding']
 
 
 def is_url_to_file(file_name: str) -> bool:
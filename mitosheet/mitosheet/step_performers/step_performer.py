@@ -9,7 +9,7 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.state import State
-from mitosheet.transpiler.transpile_utils import get_globals_for_exec
+from mitosheet.transpiler.transpile_utils import get_compiled_code, get_globals_for_exec
 from mitosheet.types import (ColumnHeader, ColumnID,
                              ExecuteThroughTranspileNewDataframeParams, StepType)
 
@@ -153,14 +153,14 @@ class StepPerformer(ABC, object):
         exec_locals = {**exec_globals}
         
         pandas_start_time = perf_counter()
-        exec(final_code, exec_globals, exec_locals)
+        exec(get_compiled_code(final_code), exec_globals, exec_locals)
 
         # Go through the optional code lines
         optional_code_that_successfully_executed: Tuple[List[str], List[str]] = ([], [])
         if optional_code is not None:
             for optional_import in optional_code[1]:
                 try:
-                    exec(optional_import, exec_globals, exec_locals)
+                    exec(get_compiled_code(optional_import), exec_globals, exec_locals)
                     optional_code_that_successfully_executed = (
                         optional_code_that_successfully_executed[0],
                         optional_code_that_successfully_executed[1] + [optional_import],
@@ -183,7 +183,7 @@ class StepPerformer(ABC, object):
                 # but it's fine for now -- since partial updates don't seem to 
                 # manifest in practice
                 try:
-                    exec(optional_code_line, exec_globals, exec_locals)
+                    exec(get_compiled_code(optional_code_line), exec_globals, exec_locals)
                     optional_code_that_successfully_executed = (
                         optional_code_that_successfully_executed[0] + non_code_lines_before_optional_line + [optional_code_line],
                         optional_code_that_successfully_executed[1],
@@ -203,7 +203,9 @@ class StepPerformer(ABC, object):
                 modified_dataframe_index, 
                 prev_state.dfs[modified_dataframe_index],
                 new_df, 
-                column_headers_to_column_ids=column_headers_to_column_ids
+                column_headers_to_column_ids=column_headers_to_column_ids,
+                # We only need to update the state, and not know which columns were modified
+                detect_modified_columns=False
             )
 
         if new_dataframe_params:
@@ -239,4 +241,18 @@ class StepPerformer(ABC, object):
         If it returned -1, then it modified all new dataframes (on
         the left side of the dfs array).
         """
-        pass
\ No newline at end of file
+        pass
+
+    @classmethod
+    def get_source_dataframe_indexes(cls, params: Dict[str, Any]) -> Optional[Set[int]]:
+        """
+        Returns a set of the sheet indexes that this step reads from, other
+        than the sheet indexes that it modifies.
+
+        If none of these sheets, or the modified sheets, have changed since this step
+        was last executed, then the step does not need to be reexecuted.
+
+        If it returns None, then this step might read from any dataframe, 
+        and so it is always reexecuted.
+        """
+        return None
@@ -8,11 +8,13 @@ import json
 import random
 import string
 from copy import copy, deepcopy
+from functools import partial
 from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple, Union
 
 import pandas as pd
 from mitosheet.api.get_parameterizable_params import get_parameterizable_params_metadata
 from mitosheet.api.get_path_contents import get_path_parts
+from mitosheet.code_chunks.code_chunk_utils import OptimizedCodeChunksCache
 
 from mitosheet.enterprise.mito_config import MitoConfig
 from mitosheet.enterprise.telemetry.mito_log_uploader import MitoLogUploader
@@ -25,7 +27,7 @@ from mitosheet.telemetry.telemetry_utils import log
 from mitosheet.preprocessing import PREPROCESS_STEP_PERFORMERS
 from mitosheet.saved_analyses.save_utils import get_analysis_exists
 from mitosheet.state import State
-from mitosheet.step import Step
+from mitosheet.step import Step, StepIndexesToSkipCache
 from mitosheet.step_performers import EVENT_TYPE_TO_STEP_PERFORMER
 from mitosheet.step_performers.import_steps.excel_import import \
     ExcelImportStepPerformer
@@ -42,23 +44,52 @@ from mitosheet.utils import NpEncoder, dfs_to_array_for_json, get_default_df_for
 from mitosheet.step_performers.utils.user_defined_function_utils import get_user_defined_importers_for_frontend, get_user_defined_editors_for_frontend
 from mitosheet.step_performers.utils.user_defined_function_utils import validate_and_wrap_sheet_functions, validate_user_defined_editors
 
-def get_step_indexes_to_skip(step_list: List[Step]) -> Set[int]:
+def get_step_indexes_to_skip(step_list: List[Step], step_indexes_to_skip_cache: Optional[StepIndexesToSkipCache]=None) -> Set[int]:
     """
     Given a list of steps, will collect all of the steps
     from this list that should be skipped.
+
+    If a step_indexes_to_skip_cache is passed, only the steps that have changed
+    since it was last used are added to it.
     """
-    step_indexes_to_skip: Set[int] = set()
+    if step_indexes_to_skip_cache is None:
+        step_indexes_to_skip_cache = StepIndexesToSkipCache()
 
-    for step_index, step in enumerate(step_list):
-        step_indexes_to_skip = step_indexes_to_skip.union(
-            step.step_indexes_to_skip(step_list[:step_index])
-        )
+    return step_indexes_to_skip_cache.get_step_indexes_to_skip(step_list)
+
+
+def get_step_with_reused_execution(step: Step, new_prev_state: State) -> Optional[Step]:
+    """
+    If none of the sheets that this step reads from or modifies have changed
+    since it was last executed, returns a new step starting at new_prev_state
+    that reuses the result of this last execution, without reexecuting it.
+
+    Otherwise, returns None, and the step must be reexecuted.
+    """
+    old_prev_state, old_post_state = step.prev_state, step.post_state
+    if old_prev_state is None or old_post_state is None or old_prev_state is old_post_state:
+        return None
+
+    # We can only reuse steps that modify specific existing sheets, and tell us what they read from
+    modified_dataframe_indexes = step.step_performer.get_modified_dataframe_indexes(step.params)
+    source_dataframe_indexes = step.step_performer.get_source_dataframe_indexes(step.params)
+    if source_dataframe_indexes is None or len(modified_dataframe_indexes) == 0 or -1 in modified_dataframe_indexes:
+        return None
+
+    num_sheets = len(new_prev_state.dfs)
+    if len(old_prev_state.dfs) != num_sheets or len(old_post_state.dfs) != num_sheets:
+        return None
 
-    return step_indexes_to_skip
+    for sheet_index in source_dataframe_indexes.union(modified_dataframe_indexes):
+        if old_prev_state.sheet_versions[sheet_index] != new_prev_state.sheet_versions[sheet_index]:
+            return None
+
+    new_post_state = new_prev_state.copy_with_sheets_from(old_post_state, modified_dataframe_indexes)
+    return Step(step.step_type, step.step_id, step.params, new_prev_state, new_post_state, step.execution_data)
 
 
 def execute_step_list_from_index(
-    step_list: List[Step], start_index: Optional[int]=None
+    step_list: List[Step], start_index: Optional[int]=None, step_indexes_to_skip_cache: Optional[StepIndexesToSkipCache]=None
 ) -> List[Step]:
     """
     Given a list of steps, and a specific index to start from, will assume that
@@ -70,6 +101,11 @@ def execute_step_list_from_index(
     for the steps that are not skipped.
 
     If start_index is not given, will start from the initialize step.
+
+    Steps are only reexecuted if something they depend on has changed. If a step
+    would be executed on the exact state it was last executed on, it is kept as is, 
+    and if none of the sheets it uses have changed, the result of its last execution
+    is reused (see get_step_with_reused_execution).
     """
 
     # Make sure start index is not None
@@ -77,7 +113,7 @@ def execute_step_list_from_index(
         start_index = 0
 
     # Get the steps to skip, so that we can skip them
-    step_indexes_to_skip = get_step_indexes_to_skip(step_list)
+    step_indexes_to_skip = get_step_indexes_to_skip(step_list, step_indexes_to_skip_cache)
 
     # Get the steps that are valid, and the last valid step, so we can execute from there
     new_step_list = step_list[: start_index + 1]
@@ -90,6 +126,20 @@ def execute_step_list_from_index(
         if step_index in step_indexes_to_skip:
             new_step_list.append(step)
             continue
+
+        new_prev_state = last_valid_step.final_defined_state
+
+        # If the step was last executed on this exact state, then it is already up to date
+        if step.prev_state is new_prev_state:
+            new_step_list.append(step)
+            last_valid_step = step
+            continue
+
+        reused_step = get_step_with_reused_execution(step, new_prev_state)
+        if reused_step is not None:
+            new_step_list.append(reused_step)
+            last_valid_step = reused_step
+            continue
             
         # Create a new step with the same params
         new_step = Step(step.step_type, step.step_id, step.params)
@@ -98,7 +148,7 @@ def execute_step_list_from_index(
         # what the last valid step is. Note that we find the actually
         # executed steps before passing them
         non_skipped_steps = [step for index, step in enumerate(new_step_list) if index not in step_indexes_to_skip]
-        new_step.set_prev_state_and_execute(last_valid_step.final_defined_state, non_skipped_steps)
+        new_step.set_prev_state_and_execute(new_prev_state, non_skipped_steps)
         last_valid_step = new_step
 
         new_step_list.append(new_step)
@@ -106,6 +156,81 @@ def execute_step_list_from_index(
     return new_step_list
 
 
+# The states of every this many steps are never evicted from the step history, so 
+# that an evicted state is never recomputed from more than this many steps back
+STEP_HISTORY_CHECKPOINT_INTERVAL = 10
+
+
+def recompute_step_post_state_dfs(step: Step) -> List[pd.DataFrame]:
+    """
+    Recomputes the dataframes in the post state of the step, by executing 
+    the step again on its prev state.
+
+    NOTE: this is passed to State.evict_dfs with functools.partial rather than
+    as a closure, so that states with evicted dataframes can still be pickled.
+    """
+    post_state_and_execution_data = step.step_performer.execute(step.initial_defined_state, step.params)
+    if post_state_and_execution_data is None:
+        return step.initial_defined_state.dfs
+    return post_state_and_execution_data[0].dfs
+
+
+def evict_step_states_over_memory_limit(steps: List[Step], memory_limit_bytes: int) -> None:
+    """
+    Evicts the dataframes in the post states of the steps, oldest first, until the
+    dataframes that remain use at most memory_limit_bytes, or there is nothing
+    left that can be evicted. Evicted dataframes are recomputed if they are used again.
+
+    The initial and final states, and the states of every STEP_HISTORY_CHECKPOINT_INTERVAL
+    steps, are never evicted. We also only evict the states of steps that tell us what sheets
+    they read from (see get_source_dataframe_indexes), as these are the steps that give the 
+    same result when they are executed again.
+
+    States that have already been recomputed once are never evicted again. Something read them
+    after they were evicted (e.g. transpiling reads the prev state of some code chunks on every
+    event), and so evicting them again would just recompute them again on the next event.
+
+    Dataframes shared between states have the same sheet version, and so we only count them 
+    once. We do not count the memory used by the python objects in object columns, as this
+    is very slow to compute.
+    """
+    states: List[State] = []
+    for step in steps:
+        if step.post_state is not None and not step.post_state.dfs_evicted and all(step.post_state is not state for state in states):
+            states.append(step.post_state)
+
+    sheet_version_memory_usage: Dict[int, int] = {}
+    sheet_version_state_count: Dict[int, int] = {}
+    for state in states:
+        for sheet_version, df in zip(state.sheet_versions, state.dfs):
+            if sheet_version not in sheet_version_memory_usage:
+                sheet_version_memory_usage[sheet_version] = int(df.memory_usage(index=True, deep=False).sum())
+            sheet_version_state_count[sheet_version] = sheet_version_state_count.get(sheet_version, 0) + 1
+
+    memory_usage = sum(sheet_version_memory_usage.values())
+    
+    for step_index, step in enumerate(steps[:-1]):
+        if memory_usage <= memory_limit_bytes:
+            return
+        
+        if step_index % STEP_HISTORY_CHECKPOINT_INTERVAL == 0:
+            continue
+        
+        post_state = step.post_state
+        if post_state is None or post_state is step.prev_state or post_state.dfs_evicted or post_state.dfs_recomputed or post_state is steps[-1].post_state:
+            continue
+
+        if step.step_performer.get_source_dataframe_indexes(step.params) is None:
+            continue
+
+        for sheet_version in post_state.sheet_versions:
+            sheet_version_state_count[sheet_version] -= 1
+            if sheet_version_state_count[sheet_version] == 0:
+                memory_usage -= sheet_version_memory_usage[sheet_version]
+
+        post_state.evict_dfs(partial(recompute_step_post_state_dfs, step))
+
+
 def get_modified_sheet_indexes(
     steps: List[Step], starting_step_index: int, ending_step_index: int
 ) -> Set[int]:
@@ -213,9 +338,11 @@ class StepsManager:
         self.import_folder = import_folder
 
         # The args are a tuple of dataframes or strings, and we start by making them
-        # into a list, and making copies of them for safe keeping
+        # into a list, and making copies of them for safe keeping. We only need the 
+        # strings to transpile the args, so for dataframes we just keep a copy of their
+        # columns without any rows, as copying all of a large dataframe uses a lot of memory
         self.original_args = [
-            arg.copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
+            arg.iloc[:0].copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
             for arg in args
         ]
 
@@ -322,6 +449,13 @@ class StepsManager:
         )
         self.last_step_index_we_wrote_sheet_json_on = 0
 
+        # The code is transpiled after every edit, so we cache the optimized code chunks
+        # of the steps, and only optimize the code chunks of new steps with them
+        self.optimized_code_chunks_cache = OptimizedCodeChunksCache()
+
+        # Similarly, we keep an index of the steps to find the skipped steps as steps are added
+        self.step_indexes_to_skip_cache = StepIndexesToSkipCache()
+
         # We store the number of update events that have been processed successfully,
         # which allows us to have some awareness about undos and redos in the front-end
         self.update_event_count = 0
@@ -439,7 +573,7 @@ class StepsManager:
         the skipped steps
         """
         step_summary_list = []
-        step_indexes_to_skip = get_step_indexes_to_skip(self.steps_including_skipped)
+        step_indexes_to_skip = get_step_indexes_to_skip(self.steps_including_skipped, self.step_indexes_to_skip_cache)
         for index, step in enumerate(self.steps_including_skipped):
             if step.step_type == "initialize":
                 step_summary_list.append(
@@ -460,11 +594,7 @@ class StepsManager:
             
             # NOTE: we cannot and should not optimize the code chunks here, as
             # rely on getting data out of them is to label the steps correctly
-            code_chunks = step.step_performer.transpile(
-                step.prev_state, # type: ignore
-                step.params,
-                step.execution_data,
-            )
+            code_chunks = step.get_code_chunks()
 
             step_summary_list.append(
                 {
@@ -615,7 +745,7 @@ class StepsManager:
             last_valid_index = min(newly_skipped_indexes.union({len(self.steps_including_skipped)})) - 1
 
         # Make sure that this step isn't itself skipped, and decrement until it is not
-        all_skipped_indexes = get_step_indexes_to_skip(new_steps)
+        all_skipped_indexes = get_step_indexes_to_skip(new_steps, self.step_indexes_to_skip_cache)
         while last_valid_index in all_skipped_indexes:
             last_valid_index -= 1
 
@@ -763,11 +893,25 @@ class StepsManager:
             last_valid_index = self.find_last_valid_index(new_steps)
 
         final_steps = execute_step_list_from_index(
-            new_steps, start_index=last_valid_index
+            new_steps, start_index=last_valid_index, step_indexes_to_skip_cache=self.step_indexes_to_skip_cache
         )
         self.steps_including_skipped = final_steps
         self.curr_step_idx = len(self.steps_including_skipped) - 1
 
+    def evict_states_over_memory_limit(self) -> None:
+        """
+        If there is a memory limit on the step history, evicts the dataframes from
+        the oldest states until the step history is under the limit. 
+
+        This should be called once an event has been fully handled, as evicted 
+        states are recomputed if they are used.
+        """
+        memory_limit_mb = self.mito_config.step_history_memory_limit_mb
+        if memory_limit_mb is None:
+            return
+        
+        evict_step_states_over_memory_limit(self.steps_including_skipped, memory_limit_mb * 1024 * 1024)
+
     def execute_steps_data(self, new_steps_data: Optional[List[Dict[str, Any]]] = None) -> None:
         """
         Given steps data (e.g. from a saved analysis), will turn
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+"""
+Contains the TelemetryQueue, which sends logs from a background thread
+so that sending them never slows down processing events.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+# The most logs we hold before we start dropping new ones. This is
+# only reached if logs cannot be sent for a long time
+MAX_QUEUED_LOGS = 1000
+
+# How often the queued logs are sent
+TELEMETRY_FLUSH_INTERVAL_SECONDS = 1
+
+
+class TelemetryQueue():
+    """
+    The TelemetryQueue holds logs until a background thread sends them,
+    every flush_interval seconds, in batches with send_logs.
+
+    The queue is bounded, and if it is full, new logs are dropped rather
+    than making the caller wait. Any logs that are still queued when Python
+    exits are sent then.
+
+    If threaded is False (e.g. in JupyterLite, where we cannot start threads),
+    logs are sent as soon as they are put in the queue.
+    """
+
+    def __init__(
+            self,
+            send_logs: Callable[[List[Any]], None],
+            max_queued_logs: int=MAX_QUEUED_LOGS,
+            flush_interval: float=TELEMETRY_FLUSH_INTERVAL_SECONDS,
+            threaded: bool=True
+        ):
+        self.send_logs = send_logs
+        self.flush_interval = flush_interval
+        self.threaded = threaded
+        self.queued_logs: "queue.Queue[Any]" = queue.Queue(max_queued_logs)
+        self.num_dropped_logs = 0
+
+        # Makes sure only one thread sends logs at a time, so they are sent in order
+        self.flush_lock = threading.Lock()
+        self.flush_thread: Optional[threading.Thread] = None
+        self.start_lock = threading.Lock()
+        self.logs_queued = threading.Event()
+
+    def put(self, log: Any) -> bool:
+        """
+        Queues the log to be sent, returning False if it was dropped
+        because the queue is full.
+        """
+        try:
+            self.queued_logs.put_nowait(log)
+        except queue.Full:
+            self.num_dropped_logs += 1
+            return False
+
+        if not self.threaded:
+            self.flush()
+        else:
+            self.logs_queued.set()
+            self._start_flush_thread()
+
+        return True
+
+    def flush(self) -> None:
+        """
+        Sends all the logs that are currently queued.
+        """
+        with self.flush_lock:
+            logs = []
+            while True:
+                try:
+                    logs.append(self.queued_logs.get_nowait())
+                except queue.Empty:
+                    break
+
+            if len(logs) == 0:
+                return
+
+            try:
+                self.send_logs(logs)
+            except Exception:
+                # Failing to send logs should never break anything else
+                pass
+
+    def _start_flush_thread(self) -> None:
+        # We only start the thread once there is something to send, so
+        # that importing mitosheet does not start a thread
+        if self.flush_thread is not None:
+            return
+
+        with self.start_lock:
+            if self.flush_thread is None:
+                self.flush_thread = threading.Thread(target=self._run_periodic_flush, daemon=True)
+                self.flush_thread.start()
+                atexit.register(self.flush)
+
+    def _run_periodic_flush(self) -> None:
+        while True:
+            # Wait for a log, and then give other logs flush_interval seconds to
+            # arrive, so that they are sent together
+            self.logs_queued.wait()
+            time.sleep(self.flush_interval)
+            self.logs_queued.clear()
+            self.flush()
@@ -16,7 +16,7 @@ import platform
 import sys
 import time
 from copy import copy
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
@@ -25,6 +25,7 @@ from mitosheet.enterprise.telemetry.mito_log_uploader import MitoLogUploader
 from mitosheet.errors import MitoError, get_recent_traceback_as_list
 from mitosheet.telemetry.anonymization_utils import anonymize_object, get_final_private_params_for_single_kv
 from mitosheet.telemetry.private_params_map import LOG_EXECUTION_DATA_LENGTH_FIRST_ELEMENT, LOG_EXECUTION_DATA_PUBLIC
+from mitosheet.telemetry.telemetry_queue import TelemetryQueue
 from mitosheet.types import StepsManagerType
 from mitosheet.user.location import get_location, is_docker, is_jupyterlite
 from mitosheet.user.schemas import UJ_FEEDBACKS, UJ_FEEDBACKS_V2, UJ_INTENDED_BEHAVIOR, UJ_MITOSHEET_TELEMETRY, UJ_USER_EMAIL
@@ -62,6 +63,9 @@ from mitosheet.user import (UJ_STATIC_USER_ID, get_user_field,
 # If you want, you can optionally choose to print logs
 PRINT_LOGS = False
 
+# How long we wait for the analytics url to respond to each log
+ANALYTICS_URL_TIMEOUT_SECONDS = 5
+
 
 try:
     import mitosheet_helper_private
@@ -297,42 +301,37 @@ def log_event_processed(event: Dict[str, Any], steps_manager: StepsManagerType,
     # We choose to log the event type, as it is the best high-level item for our logs
     # and we append a _failed if the event failed in doing this.
     log_event: str = event['type'] + ('_failed' if failed else '')
+    # NOTE: We make a copy here so we don't modify the actual params
+    # dict, which we don't want to do as it's used elsewhere!
     params_copy = copy(event['params'])
     if failed: 
         params_copy['failed_log_event'] = log_event
 
-    params_for_final_log = {
-        # NOTE: We make a copy here so we don't modify the actual params
-        # dict, which we don't want to do as it's used elsewhere!
-        'params': params_copy,
-        'steps_manager': steps_manager,
-        'failed': failed,
-        'error': error,
-        'start_time': start_time
-    }
-
-    log(
-        log_event, 
-        **params_for_final_log
+    # Both logs share all of their params, so we only collect them once
+    final_params = _get_final_log_params(
+        params=params_copy,
+        steps_manager=steps_manager,
+        failed=failed,
+        error=error,
+        start_time=start_time
     )
 
+    _send_log(log_event, final_params, steps_manager=steps_manager)
+
     if failed:
         # We also generate a double log in the case of errors, whenever anything fails. This allows
         # us to easily track the number of users who are getting errors
-        log(
-            'error', 
-            **params_for_final_log,
-        )
+        _send_log('error', final_params, steps_manager=steps_manager)
     else:
         # We also generate a single aggregate log for each of the different
         # types of events the user sends to the backend. As with the above, 
         # this allows us to easily aggregate across different types of events
         # and track general trends (at the cost of making the logs look a bit
         # messier to human eyes)
-        params_for_final_log['params']['log_event'] = log_event
-        log(
+        _send_log(
             event['event'], 
-            **params_for_final_log
+            {**final_params, **_get_anonymized_log_params({'log_event': log_event}, steps_manager=steps_manager)},
+            steps_manager=steps_manager
         )
 
 
@@ -383,21 +382,52 @@ def identify() -> None:
             analytics.identify(static_user_id, params)
 
 
-def log(
-        log_event: str, 
+def _send_logs(queued_logs: List[Tuple[str, str, Dict[str, Any], Optional[str]]]) -> None:
+    """
+    Sends a batch of logs from the telemetry queue. Each log is a tuple of
+    the user id, the log event, the final params, and the analytics url.
+    """
+    with requests.Session() as session:
+        for static_user_id, log_event, final_params, analytics_url in queued_logs:
+            # We do not log anything when tests are running, or if telemetry is turned off
+            if not is_running_test() and telemetry_turned_on():
+                if is_jupyterlite():
+                    # We patch post function to use pyodide fetch
+                    # instead of requests
+                    with patch('requests.sessions.Session.post', post):
+                        analytics.track(static_user_id, log_event, final_params)
+                else:
+                    analytics.track(static_user_id, log_event, final_params)
+
+            if analytics_url is not None:
+                try:
+                    session.post(
+                        analytics_url,
+                        json={
+                            'user_id': static_user_id,
+                            'log_event': log_event
+                        },
+                        timeout=ANALYTICS_URL_TIMEOUT_SECONDS
+                    )
+                except Exception:
+                    # If the analytics url is unreachable, we just skip this log
+                    pass
+
+# Logs are sent from a background thread, so that a slow or unreachable analytics 
+# server never slows down processing events. We cannot start threads in JupyterLite
+telemetry_queue = TelemetryQueue(_send_logs, threaded=not is_jupyterlite())
+
+
+def _get_final_log_params(
         params: Optional[Dict[str, Any]]=None, 
         steps_manager: Optional[StepsManagerType]=None, 
         failed: bool=False, 
         error: Optional[Exception]=None, 
         start_time: Optional[float]=None,
-    ) -> None:
+    ) -> Dict[str, Any]:
     """
-    This function is the entry point for all logging. It collects
-    all relevant parameters, exeuction data, and more info while
-    making sure to anonymize all data. 
-
-    Then, if telemetry is not turned off and we are not running tests,
-    we log this information.
+    Collects all relevant parameters, exeuction data, and more info 
+    for a log, while making sure to anonymize all data. 
     """
     if params is None:
         params = {}
@@ -429,26 +459,16 @@ def log(
     # Then, make sure to add the user email
     final_params['email'] = get_user_field(UJ_USER_EMAIL)
 
-    # Finially, do the acutal logging. We do not log anything when tests are
-    # running, or if telemetry is turned off
-    if not is_running_test() and telemetry_turned_on():
+    return final_params
 
-        if is_jupyterlite():
-            # We patch post function to use pyodide fetch
-            # instead of requests
-            with patch('requests.sessions.Session.post', post):
-                analytics.track(
-                    get_user_field(UJ_STATIC_USER_ID), 
-                    log_event, 
-                    final_params
-                )
-        else:
-            analytics.track(
-                get_user_field(UJ_STATIC_USER_ID), 
-                log_event, 
-                final_params
-            )
-        
+
+def _send_log(log_event: str, final_params: Dict[str, Any], steps_manager: Optional[StepsManagerType]=None) -> None:
+    """
+    Queues the log to be sent to our analytics and to the analytics url, and 
+    passes it to the log uploader, if there is one.
+    """
+    analytics_url = steps_manager.mito_config.analytics_url if steps_manager is not None else None
+    telemetry_queue.put((get_user_field(UJ_STATIC_USER_ID), log_event, final_params, analytics_url))
 
     # If we want to print the logs for debugging reasons, then we print them as well
     if PRINT_LOGS:
@@ -457,16 +477,33 @@ def log(
             final_params
         )
 
-    analytics_url = steps_manager.mito_config.analytics_url if steps_manager is not None else None
-    if analytics_url is not None:
-        requests.post(
-            analytics_url,
-            json={
-                'user_id': get_user_field(UJ_STATIC_USER_ID),
-                'log_event': log_event
-            }
-        )
-
     mito_log_uploader = steps_manager.mito_log_uploader if steps_manager is not None else None
     if mito_log_uploader is not None:
         mito_log_uploader.log(log_event, final_params)
+
+
+def log(
+        log_event: str, 
+        params: Optional[Dict[str, Any]]=None, 
+        steps_manager: Optional[StepsManagerType]=None, 
+        failed: bool=False, 
+        error: Optional[Exception]=None, 
+        start_time: Optional[float]=None,
+    ) -> None:
+    """
+    This function is the entry point for all logging. It collects
+    all relevant parameters, exeuction data, and more info while
+    making sure to anonymize all data. 
+
+    Then, if telemetry is not turned off and we are not running tests,
+    we queue this information to be logged.
+    """
+    final_params = _get_final_log_params(
+        params=params,
+        steps_manager=steps_manager,
+        failed=failed,
+        error=error,
+        start_time=start_time
+    )
+
+    _send_log(log_event, final_params, steps_manager=steps_manager)
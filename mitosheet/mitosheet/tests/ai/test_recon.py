@@ -758,4 +758,31 @@ def test_invalid_code_execute(code, error):
     prev_state = State(df_names=list(old_dfs_map.keys()), dfs=list(old_dfs_map.values()), public_interface_version=3)
     with pytest.raises(MitoError) as e:
         exec_and_get_new_state_and_result(prev_state, code)
-    assert error in str(e)
\ No newline at end of file
+    assert error in str(e)
+
+def test_get_column_recon_without_detecting_modified_columns():
+    old_df = pd.DataFrame({'A': [1], 'B': [2]})
+    new_df = pd.DataFrame({'A': [2], 'C': [3]})
+
+    recon = get_modified_dataframe_recon_data(old_df, new_df, detect_modified_columns=False)
+    assert recon['column_recon']['created_columns'] == ['C']
+    assert recon['column_recon']['deleted_columns'] == ['B']
+    assert recon['column_recon']['modified_columns'] == []
+
+
+def test_recon_with_copy_on_write_only_finds_changed_columns():
+    pd.set_option('mode.copy_on_write', True)
+    try:
+        df = pd.DataFrame({'A': [1, 2, 3], 'B': [1.0, 2.0, 3.0], 'C': ['a', 'b', 'c']})
+        state = State([df], public_interface_version=3)
+
+        new_state, _, result = exec_and_get_new_state_and_result(state, "df1['B'] = df1['B'] * 2")
+
+        assert result['modified_dataframes_recons']['df1']['column_recon']['modified_columns'] == ['B']
+        assert new_state.dfs[0]['B'].tolist() == [2.0, 4.0, 6.0]
+        assert df['B'].tolist() == [1.0, 2.0, 3.0]
+
+        recon_data = exec_for_recon("df1.head()", {'df1': df})
+        assert recon_data['modified_dataframes'] == {}
+    finally:
+        pd.set_option('mode.copy_on_write', False)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the pool of threads that handle API calls.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from mitosheet.api.api import API
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+class FakeMitoBackend:
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+
+    def mito_send(self, message: Dict[str, Any]) -> None:
+        self.messages.append(message)
+
+    def get_response(self, event_id: str, timeout: float=5) -> Any:
+        start = time.time()
+        while time.time() - start < timeout:
+            for message in self.messages:
+                if message['id'] == event_id:
+                    return message
+            time.sleep(0.01)
+        raise Exception(f'No response to {event_id}')
+
+
+def get_api(monkeypatch, slow_call_started: threading.Event, finish_slow_call: threading.Event):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito_backend = FakeMitoBackend()
+    api = API(mito.mito_backend.steps_manager, mito_backend)
+
+    def slow_get_dataframe_as_csv(params, steps_manager):
+        slow_call_started.set()
+        finish_slow_call.wait(5)
+        return params['result']
+
+    monkeypatch.setattr('mitosheet.api.api.get_dataframe_as_csv', slow_get_dataframe_as_csv)
+    return api, mito_backend
+
+
+def test_api_handles_fast_calls_while_slow_calls_run(monkeypatch):
+    slow_call_started, finish_slow_call = threading.Event(), threading.Event()
+    api, mito_backend = get_api(monkeypatch, slow_call_started, finish_slow_call)
+
+    api.process_new_api_call({'event': 'api_call', 'id': 'slow', 'type': 'get_dataframe_as_csv', 'params': {'result': 'csv'}})
+    assert slow_call_started.wait(5)
+
+    api.process_new_api_call({'event': 'api_call', 'id': 'fast', 'type': 'get_path_join', 'params': {'path_parts': ['a', 'b']}})
+    assert mito_backend.get_response('fast')['data'] is not None
+    assert all(message['id'] != 'slow' for message in mito_backend.messages)
+
+    finish_slow_call.set()
+    assert mito_backend.get_response('slow')['data'] == 'csv'
+
+
+def test_api_running_calls_are_not_replaced(monkeypatch):
+    slow_call_started, finish_slow_call = threading.Event(), threading.Event()
+    api, mito_backend = get_api(monkeypatch, slow_call_started, finish_slow_call)
+
+    api.process_new_api_call({'event': 'api_call', 'id': 'first', 'type': 'get_dataframe_as_csv', 'params': {'result': 'csv'}})
+    assert slow_call_started.wait(5)
+    api.process_new_api_call({'event': 'api_call', 'id': 'second', 'type': 'get_dataframe_as_csv', 'params': {'result': 'csv'}})
+
+    finish_slow_call.set()
+    assert mito_backend.get_response('first')['data'] == 'csv'
+    assert mito_backend.get_response('second')['data'] == 'csv'
+
+
+def wait_for_running_api_calls(api: API, num_running_api_calls: int, timeout: float=5) -> None:
+    start = time.time()
+    while len(api.running_api_calls) < num_running_api_calls:
+        if time.time() - start > timeout:
+            raise Exception(f'{num_running_api_calls} API calls are not running')
+        time.sleep(0.01)
+
+
+def test_api_new_call_replaces_queued_calls_for_same_target_only(monkeypatch):
+    slow_call_started, finish_slow_call = threading.Event(), threading.Event()
+    api, mito_backend = get_api(monkeypatch, slow_call_started, finish_slow_call)
+    monkeypatch.setattr('mitosheet.api.api.get_column_summary_graph', lambda params, steps_manager: params['width'])
+
+    # Use all the threads that can handle slow calls, so the summary graph calls are queued
+    api.process_new_api_call({'event': 'api_call', 'id': 'csv1', 'type': 'get_dataframe_as_csv', 'params': {'result': 'csv1'}})
+    api.process_new_api_call({'event': 'api_call', 'id': 'csv2', 'type': 'get_dataframe_as_csv', 'params': {'result': 'csv2'}})
+    wait_for_running_api_calls(api, 2)
+
+    api.process_new_api_call({'event': 'api_call', 'id': 'A1', 'type': 'get_column_summary_graph', 'params': {'sheet_index': 0, 'column_id': 'A', 'width': 1}})
+    api.process_new_api_call({'event': 'api_call', 'id': 'B', 'type': 'get_column_summary_graph', 'params': {'sheet_index': 0, 'column_id': 'B', 'width': 1}})
+    api.process_new_api_call({'event': 'api_call', 'id': 'A2', 'type': 'get_column_summary_graph', 'params': {'sheet_index': 0, 'column_id': 'A', 'width': 2}})
+    api.process_new_api_call({'event': 'api_call', 'id': 'A2 again', 'type': 'get_column_summary_graph', 'params': {'sheet_index': 0, 'column_id': 'A', 'width': 2}})
+    assert mito_backend.get_response('A1')['data'] is None
+
+    finish_slow_call.set()
+    assert mito_backend.get_response('B')['data'] == 1
+    assert mito_backend.get_response('A2')['data'] == 2
+    assert mito_backend.get_response('A2 again')['data'] == 2
+    assert mito_backend.get_response('csv1')['data'] == 'csv1'
+    assert mito_backend.get_response('csv2')['data'] == 'csv2'
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the cache of column statistics.
+"""
+
+import pandas as pd
+
+from mitosheet.api.column_statistics import ColumnStatistics, get_column_statistics
+from mitosheet.api.get_column_describe import get_column_describe
+from mitosheet.api.get_unique_value_counts import MAX_UNIQUE_VALUES, get_unique_value_counts
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def test_unique_value_counts_are_the_same_as_value_counts():
+    series = pd.Series([1, 2, 2, None, 3, 3, 3])
+    mito = create_mito_wrapper(pd.DataFrame({'A': series}))
+
+    unique_value_counts_df = get_column_statistics(mito.mito_backend.steps_manager, 0, 'A').get_unique_value_counts_df()
+
+    assert unique_value_counts_df['counts'].equals(series.value_counts(dropna=False))
+    assert unique_value_counts_df['percents'].equals(series.value_counts(normalize=True, dropna=False))
+
+def test_column_statistics_are_reused_until_the_sheet_changes():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4, 5, 6]}))
+    steps_manager = mito.mito_backend.steps_manager
+
+    column_statistics_a = get_column_statistics(steps_manager, 0, 'A')
+    column_statistics_b = get_column_statistics(steps_manager, 1, 'B')
+    assert get_column_statistics(steps_manager, 0, 'A') is column_statistics_a
+    assert get_column_describe({'sheet_index': 0, 'column_id': 'A'}, steps_manager)['sum'] == '6'
+
+    mito.set_formula('=A + 1', 0, 'A')
+
+    assert get_column_statistics(steps_manager, 0, 'A') is not column_statistics_a
+    assert get_column_statistics(steps_manager, 1, 'B') is column_statistics_b
+    assert get_column_describe({'sheet_index': 0, 'column_id': 'A'}, steps_manager)['sum'] == '9'
+
+    mito.undo()
+    assert get_column_describe({'sheet_index': 0, 'column_id': 'A'}, steps_manager)['sum'] == '6'
+
+def test_unique_value_counts_with_many_values_searches_and_sorts():
+    mito = create_mito_wrapper(pd.DataFrame({'A': list(range(MAX_UNIQUE_VALUES * 2))}))
+    steps_manager = mito.mito_backend.steps_manager
+
+    params = {'sheet_index': 0, 'column_id': 'A', 'search_string': '', 'sort': 'Descending Value'}
+    result = get_unique_value_counts(params, steps_manager)
+    assert not result['isAllData']
+    assert result['uniqueValueRowDataArray'][0][0] == MAX_UNIQUE_VALUES * 2 - 1
+
+    params = {'sheet_index': 0, 'column_id': 'A', 'search_string': '1999', 'sort': 'Ascending Value'}
+    result = get_unique_value_counts(params, steps_manager)
+    assert result['isAllData']
+    assert [row[0] for row in result['uniqueValueRowDataArray']] == [1999]
+
+def test_search_sorted_unique_values_is_the_same_as_str_contains():
+    values = [f'Value-{i}' for i in range(3000)] + ['ÄBC', None, 'a\x00b', 'ab']
+    column_statistics = ColumnStatistics(pd.Series(values))
+
+    for sort in ['Ascending Value', 'Descending Value', 'Descending Occurence']:
+        sorted_unique_value_counts_df = column_statistics.get_sorted_unique_value_counts_df(sort)
+        for search_string in ['', 'value-1', 'VALUE-29', 'äbc', 'nan', 'a\x00b', 'ab', 'e-(1|2)9', 'missing']:
+            matching_df, is_all_data = column_statistics.search_sorted_unique_value_counts_df(sort, search_string, 100)
+
+            expected_df = sorted_unique_value_counts_df[sorted_unique_value_counts_df['values_strings'].str.contains(search_string, na=False, case=False)]
+            assert matching_df.index.equals(expected_df.head(100).index)
+            assert is_all_data == (len(expected_df) <= 100)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the get_dataframe_window API call.
+"""
+
+import gc
+import weakref
+
+import pandas as pd
+
+from mitosheet.api.get_dataframe_window import get_dataframe_window
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def test_get_dataframe_window_returns_rows_beyond_max_rows():
+    df = pd.DataFrame({'A': list(range(5000)), 'B': [str(i) for i in range(5000)]})
+    mito = create_mito_wrapper(df)
+
+    window = get_dataframe_window(
+        {'sheet_index': 0, 'start_row': 3000, 'num_rows': 10, 'start_column': 0, 'num_columns': 2},
+        mito.mito_backend.steps_manager
+    )
+
+    assert window['startRow'] == 3000
+    assert window['numRows'] == 5000
+    assert window['index'] == list(range(3000, 3010))
+    assert window['data'][0]['columnData'] == list(range(3000, 3010))
+    assert window['data'][1]['columnData'] == [str(i) for i in range(3000, 3010)]
+
+
+def test_get_dataframe_window_only_has_data_in_column_window():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6], 'C': [7, 8, 9]})
+    mito = create_mito_wrapper(df)
+
+    window = get_dataframe_window(
+        {'sheet_index': 0, 'start_row': 1, 'num_rows': 2, 'start_column': 1, 'num_columns': 1},
+        mito.mito_backend.steps_manager
+    )
+
+    assert window['startColumn'] == 1
+    assert window['numColumns'] == 3
+    assert window['data'][0]['columnData'] == [None, None]
+    assert window['data'][1]['columnData'] == [5, 6]
+    assert window['data'][2]['columnData'] == [None, None]
+
+
+def test_get_dataframe_window_cache_invalidated_by_new_step():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    params = {'sheet_index': 0, 'start_row': 0, 'num_rows': 3, 'start_column': 0, 'num_columns': 1}
+
+    window = get_dataframe_window(params, mito.mito_backend.steps_manager)
+    assert get_dataframe_window(params, mito.mito_backend.steps_manager) is window
+
+    mito.set_cell_value(0, 'A', 0, 10)
+
+    new_window = get_dataframe_window(params, mito.mito_backend.steps_manager)
+    assert new_window['data'][0]['columnData'] == [10, 2, 3]
+
+
+def test_get_dataframe_window_cache_does_not_keep_states_in_memory():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    params = {'sheet_index': 0, 'start_row': 0, 'num_rows': 3, 'start_column': 0, 'num_columns': 1}
+
+    mito.set_cell_value(0, 'A', 0, 10)
+    get_dataframe_window(params, mito.mito_backend.steps_manager)
+    state = weakref.ref(mito.mito_backend.steps_manager.curr_step.final_defined_state)
+
+    mito.undo()
+    mito.set_cell_value(0, 'A', 0, 20)
+    gc.collect()
+
+    assert state() is None
+    assert get_dataframe_window(params, mito.mito_backend.steps_manager)['data'][0]['columnData'] == [20, 2, 3]
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for exporting to excel, with and without formatting, and reading the export in chunks.
+"""
+import base64
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from mitosheet.api import get_dataframe_as_excel as get_dataframe_as_excel_module
+from mitosheet.api.get_dataframe_as_excel import get_dataframe_as_excel
+from mitosheet.api.get_excel_export_chunk import EXCEL_EXPORT_EXPIRED_ERROR, get_excel_export_chunk
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def get_excel_export_bytes(excel_export) -> bytes:
+    excel_bytes = b''
+    for chunk_index in range(excel_export['num_chunks']):
+        excel_bytes += base64.b64decode(get_excel_export_chunk({'export_id': excel_export['export_id'], 'chunk_index': chunk_index}, None))
+    return excel_bytes
+
+
+EXPORT_TESTS = [
+    pd.DataFrame({'A': [1, 2, 3], 'B': [1.5, np.nan, np.inf], 'C': ['a', None, 'c']}),
+    pd.DataFrame({'A': pd.to_datetime(['2020-01-01', None, '2021-05-05']), 'B': pd.to_timedelta([1, 2, None], unit='D'), 'C': [True, False, True]}),
+    pd.DataFrame({'A': pd.array([1, None, 3], dtype='Int64'), 'B': [[1, 2], 'a', 1.5]}),
+    pd.DataFrame({'A': [], 'B': []}),
+]
+@pytest.mark.parametrize("df", EXPORT_TESTS)
+def test_export_to_excel_same_as_to_excel(df):
+    mito = create_mito_wrapper(df)
+
+    excel_export = get_dataframe_as_excel({'sheet_indexes': [0]}, mito.mito_backend.steps_manager)
+    excel_bytes = get_excel_export_bytes(excel_export)
+
+    expected_buffer = io.BytesIO()
+    with pd.ExcelWriter(expected_buffer, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='df1', index=False)
+    expected_buffer.seek(0)
+
+    assert pd.read_excel(io.BytesIO(excel_bytes), sheet_name=None).keys() == {'df1'}
+    pd.testing.assert_frame_equal(
+        pd.read_excel(io.BytesIO(excel_bytes)),
+        pd.read_excel(expected_buffer)
+    )
+
+
+def test_export_to_excel_multiple_sheets():
+    df1 = pd.DataFrame({'A': [1, 2, 3]})
+    df2 = pd.DataFrame({'B': ['a', 'b']})
+    mito = create_mito_wrapper(df1, df2)
+
+    excel_export = get_dataframe_as_excel({'sheet_indexes': [0, 1]}, mito.mito_backend.steps_manager)
+    dfs = pd.read_excel(io.BytesIO(get_excel_export_bytes(excel_export)), sheet_name=None)
+
+    assert list(dfs.keys()) == ['df1', 'df2']
+    pd.testing.assert_frame_equal(dfs['df1'], df1)
+    pd.testing.assert_frame_equal(dfs['df2'], df2)
+
+
+def test_export_to_excel_in_many_chunks(monkeypatch):
+    monkeypatch.setattr(get_dataframe_as_excel_module, 'EXCEL_EXPORT_CHUNK_SIZE', 3 * 100)
+    df = pd.DataFrame({'A': range(1000), 'B': ['value ' + str(i) for i in range(1000)]})
+    mito = create_mito_wrapper(df)
+
+    excel_export = get_dataframe_as_excel({'sheet_indexes': [0]}, mito.mito_backend.steps_manager)
+    assert excel_export['num_chunks'] > 1
+
+    pd.testing.assert_frame_equal(pd.read_excel(io.BytesIO(get_excel_export_bytes(excel_export))), df)
+
+
+def test_export_to_excel_deletes_file_after_last_chunk():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+
+    excel_export = get_dataframe_as_excel({'sheet_indexes': [0]}, mito.mito_backend.steps_manager)
+    path, _ = get_dataframe_as_excel_module._excel_exports[excel_export['export_id']]
+    assert os.path.exists(path)
+
+    get_excel_export_bytes(excel_export)
+    assert not os.path.exists(path)
+    assert get_excel_export_chunk({'export_id': excel_export['export_id'], 'chunk_index': 0}, None) == {'error': EXCEL_EXPORT_EXPIRED_ERROR}
+
+
+def test_export_to_excel_deletes_oldest_idle_exports(monkeypatch):
+    monkeypatch.setattr(get_dataframe_as_excel_module, 'EXCEL_EXPORT_IDLE_SECONDS', 0)
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+
+    excel_exports = [
+        get_dataframe_as_excel({'sheet_indexes': [0]}, mito.mito_backend.steps_manager)
+        for _ in range(get_dataframe_as_excel_module.MAX_EXCEL_EXPORTS + 1)
+    ]
+
+    assert get_excel_export_chunk({'export_id': excel_exports[0]['export_id'], 'chunk_index': 0}, None) == {'error': EXCEL_EXPORT_EXPIRED_ERROR}
+    for excel_export in excel_exports[1:]:
+        pd.testing.assert_frame_equal(pd.read_excel(io.BytesIO(get_excel_export_bytes(excel_export))), df)
+
+
+def test_export_to_excel_does_not_delete_exports_being_read(monkeypatch):
+    monkeypatch.setattr(get_dataframe_as_excel_module, 'EXCEL_EXPORT_CHUNK_SIZE', 3 * 100)
+    df = pd.DataFrame({'A': range(1000), 'B': ['value ' + str(i) for i in range(1000)]})
+    mito = create_mito_wrapper(df)
+
+    excel_export = get_dataframe_as_excel({'sheet_indexes': [0]}, mito.mito_backend.steps_manager)
+    excel_bytes = base64.b64decode(get_excel_export_chunk({'export_id': excel_export['export_id'], 'chunk_index': 0}, None))
+
+    # Other exports are started while the first export is being read
+    for _ in range(get_dataframe_as_excel_module.MAX_EXCEL_EXPORTS + 1):
+        get_dataframe_as_excel({'sheet_indexes': [0]}, mito.mito_backend.steps_manager)
+
+    for chunk_index in range(1, excel_export['num_chunks']):
+        excel_bytes += base64.b64decode(get_excel_export_chunk({'export_id': excel_export['export_id'], 'chunk_index': chunk_index}, None))
+    pd.testing.assert_frame_equal(pd.read_excel(io.BytesIO(excel_bytes)), df)
+
+
+def test_export_to_excel_with_invalid_formatting_fails():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.set_dataframe_format(0, {
+        "headers": {"color": "#000000", "backgroundColor": "invalid color"},
+        "columns": {},
+        "rows": {},
+        "border": {},
+        "conditional_formats": []
+    })
+
+    with pytest.raises(ValueError):
+        get_dataframe_as_excel({'sheet_indexes': [0], 'export_formatting': True}, mito.mito_backend.steps_manager)
+
+
+def test_export_to_excel_with_formatting():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [1.5, 2.5, np.nan], 'C': ['a', 'b', 'c']})
+    mito = create_mito_wrapper(df)
+    mito.set_dataframe_format(0, {
+        "headers": {"color": "#ffffff", "backgroundColor": "#000000"},
+        "columns": {},
+        "rows": {"even": {"color": "#ffffff", "backgroundColor": "#000000"}, "odd": {"backgroundColor": "#ffffff"}},
+        "border": {},
+        "conditional_formats": [
+            {'format_uuid': 'abc', 'columnIDs': ['A'], 'filters': [{'condition': 'greater', 'value': 1}], 'color': '#ff0000', 'backgroundColor': None}
+        ]
+    })
+
+    excel_export = get_dataframe_as_excel({'sheet_indexes': [0], 'export_formatting': True}, mito.mito_backend.steps_manager)
+    sheet = load_workbook(io.BytesIO(get_excel_export_bytes(excel_export)))['df1']
+
+    assert [cell.value for cell in sheet[1]] == ['A', 'B', 'C']
+    assert sheet['A1'].fill.start_color.rgb == '00000000'
+    assert sheet['A1'].font.color.rgb == '00ffffff'
+    assert [cell.value for cell in sheet[2]] == [1, 1.5, 'a']
+    assert [sheet[f'A{row}'].number_format for row in range(2, 5)] == ['#,##0'] * 3
+    assert [sheet[f'B{row}'].number_format for row in range(2, 4)] == ['#,##0.00'] * 2
+    assert sheet['C2'].number_format == 'General'
+
+    # The conditional formats take priority over the even and odd rows
+    rules = sorted(
+        [(str(conditional_formatting.sqref), rule.formula[0], rule.priority) for conditional_formatting, rules in sheet.conditional_formatting._cf_rules.items() for rule in rules],
+        key=lambda rule: rule[2]
+    )
+    assert rules == [
+        ('A2:A4', 'A2:A4>1', 1),
+        ('A2:C4', 'MOD(ROW(),2)=0', 2),
+        ('A2:C4', 'MOD(ROW(),2)=1', 3),
+    ]
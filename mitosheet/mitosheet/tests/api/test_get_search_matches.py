@@ -214,4 +214,34 @@ def test_get_number_matches_multiple_dataframes(dfs,sheet_index,search_value,exp
 
     for i, match in enumerate(matches['matches']):
         assert match['rowIndex'] == expected_matches[i][0]
-        assert match['colIndex'] == expected_matches[i][1]
\ No newline at end of file
+        assert match['colIndex'] == expected_matches[i][1]
+def test_get_search_matches_pages_through_rows():
+    df = pd.DataFrame({'A': ['abc'] * 3000, 'B': [1, 2] * 1500})
+    test_wrapper = create_mito_wrapper(df)
+    steps_manager = test_wrapper.mito_backend.steps_manager
+
+    matches = get_search_matches({'sheet_index': 0, 'search_value': 'b'}, steps_manager)
+    assert matches['total_number_matches'] == 3001
+    assert matches['matches'][0] == {'rowIndex': -1, 'colIndex': 1}
+    assert matches['matches'][-1] == {'rowIndex': 1499, 'colIndex': 0}
+    assert len(matches['matches']) == 1501
+
+    matches = get_search_matches({'sheet_index': 0, 'search_value': '2', 'start_row_index': 2000, 'num_rows': 4}, steps_manager)
+    assert matches['total_number_matches'] == 1500
+    assert matches['matches'] == [{'rowIndex': 2001, 'colIndex': 1}, {'rowIndex': 2003, 'colIndex': 1}]
+
+def test_get_search_matches_skips_missing_values_and_searches_categories():
+    df = pd.DataFrame({
+        'A': pd.Categorical(['nan', 'other', None, 'nan']), 
+        'B': [1.5, None, 2.5, None],
+        'C': [[1, 2], None, [3], [1]],
+    })
+    test_wrapper = create_mito_wrapper(df)
+    steps_manager = test_wrapper.mito_backend.steps_manager
+
+    matches = get_search_matches({'sheet_index': 0, 'search_value': 'nan'}, steps_manager)
+    assert matches['total_number_matches'] == 2
+    assert matches['matches'] == [{'rowIndex': 0, 'colIndex': 0}, {'rowIndex': 3, 'colIndex': 0}]
+
+    matches = get_search_matches({'sheet_index': 0, 'search_value': '[1'}, steps_manager)
+    assert matches['matches'] == [{'rowIndex': 0, 'colIndex': 2}, {'rowIndex': 3, 'colIndex': 2}]
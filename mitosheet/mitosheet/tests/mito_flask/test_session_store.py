@@ -0,0 +1,84 @@
+import json
+import os
+import pandas as pd
+
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.tests.decorators import requires_flask
+from mitosheet.mito_flask.v1.flatten_utils import get_backend_state_string
+from mitosheet.mito_flask.v1.process_event import process_mito_event
+from mitosheet.mito_flask.v1.session_store import MitoBackendSessionStore
+
+
+def get_backend_state(mito_backend):
+    return get_backend_state_string(mito_backend)
+
+@requires_flask
+def test_session_store_take_returns_put_backend_once():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    backend_state = get_backend_state(mito.mito_backend)
+
+    session_store = MitoBackendSessionStore()
+    session_store.put(backend_state, mito.mito_backend)
+
+    assert session_store.take(backend_state) is mito.mito_backend
+    assert session_store.take(backend_state) is None
+
+@requires_flask
+def test_session_store_evicts_least_recently_used():
+    session_store = MitoBackendSessionStore(max_sessions=2)
+    for i in range(3):
+        session_store.put(str(i), create_mito_wrapper(pd.DataFrame({'A': [i]})).mito_backend)
+
+    assert session_store.take('0') is None
+    assert session_store.take('1') is not None
+    assert session_store.take('2') is not None
+
+@requires_flask
+def test_session_store_resumes_backend_from_snapshot(tmp_path):
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    df.to_csv("test.csv", index=False)
+    mito = create_mito_wrapper()
+    mito.simple_import(["test.csv"])
+    mito.add_column(0, 'B')
+    backend_state = get_backend_state(mito.mito_backend)
+
+    session_store = MitoBackendSessionStore(snapshot_folder=str(tmp_path))
+    session_store.put(backend_state, mito.mito_backend)
+
+    # A store in another process only has the snapshot
+    other_session_store = MitoBackendSessionStore(snapshot_folder=str(tmp_path))
+    mito_backend = other_session_store.take(backend_state)
+    assert mito_backend is not None
+    assert mito_backend.steps_manager.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [0, 0, 0]}))
+    assert len(os.listdir(tmp_path)) == 0
+
+    new_mito = create_mito_wrapper(mito_backend=mito_backend)
+    new_mito.add_column(0, 'C')
+    assert mito_backend.steps_manager.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [0, 0, 0], 'C': [0, 0, 0]}))
+    assert get_backend_state(mito_backend) != backend_state
+
+    os.remove("test.csv")
+
+@requires_flask
+def test_process_mito_event_resumes_backend_from_session_store():
+    from flask import Flask
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    backend_state = get_backend_state(mito.mito_backend)
+
+    session_store = MitoBackendSessionStore()
+    session_store.put(backend_state, mito.mito_backend)
+
+    with Flask(__name__).app_context():
+        response = process_mito_event(backend_state, None, session_store=session_store)
+
+    assert json.loads(response.get_json()['state'])['backend_state'] == backend_state
+    assert session_store.take(backend_state) is mito.mito_backend
+
+@requires_flask
+def test_process_mito_event_replays_analysis_without_session_store():
+    from flask import Flask
+    with Flask(__name__).app_context():
+        backend_state = json.loads(process_mito_event(None, None).get_json()['state'])['backend_state']
+        response = process_mito_event(backend_state, None)
+
+    assert json.loads(response.get_json()['state'])['backend_state'] == backend_state
@@ -34,6 +34,10 @@ ROUND_VALID_TESTS = [
     ([pd.Series([.11, 1.1]), None], pd.Series([0.0, 1.0])),
     ([pd.Series([.11, 1.1, None]), None], pd.Series([0.0, 1.0, None])),
     ([pd.Series([0, 0.49, 0.5 ,0.51 ,1.5 ,2.5 ,3.5 ,-0.49 ,-0.5 ,-0.51 ,-1.5 ,-2.5 ,-3.5]), 0], pd.Series([0.0, 0.0, 1.0, 1.0, 2.0, 3.0, 4.0, 0.0, -1.0, -1.0, -2.0, -3.0, -4.0])),
+    ([pd.Series([0.125, 0.375, -0.125, 2.675, 1.005, 123456.785]), 2], pd.Series([0.13, 0.38, -0.13, 2.67, 1.0, 123456.79])),
+    ([pd.Series([15.0, 25.0, -15.0, 14.9]), -1], pd.Series([20.0, 30.0, -20.0, 10.0])),
+    ([pd.Series([1, 2, 3]), 2], pd.Series([1, 2, 3])),
+    ([pd.Series([1e20, 0.5]), 0], pd.Series([1e20, 1.0])),
 ]
 
 @pytest.mark.parametrize("_argv, expected", ROUND_VALID_TESTS)
@@ -28,6 +28,8 @@ FIND_VALID_TESTS: Any = [
     # Constants and series
     (['a', pd.Series(['a', 'b', 'c'])], pd.Series([1, 0, 0])),
     ([pd.Series(['xxa', 'xbx', 'cxx', 'd']), pd.Series(['a', 'b', 'c', 'f'])], pd.Series([3, 2, 1, 0])),
+    ([pd.Series(['xxa', 'xax', np.nan, 'd']), 'a'], pd.Series([3, 2, 0, 0])),
+    ([pd.Series(['xxa', 'xax', np.nan, 'd']), ''], pd.Series([1, 1, 1, 1])),
     ([pd.Series([np.nan, 'xbx', 'cxx', 'd']), pd.Series(['a', 'b', 'c', 'f'])], pd.Series([0, 2, 1, 0])),
     ([pd.Series([np.nan, 'xbx', 'cxx', 'd']), pd.Series(['a', 'b', 'c', 'f'])], pd.Series([0, 2, 1, 0])),
     ([pd.Series(['True', 'x1.0x', 'cxx', 'd']), pd.Series([True, 1.0, 'c', 'f'])], pd.Series([1, 2, 1, 0])),
@@ -25,6 +25,8 @@ RIGHT_VALID_TESTS: Any = [
     (['abc', pd.Series([-1, -2, -3])], pd.Series(['bc', 'c', ''])),
     ([pd.Series(['a', 'ab', 'abc']), 2], pd.Series(['a', 'ab', 'bc'])),
     ([pd.Series(['a', 'ab', 'abc']), 10], pd.Series(['a', 'ab', 'abc'])),
+    ([pd.Series(['a', 'ab', 'abc']), 0], pd.Series(['', '', ''])),
+    ([pd.Series(['a', 'ab', 'abc']), -1], pd.Series(['', 'b', 'bc'])),
     ([pd.Series(['a', 'ab', 'abc']), pd.Series([None, None, None])], pd.Series(['', '', ''])),
     ([pd.Series([1.0, None, None]), pd.Series([1, 1, 1])], pd.Series(['0', '', ''])),
     ([pd.Series([1.0, None, None]), pd.Series([None, None, None])], pd.Series(['', '', ''])),
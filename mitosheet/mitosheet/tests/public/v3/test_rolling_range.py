@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the RollingRange object.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.public.v3.rolling_range import RollingRange
+from mitosheet.public.v3.sheet_functions.number_functions import AVG, MAX, MIN, SUM
+
+AGGREGATION_FUNCTIONS = {
+    'sum': lambda df: df.sum().sum(),
+    'count': lambda df: df.count().sum(),
+    'min': lambda df: df.min().min(),
+    'max': lambda df: df.max().max(),
+}
+
+ROLLING_RANGE_DATAFRAMES = [
+    pd.DataFrame({'B': [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
+    pd.DataFrame({'B': [1, 2, 3, 4, 5, 6], 'C': [-4, 5, -6, 7, 8, 9]}),
+    pd.DataFrame({'B': [1.5, np.nan, 3.25, 4.0, np.nan], 'C': [np.nan, np.nan, 6.5, -7.0, 8.0]}),
+    pd.DataFrame({'B': [np.nan, np.nan, np.nan]}),
+]
+
+@pytest.mark.parametrize("aggregation", AGGREGATION_FUNCTIONS.keys())
+@pytest.mark.parametrize("df", ROLLING_RANGE_DATAFRAMES)
+@pytest.mark.parametrize("window, offset", [(1, 0), (2, 0), (2, -1), (3, 1), (5, -2), (10, 0), (2, -10), (3, 10)])
+def test_rolling_range_aggregate_matches_apply(aggregation, df, window, offset):
+    rolling_range = RollingRange(df, window, offset)
+    func = AGGREGATION_FUNCTIONS[aggregation]
+
+    pd.testing.assert_series_equal(
+        rolling_range.aggregate(aggregation, func),
+        rolling_range.apply(func)
+    )
+
+
+@pytest.mark.parametrize("aggregation", AGGREGATION_FUNCTIONS.keys())
+@pytest.mark.parametrize("window, offset", [(3, 0), (3, -1), (10, -4), (50, 0)])
+def test_rolling_range_aggregate_matches_apply_with_large_values(aggregation, window, offset):
+    random_state = np.random.RandomState(0)
+    df = pd.DataFrame({'B': 1e9 + random_state.rand(200), 'C': -1e9 + random_state.rand(200) * 1e3})
+    rolling_range = RollingRange(df, window, offset)
+    func = AGGREGATION_FUNCTIONS[aggregation]
+
+    result = rolling_range.aggregate(aggregation, func).to_numpy()
+    expected = rolling_range.apply(func).to_numpy()
+
+    if aggregation == 'sum':
+        # Sums of floats depend on the order the values are added in, so we allow 
+        # for rounding errors in the size of the values that are summed
+        max_error = RollingRange(df.abs(), window, offset).apply(func).to_numpy() * 1e-15
+        assert (np.abs(result - expected) <= max_error).all()
+    else:
+        assert np.array_equal(result, expected)
+
+
+def test_rolling_range_aggregate_falls_back_for_datetimes():
+    df = pd.DataFrame({'B': pd.to_datetime(['1-1-2001', '1-2-2001', '1-3-2001'])})
+    rolling_range = RollingRange(df, 2, 0)
+
+    result = rolling_range.aggregate('max', lambda df: df.max().max())
+    assert result.tolist() == [pd.Timestamp('1-2-2001'), pd.Timestamp('1-3-2001'), pd.Timestamp('1-3-2001')]
+
+
+INFINITE_AND_OVERFLOW_TESTS = [
+    (SUM, pd.DataFrame({'A': [np.inf, 1, 2]}), 1, 0, [np.inf, 1, 2]),
+    (SUM, pd.DataFrame({'A': [-np.inf, 1, 2]}), 2, 0, [-np.inf, 3, 2]),
+    (SUM, pd.DataFrame({'A': [1e308, 1e308, 1, 2, 5]}), 2, 0, [np.inf, 1e308, 3, 7, 5]),
+    (MAX, pd.DataFrame({'A': [np.inf, 1, 2]}), 1, 0, [np.inf, 1, 2]),
+    (MAX, pd.DataFrame({'A': [1e308, 1e308, 1, 2, 5]}), 2, 0, [1e308, 1e308, 2, 5, 5]),
+    (MIN, pd.DataFrame({'A': [-np.inf, 1, 2]}), 1, 0, [-np.inf, 1, 2]),
+    (MIN, pd.DataFrame({'A': [1, np.inf, 2]}), 2, 0, [1, 2, 2]),
+    (AVG, pd.DataFrame({'A': [np.inf, 1, 2]}), 1, 0, [np.inf, 1, 2]),
+    (AVG, pd.DataFrame({'A': [1e308, 1e308, 1, 2, 5]}), 2, 0, [np.inf, 5e307, 1.5, 3.5, 5]),
+]
+@pytest.mark.parametrize("func, df, window, offset, expected", INFINITE_AND_OVERFLOW_TESTS)
+def test_rolling_range_functions_with_infinite_values_and_overflow(func, df, window, offset, expected):
+    result = func(RollingRange(df, window, offset))
+    assert result.tolist() == expected
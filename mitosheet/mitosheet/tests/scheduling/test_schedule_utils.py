@@ -79,7 +79,7 @@ from mitosheet.public.v3 import *
 import pandas as pd
 
 def automation_name(file_name_import_csv_0, file_name_export_csv_0, file_name_export_excel_0):
-    input = pd.read_csv(file_name_import_csv_0, sep='A')
+    input = pd.read_csv(file_name_import_csv_0)
     
     input['B'] = 0
     
@@ -221,4 +221,35 @@ def test_box_configuration():
     assert mito.get_graph_sheet_index(graph_id) == 0
     assert mito.get_graph_axis_column_ids(graph_id, 'x') == ['A']
     assert mito.get_graph_axis_column_ids(graph_id, 'y') == ['B', 'C']
-    assert not mito.get_is_graph_output_none(graph_id)
\ No newline at end of file
+    assert not mito.get_is_graph_output_none(graph_id)
+
+def test_graph_does_not_change_sheet_versions():
+    df1 = pd.DataFrame({'A': [1, 2, 3]})
+    df2 = pd.DataFrame({'B': [4, 5, 6]})
+    mito = create_mito_wrapper(df1, df2)
+    sheet_versions = mito.curr_step.final_defined_state.sheet_versions
+
+    mito.generate_graph('123', BAR, 0, False, ['A'], [], 400, 400)
+    assert mito.curr_step.final_defined_state.sheet_versions == sheet_versions
+
+
+def test_graph_output_reused_when_graph_data_unchanged():
+    df1 = pd.DataFrame({'A': [1, 2, 3]})
+    df2 = pd.DataFrame({'B': [4, 5, 6]})
+    mito = create_mito_wrapper(df1, df2)
+    mito.generate_graph('123', BAR, 0, False, ['A'], [], 400, 400)
+    graph_output = mito.get_graph_data('123')['graph_output']
+
+    # Changing another sheet, or making the same graph again, does not render the graph again
+    mito.add_column(1, 'C')
+    mito.generate_graph('123', BAR, 0, False, ['A'], [], 400, 400)
+    assert mito.get_graph_data('123')['graph_output'] is graph_output
+
+    # But changing the params or the data does
+    mito.generate_graph('123', BAR, 0, False, ['A'], [], 500, 400)
+    assert mito.get_graph_data('123')['graph_output'] is not graph_output
+    graph_output = mito.get_graph_data('123')['graph_output']
+
+    mito.set_cell_value(0, 'A', 0, 10)
+    mito.generate_graph('123', BAR, 0, False, ['A'], [], 500, 400)
+    assert mito.get_graph_data('123')['graph_output'] is not graph_output
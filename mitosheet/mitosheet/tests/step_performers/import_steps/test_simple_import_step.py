@@ -9,7 +9,10 @@ Contains tests for simple import steps
 import pytest
 import pandas as pd
 import os
-from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import DEFAULT_DECIMAL, DEFAULT_DELIMITER, DEFAULT_ENCODING, DEFAULT_SKIPROWS
+from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import DEFAULT_DECIMAL, DEFAULT_DELIMITER, DEFAULT_ENCODING, DEFAULT_SKIPROWS, SimpleImportCodeChunk
+from mitosheet.state import State
+from mitosheet.enterprise.mito_config import MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE, MITO_CONFIG_VERSION
+from mitosheet.step_performers.import_steps.simple_import import get_csv_delimiter_and_encoding, get_read_csv_engine
 
 from mitosheet.tests.test_utils import create_mito_wrapper
 from mitosheet.utils import is_prev_version
@@ -85,7 +88,6 @@ def test_can_import_a_single_csv():
     # Remove the test file
     os.remove(TEST_FILE_PATHS[0])
 
-@pytest.mark.skip('Error in delimeter detection, just noting')
 def test_can_import_a_single_csv_with_a_single_column():
     df = pd.DataFrame(data={'date': [1, 2, 3]})
     df.to_csv(TEST_FILE_PATHS[0], index=False)
@@ -159,6 +161,115 @@ def test_can_import_multiple_csv():
     os.remove(TEST_FILE_PATHS[0])
     os.remove(TEST_FILE_PATHS[1])
 
+def test_can_import_multiple_csv_with_different_contents_in_order():
+    dfs = [pd.DataFrame(data={'A': [i] * (i + 1), 'B': ['b' + str(i)] * (i + 1)}) for i in range(len(TEST_FILE_PATHS))]
+    for df, file_path in zip(dfs, TEST_FILE_PATHS):
+        df.to_csv(file_path, index=False)
+
+    mito = create_mito_wrapper()
+    mito.simple_import(TEST_FILE_PATHS)
+
+    assert len(mito.dfs) == len(TEST_FILE_PATHS)
+    for df, imported_df in zip(dfs, mito.dfs):
+        assert imported_df.equals(df)
+
+    for file_path in TEST_FILE_PATHS:
+        os.remove(file_path)
+
+
+def test_does_not_use_pyarrow_engine_unless_turned_on(monkeypatch):
+    monkeypatch.setattr('mitosheet.step_performers.import_steps.simple_import.PYARROW_INSTALLED', True)
+    assert get_read_csv_engine(DEFAULT_DECIMAL, DEFAULT_SKIPROWS, True) is None
+
+    monkeypatch.setenv(MITO_CONFIG_VERSION, '2')
+    monkeypatch.setenv(MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE, 'True')
+    assert get_read_csv_engine(DEFAULT_DECIMAL, DEFAULT_SKIPROWS, True) == ('pyarrow' if not is_prev_version(pd.__version__, '1.4.0') else None)
+    assert get_read_csv_engine(',', DEFAULT_SKIPROWS, True) is None
+    assert get_read_csv_engine(DEFAULT_DECIMAL, 1, True) is None
+
+
+def test_imports_with_pyarrow_engine(monkeypatch):
+    pytest.importorskip('pyarrow')
+    if is_prev_version(pd.__version__, '1.4.0'):
+        pytest.skip('The pyarrow engine needs pandas 1.4.0')
+
+    monkeypatch.setenv(MITO_CONFIG_VERSION, '2')
+    monkeypatch.setenv(MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE, 'True')
+
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': ['a', 'b', 'c'], 'C': [1.5, 2.5, 3.5]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False)
+
+    mito = create_mito_wrapper()
+    mito.simple_import([TEST_FILE_PATHS[0]])
+
+    assert mito.dfs[0].equals(df)
+    assert mito.curr_step.execution_data['file_engines'] == ['pyarrow']
+    assert "engine='pyarrow'" in '\n'.join(mito.transpiled_code)
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_imports_latin_1_character_with_pyarrow_engine_as_string(monkeypatch):
+    pytest.importorskip('pyarrow')
+    if is_prev_version(pd.__version__, '1.4.0'):
+        pytest.skip('The pyarrow engine needs pandas 1.4.0')
+
+    monkeypatch.setenv(MITO_CONFIG_VERSION, '2')
+    monkeypatch.setenv(MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE, 'True')
+
+    # The pyarrow engine reads the column as bytes, as it cannot be decoded as utf-8
+    df = pd.DataFrame(data={'A': ['abc'] * 50000 + ['Ñ'] + ['abc'] * 50000, 'B': [1] * 100001})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';', encoding='latin-1')
+
+    mito = create_mito_wrapper()
+    mito.simple_import([TEST_FILE_PATHS[0]])
+
+    assert mito.dfs[0].equals(df)
+    assert mito.curr_step.execution_data['file_encodings'] == ['latin-1']
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_falls_back_to_default_engine_if_pyarrow_engine_fails(monkeypatch):
+    # Pretend pyarrow is installed, even if it is not, so the pyarrow engine fails
+    monkeypatch.setattr('mitosheet.step_performers.import_steps.simple_import.PYARROW_INSTALLED', True)
+    monkeypatch.setenv(MITO_CONFIG_VERSION, '2')
+    monkeypatch.setenv(MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE, 'True')
+    monkeypatch.setattr('mitosheet.step_performers.import_steps.simple_import.pd.read_csv', get_read_csv_that_fails_with_pyarrow_engine())
+
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False)
+
+    mito = create_mito_wrapper()
+    mito.simple_import([TEST_FILE_PATHS[0]])
+
+    assert mito.dfs[0].equals(df)
+    assert mito.curr_step.execution_data['file_engines'] == [None]
+    assert 'engine' not in '\n'.join(mito.transpiled_code)
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def get_read_csv_that_fails_with_pyarrow_engine():
+    read_csv = pd.read_csv
+    def read_csv_that_fails_with_pyarrow_engine(*args, **kwargs):
+        if kwargs.get('engine') == 'pyarrow':
+            raise ValueError('The pyarrow engine failed')
+        return read_csv(*args, **kwargs)
+    return read_csv_that_fails_with_pyarrow_engine
+
+
+def test_transpiles_engine():
+    code_chunk = SimpleImportCodeChunk(
+        State([], public_interface_version=3), ['file.csv', 'file2.csv'], [',', ';'], ['utf-8', 'utf-8'], ['.', '.'], [0, 0], [True, True], ['file', 'file2'], ['pyarrow', None]
+    )
+
+    assert code_chunk.get_code()[0] == [
+        "file = pd.read_csv(r'file.csv', engine='pyarrow')",
+        "file2 = pd.read_csv(r'file2.csv', sep=';')",
+    ]
+
+
 def test_transpiles_single_file():
     df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
     df.to_csv(TEST_FILE_PATHS[0], index=False)
@@ -272,6 +383,60 @@ def test_imports_with_latin_1():
         os.remove(TEST_FILE_PATHS[0])
 
 
+def test_imports_with_latin_1_character_only_at_end_of_large_file():
+    df = pd.DataFrame(data={'A': ['abc'] * 100000 + ['Ñ'], 'B': [1] * 100001})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';', encoding='latin-1')
+
+    mito = create_mito_wrapper()
+    mito.simple_import([TEST_FILE_PATHS[0]])
+
+    assert mito.dfs[0].equals(df)
+    assert mito.curr_step.execution_data['file_delimeters'] == [';']
+    assert mito.curr_step.execution_data['file_encodings'] == ['latin-1']
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_imports_with_latin_1_character_only_between_samples_of_large_file():
+    df = pd.DataFrame(data={'A': ['abc'] * 50000 + ['Ñ'] + ['abc'] * 50000, 'B': [1] * 100001})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';', encoding='latin-1')
+
+    # The samples we guess the encoding from are valid utf-8
+    assert get_csv_delimiter_and_encoding(TEST_FILE_PATHS[0]) == (';', 'utf-8')
+
+    mito = create_mito_wrapper()
+    mito.simple_import([TEST_FILE_PATHS[0]])
+
+    assert mito.dfs[0].equals(df)
+    assert mito.curr_step.execution_data['file_encodings'] == ['latin-1']
+    assert "encoding='latin-1'" in '\n'.join(mito.transpiled_code)
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_import_with_wrong_user_specified_encoding_fails():
+    df = pd.DataFrame(data={'A': ['abc', 'Ñ', 'abc'], 'B': [1, 2, 3]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, encoding='latin-1')
+
+    mito = create_mito_wrapper()
+    assert not mito.simple_import([TEST_FILE_PATHS[0]], [DEFAULT_DELIMITER], ['utf-8'], [DEFAULT_DECIMAL], [DEFAULT_SKIPROWS], [True])
+
+    assert len(mito.dfs) == 0
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_delimiter_and_encoding_guess_updates_when_file_changes():
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';')
+    assert get_csv_delimiter_and_encoding(TEST_FILE_PATHS[0]) == (';', 'utf-8')
+
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep='|', encoding='UTF-16')
+    assert get_csv_delimiter_and_encoding(TEST_FILE_PATHS[0]) == ('|', 'UTF-16')
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
 def test_can_import_mulitple_csvs_combined():
     df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
     df.to_csv(TEST_FILE_PATHS[0], index=False)
@@ -16,6 +16,7 @@ from mitosheet.tests.test_utils import check_dataframes_equal, create_mito_wrapp
 from mitosheet.tests.decorators import pandas_post_1_2_only, python_post_3_6_only
 from typing import Any
 from mitosheet.utils import PLAIN_TEXT, CURRENCY, PERCENTAGE, SCIENTIFIC_NOTATION, ACCOUNTING
+from mitosheet.excel_utils import get_column_from_column_index
 
 import pandas as pd
 from openpyxl import load_workbook
@@ -30,6 +31,9 @@ def get_cell_conditional_formatting(
     Note that because it doesn't actually execute the code, it can't get the
     conditional formatting for a cell that is generated by a conditional
     formatting rule -- so we just do our best.
+
+    The even and odd row formatting is also a conditional format, which
+    we skip here, see get_banded_row_formatting.
     """
     # Load the workbook using openpyxl
     wb = load_workbook(file_path)
@@ -37,6 +41,8 @@ def get_cell_conditional_formatting(
     sheet = wb[sheet_name]
     formats = []
     for conditional in sheet.conditional_formatting._cf_rules.items():
+        if conditional[1][0].formula[0].startswith('MOD(ROW(),2)'):
+            continue
         if conditional[0].__contains__(cell_address):
             background_color = conditional[1][0].dxf.fill
             font_color = conditional[1][0].dxf.font
@@ -46,6 +52,31 @@ def get_cell_conditional_formatting(
             ))
     return formats
 
+def get_banded_row_formatting(
+    file_path: str,
+    sheet_name: str,
+) -> Any:
+    """
+    Gets the range, and the even and odd row formatting, of the row formatting 
+    in a sheet in an excel file.
+    """
+    wb = load_workbook(file_path)
+
+    sheet = wb[sheet_name]
+    formats = []
+    for conditional in sheet.conditional_formatting._cf_rules.items():
+        for rule in conditional[1]:
+            if rule.formula[0].startswith('MOD(ROW(),2)'):
+                background_color = rule.dxf.fill
+                font_color = rule.dxf.font
+                formats.append((
+                    str(conditional[0].sqref),
+                    rule.formula[0],
+                    None if background_color is None else f'#{background_color.start_color.rgb[2:]}',
+                    None if font_color is None else f'#{font_color.color.rgb[2:]}'
+                ))
+    return formats
+
 DF_FORMAT_HEADER = {
     'headers': {
         'color': '#ffffff',
@@ -728,6 +759,10 @@ with pd.ExcelWriter(r\'test_format_conditional_and_rows.xlsx\', engine="openpyxl
     exec(df_code+"\n".join(mito.transpiled_code[:-2]))
     assert get_cell_conditional_formatting(index_to_check, filename, 'df') == [(background_color, font_color)]
     assert get_cell_conditional_formatting(index_not_formatted, filename, 'df') == []
+    assert get_banded_row_formatting(filename, 'df') == [
+        (f'A2:{get_column_from_column_index(len(df.columns) - 1)}{len(df) + 1}', 'MOD(ROW(),2)=0', '#000000', '#ffffff'),
+        (f'A2:{get_column_from_column_index(len(df.columns) - 1)}{len(df) + 1}', 'MOD(ROW(),2)=1', '#ffffff', '#000000'),
+    ]
 
 # This tests when the user exports two dataframes with both formatted.
 def test_transpiled_with_export_to_xlsx_format_two_sheets():
@@ -98,4 +98,22 @@ def test_sheet_json_holds_timed_deltas_non_standard_dtype():
     assert get_value_helper(sheet_data, 0, 0) == '31 days 00:00:00'
     assert get_value_helper(sheet_data, 1, 0) == '31 days 00:00:00'
     assert get_value_helper(sheet_data, 2, 0) == '31 days 00:00:00'
-    assert get_value_helper(sheet_data, 3, 0) == '31 days 00:00:00'
\ No newline at end of file
+    assert get_value_helper(sheet_data, 3, 0) == '31 days 00:00:00'
+
+COLUMNAR_JSON_TESTS = [
+    pd.DataFrame({'A': [1, 2, 3], 'B': [1.5, None, float('inf')], 'C': ['a', None, 'c']}),
+    pd.DataFrame({'A': pd.to_datetime(['2020-01-01', None, '2021-02-03']), 'B': pd.to_timedelta([1, None, 3], unit='d')}),
+    pd.DataFrame({'A': [True, False, True], 'B': pd.array([1, None, 3], dtype='Int64'), 'C': [[1], {'a': 1}, 'c']}),
+    pd.DataFrame({'A': [1, 2]}, index=pd.to_datetime(['2020-01-01', '2020-01-02'])),
+    pd.DataFrame({'A': [1 / 3, 1e17 + 3, -0.0]}, index=pd.MultiIndex.from_tuples([(1, 'x'), (2, 'y'), (3, 'z')])),
+]
+@pytest.mark.parametrize("df", COLUMNAR_JSON_TESTS)
+@pytest.mark.parametrize("window", [{}, {'max_rows': 2}, {'start_row': 1, 'max_rows': 1}, {'start_column': 1, 'max_columns': 1}])
+def test_columnar_json_matches_row_json(df, window):
+    from mitosheet.utils import convert_df_to_parsed_columnar_json, convert_df_to_parsed_json
+
+    row_json = convert_df_to_parsed_json(df, **window)
+    columnar_json = convert_df_to_parsed_columnar_json(df, **window)
+
+    assert columnar_json['index'] == row_json['index']
+    assert [[column[i] for column in columnar_json['data']] for i in range(len(columnar_json['index']))] == row_json['data']
@@ -18,6 +18,8 @@ from mitosheet.enterprise.mito_config import (
     MITO_CONFIG_CODE_SNIPPETS_URL, 
     MITO_CONFIG_CODE_SNIPPETS_VERSION,
     MITO_CONFIG_CUSTOM_IMPORTERS_PATH,
+    MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB,
+    MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE,
     MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH,
     MITO_CONFIG_DISABLE_TOURS,
     MITO_CONFIG_ENTERPRISE,
@@ -34,7 +36,8 @@ from mitosheet.enterprise.mito_config import (
     MITO_CONFIG_FEATURE_DISPLAY_CODE_OPTIONS,
     MITO_CONFIG_FEATURE_TELEMETRY,
     MITO_CONFIG_PRO,
-    MitoConfig
+    MitoConfig,
+    get_mito_config
 )
 from mitosheet.tests.test_utils import create_mito_wrapper
 
@@ -88,7 +91,9 @@ def test_none_works():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB: None,
+        MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE: False
     }
 
 def test_none_config_version_is_string():
@@ -132,7 +137,9 @@ def test_version_2_works():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB: None,
+        MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE: False
     }
 
     # Delete the environmnet variables for the next test
@@ -163,7 +170,9 @@ def test_mito_config_update_version_1_to_2():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB: None,
+        MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE: False
     }    
 
     # Delete the environmnet variables for the next test
@@ -194,7 +203,9 @@ def test_mito_config_enable_snowflake_import():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB: None,
+        MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE: False
     }    
 
     delete_all_mito_config_environment_variables()
@@ -227,7 +238,9 @@ def test_mito_config_dont_display_features():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB: None,
+        MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE: False
     }    
 
     delete_all_mito_config_environment_variables()
@@ -337,3 +350,32 @@ def test_mito_config_log_server_url():
     delete_all_mito_config_environment_variables()
 
 
+def test_mito_config_step_history_memory_limit():
+    
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB] = "100"
+    assert MitoConfig().step_history_memory_limit_mb == 100
+
+    # Invalid limits are ignored
+    for invalid_limit in ["100MB", "", "-1"]:
+        os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB] = invalid_limit
+        assert MitoConfig().step_history_memory_limit_mb is None
+
+    delete_all_mito_config_environment_variables()
+
+
+
+def test_get_mito_config_reuses_config_until_environment_variables_change():
+    delete_all_mito_config_environment_variables()
+    mito_config = get_mito_config()
+    assert get_mito_config() is mito_config
+
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_SUPPORT_EMAIL] = "support@mito.com"
+    new_mito_config = get_mito_config()
+    assert new_mito_config is not mito_config
+    assert new_mito_config.support_email == "support@mito.com"
+    assert get_mito_config() is new_mito_config
+
+    delete_all_mito_config_environment_variables()
+    assert get_mito_config().support_email == DEFAULT_MITO_CONFIG_SUPPORT_EMAIL
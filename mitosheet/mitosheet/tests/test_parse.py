@@ -10,7 +10,7 @@ import pytest
 import pandas as pd
 
 from mitosheet.errors import MitoError
-from mitosheet.parser import get_backend_formula_from_frontend_formula, parse_formula, safe_contains, get_frontend_formula
+from mitosheet.parser import get_backend_formula_from_frontend_formula, get_column_header_trie, get_raw_parser_matches, get_string_matches, parse_formula, safe_contains, get_frontend_formula
 from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE, FORMULA_SPECIFIC_INDEX_LABELS_TYPE
 from mitosheet.tests.decorators import pandas_post_1_2_only
 
@@ -1448,4 +1448,28 @@ def test_get_frontend_formula_reconstucts_properly(formula,column_header,formula
 @pytest.mark.parametrize("formula,column_header,formula_label,dfs,df_names,sheet_index,python_code,functions,columns", VLOOKUP_TESTS)
 def test_get_cross_sheet_frontend_formula_reconstucts_properly(formula,column_header,formula_label,dfs,df_names,sheet_index,python_code,functions,columns):
     frontend_formula = get_frontend_formula(formula, formula_label, dfs, df_names, sheet_index)
-    assert get_backend_formula_from_frontend_formula(frontend_formula, formula_label, dfs[sheet_index]) == formula
\ No newline at end of file
+    assert get_backend_formula_from_frontend_formula(frontend_formula, formula_label, dfs[sheet_index]) == formula
+
+
+RAW_PARSER_MATCHES_TESTS = [
+    # Longer column headers are matched before the column headers they contain
+    ('=aa + a', ['a', 'aa'], [('{HEADER}', (1, 3), 'aa'), ('{HEADER}', (6, 7), 'a')]),
+    # Matches of the same column header do not overlap
+    ('=aaa', ['aa', 'aaa'], [('{HEADER}', (1, 4), 'aaa')]),
+    ('=aa+aa', ['aa'], [('{HEADER}', (1, 3), 'aa'), ('{HEADER}', (4, 6), 'aa')]),
+    # Booleans are matched how they are displayed
+    ('=true + 2', [True, 2], [('{HEADER}', (1, 5), True), ('{HEADER}', (8, 9), 2)]),
+    # Column headers in strings are not matched
+    ('="a" & a', ['a'], [('{HEADER}', (7, 8), 'a')]),
+]
+@pytest.mark.parametrize("formula,column_headers,matches", RAW_PARSER_MATCHES_TESTS)
+def test_get_raw_parser_matches(formula, column_headers, matches):
+    df = pd.DataFrame(get_number_data_for_df(column_headers, 2))
+    raw_parser_matches = get_raw_parser_matches(formula, 0, get_string_matches(formula), [df], ['df'], 0)
+    assert [(match['type'], match['substring_range'], match['parsed']) for match in raw_parser_matches] == matches
+
+
+def test_column_header_trie_is_cached_by_column_header_types():
+    assert get_column_header_trie(('A', 'B'), (str, str)) is get_column_header_trie(('A', 'B'), (str, str))
+    assert get_column_header_trie((True,), (bool,))[0] == [True]
+    assert get_column_header_trie((1,), (int,))[1] == {'1': {'': [0]}}
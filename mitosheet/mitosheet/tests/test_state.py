@@ -29,3 +29,23 @@ def test_state_can_add_df_to_middle():
     
     assert state.df_sources == [DATAFRAME_SOURCE_IMPORTED]
 
+
+def test_state_copy_does_not_change_original():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    state = State([df], 3)
+    column_id = state.column_ids.get_column_ids(0)[0]
+    state.column_formulas[0][column_id] = [{'frontend_formula': '=1', 'location': {'type': 'entire_column'}, 'index': [0, 1, 2]}]
+    state.graph_data_array.append({'graph_id': 'abc', 'graph_tab_name': 'graph0'})
+
+    new_state = state.copy(deep_sheet_indexes=[0])
+    new_state.dfs[0].loc[0, 'A'] = 100
+    new_state.column_formulas[0][column_id].append({'frontend_formula': '=2', 'location': {'type': 'entire_column'}, 'index': [0, 1, 2]})
+    new_state.column_filters[0][column_id]['filters'].append({'condition': 'not_empty', 'value': ''})
+    new_state.df_names[0] = 'new_name'
+    del new_state.graph_data_array[0]
+
+    assert state.dfs[0]['A'].tolist() == [1, 2, 3]
+    assert len(state.column_formulas[0][column_id]) == 1
+    assert state.column_filters[0][column_id]['filters'] == []
+    assert state.df_names == ['df1']
+    assert state.graph_data_array == [{'graph_id': 'abc', 'graph_tab_name': 'graph0'}]
@@ -3,15 +3,21 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import os
+import pickle
+from random import Random
+import numpy as np
 import pandas as pd
 import pytest
-from mitosheet.enterprise.mito_config import MitoConfig
-from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE
+from mitosheet.enterprise.mito_config import MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB, MITO_CONFIG_VERSION, MitoConfig
+from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE, FORMULA_SPECIFIC_INDEX_LABELS_TYPE
 
 from mitosheet.utils import get_new_id
 from mitosheet.errors import MitoError
+from mitosheet.step import Step, StepIndexesToSkipCache
 from mitosheet.steps_manager import StepsManager
-from mitosheet.tests.test_utils import create_mito_wrapper_with_data
+from mitosheet.tests.test_mito_config import delete_all_mito_config_environment_variables
+from mitosheet.tests.test_utils import create_mito_wrapper, create_mito_wrapper_with_data
 from mitosheet.column_headers import get_column_header_id
 
 
@@ -104,3 +110,153 @@ def test_failed_overwrite_rolls_back_to_previous_state():
     assert mito.dfs[0].equals(pd.DataFrame(data={'A': [1, 2, 3], 'B': [0, 0, 0]}))
 
 
+
+
+def test_overwriting_step_reuses_later_steps_on_other_sheets():
+    df1 = pd.DataFrame(data={'A': [1, 2, 3]})
+    df2 = pd.DataFrame(data={'B': [3, 2, 1]})
+    mito = create_mito_wrapper(df1, df2)
+    mito.add_column(0, 'C')
+    mito.sort(1, 'B', 'ascending')
+    mito.set_cell_value(0, 'A', 0, 10)
+
+    sorted_df = mito.mito_backend.steps_manager.steps_including_skipped[2].post_state.dfs[1]
+
+    mito.mito_backend.receive_message({
+        'event': 'edit_event',
+        'id': get_new_id(),
+        'type': 'add_column_edit',
+        'step_id': mito.mito_backend.steps_manager.steps_including_skipped[1].step_id,
+        'params': {
+            'sheet_index': 0,
+            'column_header': 'D',
+            'column_header_index': 1
+        }
+    })
+
+    # The sort on the second sheet is reused, but the set cell value on the first sheet is reexecuted
+    assert mito.mito_backend.steps_manager.steps_including_skipped[2].post_state.dfs[1] is sorted_df
+    assert mito.dfs[0].equals(pd.DataFrame(data={'A': [10, 2, 3], 'D': [0, 0, 0]}))
+    assert mito.dfs[1].equals(pd.DataFrame(data={'B': [1, 2, 3]}, index=[2, 1, 0]))
+    assert mito.mito_backend.steps_manager.curr_step.column_ids.column_header_to_column_id[0].keys() == {'A', 'D'}
+
+
+def test_step_history_memory_limit_evicts_and_recomputes_states():
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB] = "0"
+
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    for value in range(4):
+        mito.set_cell_value(0, 'A', 0, value)
+
+    # NOTE: the test wrapper transpiles after each edit, which recomputes evicted states, so we evict again
+    mito.mito_backend.steps_manager.evict_states_over_memory_limit()
+    steps = mito.mito_backend.steps_manager.steps_including_skipped
+    # The initial and final states are kept, and the rest are evicted
+    assert [step.post_state.dfs_evicted for step in steps] == [False, True, True, True, False]
+    assert steps[2].post_state.dfs[0]['A'].tolist() == [1, 2, 3]
+
+    mito.undo()
+    mito.undo()
+    assert mito.dfs[0]['A'].tolist() == [1, 2, 3]
+
+    mito.redo()
+    assert mito.dfs[0]['A'].tolist() == [2, 2, 3]
+
+    delete_all_mito_config_environment_variables()
+
+
+def test_step_history_memory_limit_does_not_evict_recomputed_states_again():
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB] = "0"
+
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    for value in range(4):
+        mito.set_cell_value(0, 'A', 0, value)
+    mito.mito_backend.steps_manager.evict_states_over_memory_limit()
+
+    steps = mito.mito_backend.steps_manager.steps_including_skipped
+    assert steps[2].post_state.dfs[0]['A'].tolist() == [1, 2, 3]
+    
+    # Recomputing the third state recomputes the second state it is executed on as well, and 
+    # neither of these are evicted again
+    mito.mito_backend.steps_manager.evict_states_over_memory_limit()
+    assert [step.post_state.dfs_evicted for step in steps] == [False, False, False, True, False]
+
+    delete_all_mito_config_environment_variables()
+
+
+def test_step_history_memory_limit_evicted_states_can_be_pickled():
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB] = "0"
+
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    for value in range(4):
+        mito.set_cell_value(0, 'A', 0, value)
+    mito.mito_backend.steps_manager.evict_states_over_memory_limit()
+
+    steps_manager = pickle.loads(pickle.dumps(mito.mito_backend.steps_manager))
+    steps = steps_manager.steps_including_skipped
+    assert steps[2].post_state.dfs_evicted
+    assert steps[2].post_state.dfs[0]['A'].tolist() == [1, 2, 3]
+
+    delete_all_mito_config_environment_variables()
+
+
+def get_random_step(random: Random) -> Step:
+    step_type = random.choice(['filter_column', 'set_column_formula', 'pivot', 'add_column'])
+    params = {'sheet_index': random.randint(0, 1), 'column_id': random.choice(['A', 'B'])}
+    if step_type == 'set_column_formula':
+        params['index_labels_formula_is_applied_to'] = random.choice([
+            {'type': FORMULA_ENTIRE_COLUMN_TYPE},
+            {'type': FORMULA_SPECIFIC_INDEX_LABELS_TYPE, 'index_labels': random.choice([[0], [1]])}
+        ])
+    return Step(step_type, random.choice(['1', '2', '3', '4']), params)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_step_indexes_to_skip_cache_same_as_skipping_from_each_step(seed):
+    random = Random(seed)
+    step_indexes_to_skip_cache = StepIndexesToSkipCache()
+    steps = [Step('initialize', 'initialize', {})]
+
+    for _ in range(200):
+        # Add or undo a few steps, like editing the analysis does
+        if random.random() < 0.3:
+            steps = steps[:random.randint(1, len(steps))]
+        else:
+            steps = steps + [get_random_step(random) for _ in range(random.randint(1, 3))]
+
+        expected_step_indexes_to_skip = set()
+        for step_index, step in enumerate(steps):
+            expected_step_indexes_to_skip.update(step.step_indexes_to_skip(steps[:step_index]))
+
+        assert step_indexes_to_skip_cache.get_step_indexes_to_skip(steps) == expected_step_indexes_to_skip
+
+
+def test_steps_manager_keeps_one_copy_of_passed_dataframes():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+
+    assert not np.shares_memory(mito.dfs[0]['A'].to_numpy(), df['A'].to_numpy())
+    assert len(mito.mito_backend.steps_manager.original_args[0]) == 0
+    assert mito.mito_backend.steps_manager.original_args[0].columns.tolist() == ['A']
+
+
+def test_steps_manager_does_not_copy_passed_dataframes_with_copy_on_write():
+    try:
+        pd.get_option('mode.copy_on_write')
+    except (KeyError, pd.errors.OptionError):
+        pytest.skip('Copy on write is not supported in this version of pandas')
+
+    with pd.option_context('mode.copy_on_write', True):
+        df = pd.DataFrame({'A': [1, 2, 3]})
+        mito = create_mito_wrapper(df)
+        assert np.shares_memory(mito.dfs[0]['A'].to_numpy(), df['A'].to_numpy())
+
+        # Changing the passed dataframe does not change the sheet, and the other way around
+        df.loc[0, 'A'] = 100
+        assert mito.dfs[0]['A'].tolist() == [1, 2, 3]
+        mito.set_cell_value(0, 'A', 1, 200)
+        assert df['A'].tolist() == [100, 2, 3]
+        assert mito.dfs[0]['A'].tolist() == [1, 200, 3]
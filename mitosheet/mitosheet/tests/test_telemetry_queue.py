@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the telemetry queue, which sends logs
+from a background thread.
+"""
+
+import time
+from unittest.mock import patch
+
+from mitosheet.telemetry.telemetry_queue import TelemetryQueue
+from mitosheet.telemetry.telemetry_utils import _send_logs
+
+
+def test_telemetry_queue_sends_logs_in_order_in_one_batch():
+    batches = []
+    telemetry_queue = TelemetryQueue(batches.append, flush_interval=0.1)
+
+    for i in range(5):
+        assert telemetry_queue.put(i)
+
+    start = time.time()
+    while len(batches) == 0 and time.time() - start < 5:
+        time.sleep(0.01)
+
+    assert batches == [[0, 1, 2, 3, 4]]
+
+def test_telemetry_queue_drops_logs_when_full():
+    batches = []
+    # A long flush interval, so the logs are only sent when we flush
+    telemetry_queue = TelemetryQueue(batches.append, max_queued_logs=2, flush_interval=60)
+
+    assert telemetry_queue.put(0)
+    assert telemetry_queue.put(1)
+    assert not telemetry_queue.put(2)
+    assert telemetry_queue.num_dropped_logs == 1
+
+    telemetry_queue.flush()
+    assert batches == [[0, 1]]
+
+def test_telemetry_queue_not_threaded_sends_logs_immediately():
+    batches = []
+    telemetry_queue = TelemetryQueue(batches.append, threaded=False)
+
+    telemetry_queue.put(0)
+    assert batches == [[0]]
+    assert telemetry_queue.flush_thread is None
+
+def test_telemetry_queue_ignores_errors_sending_logs():
+    def send_logs(logs):
+        raise Exception('Cannot reach server')
+
+    telemetry_queue = TelemetryQueue(send_logs, threaded=False)
+    assert telemetry_queue.put(0)
+    assert telemetry_queue.queued_logs.empty()
+
+def test_send_logs_posts_to_analytics_url_and_ignores_errors():
+    with patch('requests.Session.post', side_effect=Exception('Cannot reach server')) as mock_post:
+        _send_logs([
+            ('user_id', 'event_one', {}, 'https://url'),
+            ('user_id', 'event_two', {}, None),
+            ('user_id', 'event_three', {}, 'https://url'),
+        ])
+
+    assert [call[1]['json'] for call in mock_post.call_args_list] == [
+        {'user_id': 'user_id', 'log_event': 'event_one'},
+        {'user_id': 'user_id', 'log_event': 'event_three'},
+    ]
@@ -5,11 +5,12 @@
 # Distributed under the terms of the GPL License.
 import os
 from mitosheet.step_performers.graph_steps.graph_utils import BAR
-from mitosheet.transpiler.transpile_utils import NEWLINE_TAB, TAB, NEWLINE
+from mitosheet.transpiler.transpile_utils import NEWLINE_TAB, TAB, NEWLINE, get_compiled_code, get_globals_for_exec
 import pytest
 import pandas as pd
 
 from mitosheet.api.get_parameterizable_params import get_parameterizable_params
+from mitosheet.code_chunks.code_chunk_utils import get_code_chunks
 from mitosheet.transpiler.transpile import transpile
 from mitosheet.tests.test_utils import create_mito_wrapper_with_data, create_mito_wrapper
 from mitosheet.tests.decorators import pandas_post_1_2_only, python_post_3_6_only
@@ -1306,4 +1307,66 @@ def test_does_not_reorder_around_empty_code_chunk():
     mito.delete_columns(0, ['A', 'B'])
     result = mito.generate_graph('test', BAR, 0, False, ['C'], [], '400', '400')
     assert result
-    assert mito.dfs[0].equals(pd.DataFrame({'C': [3], 'D': [0]}))
\ No newline at end of file
+    assert mito.dfs[0].equals(pd.DataFrame({'C': [3], 'D': [0]}))
+
+def test_get_globals_for_exec_does_not_share_dataframes_between_states():
+    df1 = pd.DataFrame({'A': [1]})
+    df2 = pd.DataFrame({'A': [2]})
+    mito = create_mito_wrapper(df1)
+    state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+
+    exec_globals = get_globals_for_exec(state, 3)
+    assert exec_globals['df1'] is state.dfs[0]
+    assert 'SUM' in exec_globals
+
+    other_state = state.copy()
+    other_state.dfs[0] = df2
+    assert get_globals_for_exec(other_state, 3)['df1'] is df2
+    assert exec_globals['df1'] is state.dfs[0]
+
+
+def test_compiled_code_is_reused():
+    assert get_compiled_code("df1['B'] = 0") is get_compiled_code("df1['B'] = 0")
+
+
+def test_transpile_cache_gives_same_code_as_optimizing_all_code_chunks():
+    df1 = pd.DataFrame({'A': [1, 2, 3]})
+    df2 = pd.DataFrame({'A': [4, 5, 6]})
+    mito = create_mito_wrapper(df1, df2)
+    steps_manager = mito.mito_backend.steps_manager
+
+    def check_code():
+        all_steps = steps_manager.steps_including_skipped[:steps_manager.curr_step_idx + 1]
+        assert [code_chunk.get_code() for code_chunk in get_code_chunks(all_steps, optimized_code_chunks_cache=steps_manager.optimized_code_chunks_cache)] == \
+            [code_chunk.get_code() for code_chunk in get_code_chunks(all_steps)]
+
+    mito.add_column(0, 'B')
+    check_code()
+    mito.set_formula('=A + 1', 0, 'B')
+    check_code()
+    mito.duplicate_dataframe(0)
+    mito.add_column(2, 'C')
+    check_code()
+    mito.undo()
+    check_code()
+    mito.redo()
+    check_code()
+    mito.delete_dataframe(2)
+    check_code()
+    mito.rename_column(1, 'A', 'D')
+    mito.delete_columns(0, ['B'])
+    check_code()
+
+
+def test_step_code_chunks_are_cached_until_step_is_executed():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B')
+
+    set_formula_step = mito.steps_including_skipped[2]
+    code_chunks = set_formula_step.get_code_chunks()
+    assert mito.transpiled_code == mito.transpiled_code
+    assert set_formula_step.get_code_chunks() is code_chunks
+
+    set_formula_step.set_prev_state_and_execute(set_formula_step.prev_state, mito.steps_including_skipped[:2])
+    assert set_formula_step.get_code_chunks() is not code_chunks
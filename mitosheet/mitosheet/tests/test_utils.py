@@ -54,11 +54,15 @@ def check_dataframes_equal(test_wrapper: "MitoWidgetTestWrapper") -> None:
 
     # The only dataframes we want to define apriori are the dataframes that
     # were passed directly to the mito widget
+    # NOTE: the steps manager does not keep the rows of the dataframes that were
+    # passed, so we take them from the initial state instead
+    initial_step = test_wrapper.mito_backend.steps_manager.steps_including_skipped[0]
     original_args = {
-        arg_name: arg.copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg) for arg, arg_name in 
+        arg_name: df.copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg) for arg, arg_name, df in 
         zip(
             test_wrapper.mito_backend.steps_manager.original_args,
-            test_wrapper.mito_backend.steps_manager.steps_including_skipped[0].df_names
+            initial_step.df_names,
+            initial_step.dfs
         )
     }
     final_dfs = {
@@ -7,6 +7,7 @@
 Contains tests for the user.json file, making sure it upgrades properly,
 and that it can handle the various undefined versions of user.json that exist.
 """
+import json
 import os
 from copy import deepcopy
 import subprocess
@@ -15,7 +16,7 @@ from mitosheet.experiments.experiment_utils import get_new_experiment
 from mitosheet.utils import get_random_id
 from mitosheet._version import __version__
 from mitosheet.user.schemas import UJ_EXPERIMENT, UJ_MITOSHEET_PRO, UJ_MITOSHEET_TELEMETRY, USER_JSON_VERSION_1, USER_JSON_VERSION_2, USER_JSON_VERSION_3
-from mitosheet.user.db import USER_JSON_PATH, get_user_field
+from mitosheet.user.db import USER_JSON_PATH, get_user_field, get_user_json_object, set_user_field
 from mitosheet.user import initialize_user
 from mitosheet.tests.user.conftest import check_user_json, write_fake_user_json, today_str
 from mitosheet.user.schemas import (
@@ -299,4 +300,30 @@ def test_experiments_in_sync():
     import sys
     sys.path.insert(0, '../mitoinstaller')
     from mitoinstaller.experiments.experiment_utils import get_new_experiment as get_new_experiment_from_mitoinstaller
-    assert get_new_experiment_from_mitoinstaller()['experiment_id'] == get_new_experiment()['experiment_id']
\ No newline at end of file
+    assert get_new_experiment_from_mitoinstaller()['experiment_id'] == get_new_experiment()['experiment_id']
+def test_get_user_field_reads_changes_to_user_json():
+    initialize_user()
+    user_id = get_user_field(UJ_STATIC_USER_ID)
+
+    # Changes written through set_user_field are read
+    set_user_field(UJ_USER_EMAIL, 'one@mito.com')
+    assert get_user_field(UJ_USER_EMAIL) == 'one@mito.com'
+
+    # As are changes written to the file directly
+    user_json = get_user_json_object()
+    user_json[UJ_USER_EMAIL] = 'much_longer_email@mito.com'
+    with open(USER_JSON_PATH, 'w+') as f:
+        f.write(json.dumps(user_json))
+    assert get_user_field(UJ_USER_EMAIL) == 'much_longer_email@mito.com'
+    assert get_user_field(UJ_STATIC_USER_ID) == user_id
+
+    os.remove(USER_JSON_PATH)
+    assert get_user_field(UJ_STATIC_USER_ID) is None
+
+def test_modifying_user_field_does_not_change_user_json():
+    initialize_user()
+    get_user_field(UJ_FEEDBACKS).append('not saved')
+    get_user_json_object()[UJ_FEEDBACKS].append('not saved')
+
+    assert 'not saved' not in get_user_field(UJ_FEEDBACKS)
+    os.remove(USER_JSON_PATH)
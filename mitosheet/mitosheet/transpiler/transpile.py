@@ -62,7 +62,11 @@ def transpile(
         imports_code.extend(preprocess_imports)
 
     # We only transpile up to the currently checked out step
-    all_code_chunks: List[CodeChunk] = get_code_chunks(steps_manager.steps_including_skipped[:steps_manager.curr_step_idx + 1], optimize=optimize)
+    all_code_chunks: List[CodeChunk] = get_code_chunks(
+        steps_manager.steps_including_skipped[:steps_manager.curr_step_idx + 1], 
+        optimize=optimize, 
+        optimized_code_chunks_cache=steps_manager.optimized_code_chunks_cache
+    )
 
     # We also make sure to include all the post_processing code chunks, which are those
     # code chunks that are always at the end of the dataframe
@@ -77,7 +81,7 @@ def transpile(
         # Make sure to not generate comments or code for steps with no code 
         if len(gotten_code) > 0:
             if add_comments:
-                gotten_code.insert(0, comment)
+                code.append(comment)
             code.extend(gotten_code)
             code.extend(optional_code)
 
@@ -5,8 +5,10 @@
 # Distributed under the terms of the GPL License.
 
 from copy import copy
+from functools import lru_cache
 import inspect
 import re
+from types import CodeType
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from collections import OrderedDict
 
@@ -375,6 +377,33 @@ def get_default_code_options(analysis_name: str) -> CodeOptions:
     }
 
 
+# The globals exported by each public interface, which we only collect once
+_public_interface_globals: Dict[int, Dict[str, Any]] = {}
+
+def get_public_interface_globals(public_interface: int) -> Dict[str, Any]:
+    """
+    Returns the global variables exported by the public interface with the 
+    given version. Do not modify the returned dictionary, as it is shared.
+    """
+    if public_interface not in _public_interface_globals:
+        if public_interface == 1:
+            import mitosheet.public.v1 as v1
+            public_interface_globals = v1.__dict__
+        elif public_interface == 2:
+            import mitosheet.public.v2 as v2
+            public_interface_globals = v2.__dict__
+        elif public_interface == 3:
+            import mitosheet.public.v3 as v3
+            public_interface_globals = v3.__dict__
+        else:
+            import mitosheet as original
+            public_interface_globals = original.__dict__
+
+        _public_interface_globals[public_interface] = dict(public_interface_globals)
+
+    return _public_interface_globals[public_interface]
+
+
 def get_globals_for_exec(state: State, public_interface: int) -> Dict[str, Any]:
     """
     Anytime you are exec'ing transpiled code, you need to pass some global variables including:
@@ -392,26 +421,13 @@ def get_globals_for_exec(state: State, public_interface: int) -> Dict[str, Any]:
             state.df_names
         )
     }
-    
-    if public_interface == 1:
-        import mitosheet.public.v1 as v1
-        local_vars = v1.__dict__
-    elif public_interface == 2:
-        import mitosheet.public.v2 as v2
-        local_vars = v2.__dict__
-    elif public_interface == 3:
-        import mitosheet.public.v3 as v3
-        local_vars = v3.__dict__
-    else:
-        import mitosheet as original
-        local_vars = original.__dict__
 
     user_defined_functions = state.user_defined_functions
     user_defined_importers = state.user_defined_importers
     user_defined_editors = state.user_defined_editors
 
     local_vars = {
-        **local_vars,
+        **get_public_interface_globals(public_interface),
         **df_names_to_df,
         **{f.__name__: f for f in user_defined_functions},
         **{f.__name__: f for f in user_defined_importers},
@@ -419,3 +435,13 @@ def get_globals_for_exec(state: State, public_interface: int) -> Dict[str, Any]:
     }
 
     return local_vars
+
+
+@lru_cache(maxsize=1000)
+def get_compiled_code(code: str) -> CodeType:
+    """
+    Returns the code compiled so that it can be exec'ed. As executing the same
+    steps generates the same code, we cache the compiled code so that replaying
+    an analysis does not compile the same code over and over again.
+    """
+    return compile(code, '<string>', 'exec')
@@ -9,32 +9,66 @@ Helpers for accessing the user.json file
 """
 import os
 import json
-from typing import Any, Dict, Optional
+import threading
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple
 from mitosheet.save_paths import MITO_FOLDER
 
 # The path of the user.json file
 USER_JSON_PATH = os.path.join(MITO_FOLDER, 'user.json')
 
-def get_user_json_object() -> Optional[Dict[str, Any]]:
+# The last user.json object we read, along with the stats of the file when we read 
+# it, so that we only read and parse the file again if it has changed
+_cached_user_json: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+_cached_user_json_lock = threading.Lock()
+
+
+def _get_cached_user_json_object() -> Optional[Dict[str, Any]]:
     """
-    Gets the entire user json object
+    Returns the user json object, only reading user.json if it has changed since
+    we last read it. The returned object is shared, and so must not be modified.
     """
+    global _cached_user_json
+
     try:
-        with open(USER_JSON_PATH) as f:
-            return json.load(f)
-    except: 
+        stat = os.stat(USER_JSON_PATH)
+        file_key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        with _cached_user_json_lock:
+            if _cached_user_json is not None and _cached_user_json[0] == file_key:
+                return _cached_user_json[1]
+
+            with open(USER_JSON_PATH) as f:
+                user_json_object = json.load(f)
+            _cached_user_json = (file_key, user_json_object)
+            return user_json_object
+    except:
         return None
 
+
+def _clear_cached_user_json_object() -> None:
+    global _cached_user_json
+    with _cached_user_json_lock:
+        _cached_user_json = None
+
+
+def get_user_json_object() -> Optional[Dict[str, Any]]:
+    """
+    Gets the entire user json object
+    """
+    user_json_object = _get_cached_user_json_object()
+    return deepcopy(user_json_object) if user_json_object is not None else None
+
 def get_user_field(field: str) -> Optional[Any]:
     """
     Returns the value stored at field in the user.json file,
     but may read a different file if it passed
     """
-    try:
-        with open(USER_JSON_PATH) as f:
-            return json.load(f)[field]
-    except: 
+    user_json_object = _get_cached_user_json_object()
+    if user_json_object is None or not isinstance(user_json_object, dict) or field not in user_json_object:
         return None
+    # We copy the value, so that modifying it does not modify the cached object
+    return deepcopy(user_json_object[field])
 
 def set_user_json_object(user_json_object: Dict[str, Any]) -> None:
     """
@@ -42,6 +76,7 @@ def set_user_json_object(user_json_object: Dict[str, Any]) -> None:
     """
     with open(USER_JSON_PATH, 'w+') as f:
         f.write(json.dumps(user_json_object))
+    _clear_cached_user_json_object()
 
 def set_user_field(field: str, value: Any) -> None:
     """
@@ -52,3 +87,4 @@ def set_user_field(field: str, value: Any) -> None:
         old_user_json[field] = value
         with open(USER_JSON_PATH, 'w+') as f:
             f.write(json.dumps(old_user_json))
+    _clear_cached_user_json_object()
@@ -6,6 +6,7 @@
 """
 Contains helpful utility functions
 """
+import datetime
 import json
 import pprint
 from random import randint
@@ -18,9 +19,12 @@ import keyword
 
 import numpy as np
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 
 from mitosheet.column_headers import ColumnIDMap, get_column_header_display
-from mitosheet.is_type_utils import get_float_dt_td_columns, is_int_dtype
+from mitosheet.is_type_utils import get_float_dt_td_columns, is_datetime_dtype, is_int_dtype, is_timedelta_dtype
 from mitosheet.types import (FC_BOOLEAN_IS_FALSE, FC_BOOLEAN_IS_TRUE, FC_DATETIME_EXACTLY, FC_DATETIME_GREATER, FC_DATETIME_GREATER_THAN_OR_EQUAL, FC_DATETIME_LESS,
         FC_DATETIME_LESS_THAN_OR_EQUAL, FC_DATETIME_NOT_EXACTLY, FC_EMPTY,
         FC_LEAST_FREQUENT, FC_MOST_FREQUENT, FC_NOT_EMPTY, FC_NUMBER_EXACTLY,
@@ -34,7 +38,9 @@ from mitosheet.types import (FC_BOOLEAN_IS_FALSE, FC_BOOLEAN_IS_TRUE, FC_DATETIM
         FrontendFormulaAndLocation, StateType)
 from mitosheet.excel_utils import get_df_name_as_valid_sheet_name
 
-from mitosheet.public.v3.formatting import add_formatting_to_excel_sheet
+from mitosheet.public.v3.formatting import (
+    add_banded_row_formats, add_conditional_formats, add_formatting_to_excel_sheet,
+    get_column_number_formats, get_header_font_and_fill)
 
 # We only send the first 1500 rows of a dataframe; note that this
 # must match this variable defined on the front-end
@@ -46,6 +52,15 @@ ACCOUNTING = 'accounting'
 PERCENTAGE = 'percentage'
 SCIENTIFIC_NOTATION = 'scientific notation'
 
+# The most rows and columns that an excel sheet can have
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLUMNS = 16_384
+# The number of rows we convert at once when streaming a dataframe into an excel file
+EXCEL_WRITE_CHUNK_NUM_ROWS = 10_000
+# The number formats that df.to_excel gives datetimes and dates
+EXCEL_DATETIME_NUMBER_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+EXCEL_DATE_NUMBER_FORMAT = 'YYYY-MM-DD'
+
 def get_first_unused_dataframe_name(existing_df_names: List[str], new_dataframe_name: str) -> str:
     """
     Appends _1, _2, .. to df name until it finds an unused 
@@ -245,6 +260,12 @@ def write_to_excel(
     state: Any,
     allow_formatting:bool=True
 ) -> None:
+    # We stream the dataframes into the file with their formatting, so that exporting
+    # does not hold the whole workbook in memory
+    if all(can_write_df_to_excel_write_only(state.dfs[sheet_index]) for sheet_index in sheet_indexes):
+        write_to_excel_write_only(path, sheet_indexes, state, allow_formatting=allow_formatting)
+        return
+
     with pd.ExcelWriter(path, engine="openpyxl") as writer:
         for sheet_index in sheet_indexes:
             # Get the dataframe and sheet name
@@ -276,6 +297,170 @@ def write_to_excel(
                     conditional_formats=conditional_formats,
                     number_formats=get_number_formats_objects_to_export_to_excel(df, format.get('columns'))
                 )
+
+
+def can_write_df_to_excel_write_only(df: pd.DataFrame) -> bool:
+    """
+    Returns True if the dataframe can be written by write_to_excel_write_only. Otherwise, it
+    must be written with df.to_excel, which also gives a helpful error if it cannot be written.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        return False
+    
+    if len(df.index) + 1 > EXCEL_MAX_ROWS or len(df.columns) > EXCEL_MAX_COLUMNS:
+        return False
+
+    return all(isinstance(column_header, (str, int, float, np.number)) for column_header in df.columns)
+
+
+def write_to_excel_write_only(
+    path: Any,
+    sheet_indexes: list,
+    state: Any,
+    allow_formatting: bool=False
+) -> None:
+    """
+    Writes the dataframes to an excel file, with the same values as df.to_excel. The 
+    workbook is in write only mode, and we write the rows in chunks of 
+    EXCEL_WRITE_CHUNK_NUM_ROWS, so the memory used does not grow with the number of 
+    rows in the dataframes.
+
+    If allow_formatting, the formatting is the same as add_formatting_to_excel_sheet 
+    gives. It is applied as the rows are written, with a style for each column and
+    conditional formats for the rows, rather than by styling each cell afterwards.
+    """
+    workbook = Workbook(write_only=True)
+    for sheet_index in sheet_indexes:
+        df = state.dfs[sheet_index]
+        worksheet = workbook.create_sheet(get_df_name_as_valid_sheet_name(state.df_names[sheet_index]))
+        format = state.df_formats[sheet_index] if allow_formatting else {}
+
+        header_background_color = format.get('headers', {}).get('backgroundColor')
+        header_font_color = format.get('headers', {}).get('color')
+        header_cells = []
+        for column_header in df.columns:
+            header_cell = WriteOnlyCell(worksheet, value=_get_excel_value(column_header, worksheet))
+            if header_background_color or header_font_color:
+                header_cell.font, header_fill = get_header_font_and_fill(header_background_color, header_font_color)
+                if header_fill is not None:
+                    header_cell.fill = header_fill
+            else:
+                # The header has the same style as df.to_excel gives it
+                header_cell.font = Font(bold=True)
+                header_cell.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+                header_cell.alignment = Alignment(horizontal='center', vertical='top')
+            header_cells.append(header_cell)
+        worksheet.append(header_cells)
+
+        # As each row is written as soon as it is appended, we can reuse one cell
+        # for all the values in a column with a number format
+        column_number_format_cells: Dict[int, Any] = {}
+        if allow_formatting:
+            column_number_formats = get_column_number_formats(get_number_formats_objects_to_export_to_excel(df, format.get('columns')), df)
+            column_number_format_cells = {
+                column_index: _get_excel_cell_with_number_format(None, number_format, worksheet) 
+                for column_index, number_format in column_number_formats.items()
+            }
+
+        for start_row_index in range(0, len(df.index), EXCEL_WRITE_CHUNK_NUM_ROWS):
+            chunk_df = df.iloc[start_row_index:start_row_index + EXCEL_WRITE_CHUNK_NUM_ROWS]
+            column_values = [_get_excel_values_of_series(chunk_df.iloc[:, column_index], worksheet) for column_index in range(len(chunk_df.columns))]
+            for row in zip(*column_values):
+                if len(column_number_format_cells) > 0:
+                    row = _get_row_with_number_formats(row, column_number_format_cells)
+                worksheet.append(row)
+
+        if allow_formatting:
+            conditional_formats = get_conditional_formats_objects_to_export_to_excel(
+                format.get('conditional_formats'),
+                column_id_map=state.column_ids,
+                sheet_index=sheet_index
+            )
+            # The conditional formats are added before the row formatting, so they take priority
+            add_conditional_formats(conditional_formats, worksheet, df)
+            add_banded_row_formats(
+                worksheet,
+                len(df.index),
+                len(df.columns),
+                even_background_color=format.get('rows', {}).get('even', {}).get('backgroundColor'),
+                even_font_color=format.get('rows', {}).get('even', {}).get('color'),
+                odd_background_color=format.get('rows', {}).get('odd', {}).get('backgroundColor'),
+                odd_font_color=format.get('rows', {}).get('odd', {}).get('color'),
+            )
+
+    workbook.save(path)
+
+
+def _get_row_with_number_formats(row: Tuple[Any, ...], column_number_format_cells: Dict[int, Any]) -> List[Any]:
+    """
+    Returns the row with the values in columns with a number format set on the cell
+    of that column, or on the value itself if it is already a cell.
+    """
+    new_row = list(row)
+    for column_index, number_format_cell in column_number_format_cells.items():
+        value = new_row[column_index]
+        if value is None:
+            continue
+        if isinstance(value, Cell):
+            value.number_format = number_format_cell.number_format
+        else:
+            number_format_cell.value = value
+            new_row[column_index] = number_format_cell
+    return new_row
+
+
+def _get_excel_values_of_series(series: pd.Series, worksheet: Any) -> List[Any]:
+    """
+    Returns the values of the series as they are written to excel by _get_excel_value, 
+    converting whole columns of numbers at once.
+    """
+    if series.dtype.kind == 'f':
+        float_values = series.to_numpy(dtype=float, na_value=np.nan)
+        values = float_values.astype(object)
+        values[np.isnan(float_values)] = None
+        values[np.isposinf(float_values)] = 'inf'
+        values[np.isneginf(float_values)] = '-inf'
+        return values.tolist()
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in ('i', 'u', 'b'):
+        return series.tolist()
+    return [_get_excel_value(value, worksheet) for value in series.astype(object).tolist()]
+
+
+def _get_excel_value(value: Any, worksheet: Any) -> Any:
+    """
+    Returns the value to write to excel, which is the same as df.to_excel writes, 
+    and is a cell if the value needs a number format. Missing values are None.
+    """
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        if np.isnan(value):
+            return None
+        if np.isinf(value):
+            return 'inf' if value > 0 else '-inf'
+        return value
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            raise ValueError("Excel does not support datetimes with timezones. Please ensure that datetimes are timezone unaware before writing to Excel.")
+        if isinstance(value, pd.Timestamp):
+            value = value.to_pydatetime()
+        return _get_excel_cell_with_number_format(value, EXCEL_DATETIME_NUMBER_FORMAT, worksheet)
+    if isinstance(value, datetime.date):
+        return _get_excel_cell_with_number_format(value, EXCEL_DATE_NUMBER_FORMAT, worksheet)
+    if isinstance(value, datetime.timedelta):
+        return _get_excel_cell_with_number_format(value.total_seconds() / 86400, '0', worksheet)
+    return str(value)
+
+
+def _get_excel_cell_with_number_format(value: Any, number_format: str, worksheet: Any) -> Any:
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.number_format = number_format
+    return cell
+
     
 def is_valid_hex_color(color: str) -> bool:
 
@@ -411,7 +596,9 @@ def df_to_json_dumpsable(
         column_headers_to_column_ids: Dict[ColumnHeader, ColumnID],
         df_format: DataframeFormat,
         max_rows: Optional[int]=MAX_ROWS, # How many items you want to display. None when using this function to get unique value counts
-        max_columns: int=MAX_COLUMNS # How many columns you want to display. Unlike max_rows, this is always defined
+        max_columns: int=MAX_COLUMNS, # How many columns you want to display. Unlike max_rows, this is always defined
+        start_row: int=0, # The first row to display, for when the frontend requests a window of the dataframe
+        start_column: int=0 # The first column to display. Columns outside of the window have no column data
     ) -> Dict[str, Any]:
     """
     Returns a dataframe and other metadata represented in a way that can be turned into a 
@@ -441,26 +628,25 @@ def df_to_json_dumpsable(
 
     (num_rows, num_columns) = original_df.shape 
 
-    json_obj = convert_df_to_parsed_json(original_df, max_rows=max_rows, max_columns=max_columns)
+    json_obj = convert_df_to_parsed_columnar_json(original_df, max_rows=max_rows, max_columns=max_columns, start_row=start_row, start_column=start_column)
+    num_rows_in_window = len(json_obj['index'])
 
     final_data = []
     column_dtype_map = {}
     for column_index, column_header in enumerate(original_df.columns):
         column_id = _get_column_id_from_header_safe(column_header, column_headers_to_column_ids)
+        column_dtype = str(original_df.dtypes.iloc[column_index])
 
-        column_final_data: Dict[str, Any] = {
+        # If we're outside of the column window, we don't have data, and we leave column data empty
+        column_in_window = start_column <= column_index < start_column + max_columns
+
+        final_data.append({
             'columnID': column_id,
             'columnHeader': get_column_header_display(column_header),
-            'columnDtype': str(original_df[column_header].dtype),
-            'columnData': [],
-        }
-        column_dtype_map[column_id] = str(original_df[column_header].dtype)
-        for row in json_obj['data']:
-            # If we're beyond the max columns, we might not have data, and we leave column data empty
-            # in this case and don't append anything
-            column_final_data['columnData'].append(row[column_index] if column_index < MAX_COLUMNS else None)
-        
-        final_data.append(column_final_data) 
+            'columnDtype': column_dtype,
+            'columnData': json_obj['data'][column_index - start_column] if column_in_window else [None] * num_rows_in_window,
+        })
+        column_dtype_map[column_id] = column_dtype
 
     # Import just before we use it to avoid circular imports
     from mitosheet.pro.conditional_formatting_utils import get_conditonal_formatting_result
@@ -488,11 +674,70 @@ def df_to_json_dumpsable(
             original_df,
             df_format['conditional_formats'],
             max_rows=max_rows,
+            start_row=start_row,
         )
 
     }
 
 
+def _get_column_data_for_json(series: pd.Series) -> List[Any]:
+    """
+    Returns the values of a series as a list that can be turned into JSON, formatted
+    the same way that convert_df_to_parsed_json formats them.
+    """
+    dtype = str(series.dtype)
+
+    # Numpy backed ints and bools are already valid JSON, so we don't need to encode them
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biu':
+        return series.tolist()
+
+    # As are object columns that only contain strings, which is most of them
+    if dtype == 'object' and pd.api.types.infer_dtype(series, skipna=False) == 'string':
+        return series.tolist()
+
+    # NOTE: we don't use date_format='iso' in to_json, see convert_df_to_parsed_json
+    if is_datetime_dtype(dtype):
+        series = series.dt.strftime('%Y-%m-%d %X')
+    elif is_timedelta_dtype(dtype):
+        series = series.apply(lambda x: str(x))
+
+    # Null values (and infinities) are encoded as null, and we send them as 'NaN' for display in the frontend
+    column_data = json.loads(series.to_json(orient='values'))
+    return ['NaN' if value is None else value for value in column_data]
+
+
+def convert_df_to_parsed_columnar_json(
+        original_df: pd.DataFrame, 
+        max_rows: Optional[int]=MAX_ROWS, 
+        max_columns: int=MAX_COLUMNS,
+        start_row: int=0,
+        start_column: int=0
+    ) -> Dict[str, Any]:
+    """
+    Returns the same window of the dataframe as convert_df_to_parsed_json, with the 
+    same formatting, but with the data stored by column rather than by row. 
+    
+    As this is the format the sheet data is sent to the frontend in, this avoids 
+    building and then transposing each row. It also avoids copying the dataframe, as 
+    each column is encoded on its own.
+    """
+    end_row = start_row + max_rows if max_rows is not None else None
+    df = original_df.iloc[start_row:end_row, start_column:start_column + max_columns]
+
+    # We encode the index on its own, by encoding a dataframe with no columns
+    index_df = df.iloc[:, 0:0]
+    if isinstance(index_df.index, pd.DatetimeIndex):
+        index_df.index = index_df.index.strftime('%Y-%m-%d %X')
+    elif isinstance(index_df.index, pd.TimedeltaIndex):
+        index_df.index = index_df.index.to_series().apply(lambda x: str(x))
+
+    return {
+        'columns': df.columns.tolist(),
+        'index': json.loads(index_df.to_json(orient="split"))['index'],
+        'data': [_get_column_data_for_json(df.iloc[:, column_index]) for column_index in range(df.shape[1])]
+    }
+
+
 def get_row_data_array(df: pd.DataFrame) -> List[Any]:
     """
     Returns just the data of a dataframe in the 2d array format of [row idx][col idx]
@@ -500,18 +745,27 @@ def get_row_data_array(df: pd.DataFrame) -> List[Any]:
     json_obj = convert_df_to_parsed_json(df)
     return json_obj['data']
 
-def convert_df_to_parsed_json(original_df: pd.DataFrame, max_rows: Optional[int]=MAX_ROWS, max_columns: int=MAX_COLUMNS) -> Dict[str, Any]:
+def convert_df_to_parsed_json(
+        original_df: pd.DataFrame, 
+        max_rows: Optional[int]=MAX_ROWS, 
+        max_columns: int=MAX_COLUMNS,
+        start_row: int=0,
+        start_column: int=0
+    ) -> Dict[str, Any]:
     """
-    Returns a dataframe as a json object with the correct formatting
+    Returns a dataframe as a json object with the correct formatting. 
+    
+    Only the window of max_rows rows starting at start_row, and max_columns columns
+    starting at start_column, is converted.
     """
     if max_rows is None:
-        df = original_df.copy(deep=True) 
+        df = original_df.iloc[start_row:].copy(deep=True) 
     else:
-        # we only show the first max_rows rows!
-        df = original_df.head(n=max_rows).copy(deep=True)
+        # we only show max_rows rows!
+        df = original_df.iloc[start_row:start_row + max_rows].copy(deep=True)
 
-    # we only show the first max_columns columns!
-    df = df.iloc[: , :max_columns]
+    # we only show max_columns columns!
+    df = df.iloc[: , start_column:start_column + max_columns]
 
     float_columns, date_columns, timedelta_columns = get_float_dt_td_columns(df)
     # We figure out which of the columns contain dates, and we
@@ -42,6 +42,11 @@ interface SearchResults {
     matches: {rowIndex: number, colIndex: number}[];
 }
 
+export interface ExcelExport {
+    export_id: string;
+    num_chunks: number;
+}
+
 // "stepIndex" -> fileNames list
 export type ImportSummaries = Record<string, string[]>;
 
@@ -257,33 +262,51 @@ export class MitoAPI {
     }
 
     /*
-        Returns a string encoding of the CSV file to download
+        Returns the total number of matches to the search value, and the matches in
+        the rows starting at startRowIndex (by default, the first 1500 rows)
     */
-    async getSearchMatches(sheetIndex: number, searchValue: string): Promise<MitoAPIResult<SearchResults>> {
+    async getSearchMatches(sheetIndex: number, searchValue: string, startRowIndex?: number): Promise<MitoAPIResult<SearchResults>> {
         return await this.send<SearchResults>({
             'event': 'api_call',
             'type': 'get_search_matches',
             'params': {
                 'sheet_index': sheetIndex,
-                'search_value': searchValue
+                'search_value': searchValue,
+                'start_row_index': startRowIndex ?? 0
             },
         })
     }
 
     /*
-        Returns a string encoding of the excel file to download
+        Exports the sheets to an excel file, and returns the id of the
+        export and the number of chunks to read it in with getExcelExportChunk
+    */
+    async getDataframesAsExcel(sheetIndexes: number[], exportFormatting?: boolean): Promise<MitoAPIResult<ExcelExport>> {
+        return await this.send<ExcelExport>({
+            'event': 'api_call',
+            'type': 'get_dataframe_as_excel',
+            'params': {
+                'sheet_indexes': sheetIndexes,
+                'export_formatting': exportFormatting
+            },
+        });
+    }
+
+    /*
+        Returns a string encoding of a chunk of an exported excel file, or an 
+        error if the export has expired and must be exported again
 
         See the download taskpane to how to use this string, but it
         must be decoded from base64, and then turned into bytes
         before it can be downloaded
     */
-    async getDataframesAsExcel(sheetIndexes: number[], exportFormatting?: boolean): Promise<MitoAPIResult<string>> {
-        return await this.send<string>({
+    async getExcelExportChunk(exportID: string, chunkIndex: number): Promise<MitoAPIResult<{error: string} | string>> {
+        return await this.send<{error: string} | string>({
             'event': 'api_call',
-            'type': 'get_dataframe_as_excel',
+            'type': 'get_excel_export_chunk',
             'params': {
-                'sheet_indexes': sheetIndexes,
-                'export_formatting': exportFormatting
+                'export_id': exportID,
+                'chunk_index': chunkIndex
             },
         });
     }
@@ -575,7 +598,25 @@ export class MitoAPI {
             }
         });
     }
-    
+
+    /*
+        Returns a window of the sheet data, starting at startRow and startColumn, so
+        that rows and columns beyond those in the sheet data can be displayed
+    */
+    async getDataframeWindow(sheetIndex: number, startRow: number, numRows: number, startColumn: number, numColumns: number): Promise<MitoAPIResult<SheetData & {startRow: number, startColumn: number}>> {
+        return await this.send<SheetData & {startRow: number, startColumn: number}>({
+            'event': 'api_call',
+            'type': 'get_dataframe_window',
+            'params': {
+                'sheet_index': sheetIndex,
+                'start_row': startRow,
+                'num_rows': numRows,
+                'start_column': startColumn,
+                'num_columns': numColumns
+            }
+        });
+    }
+
 
     // AUTOGENERATED LINE: API GET (DO NOT DELETE)
 
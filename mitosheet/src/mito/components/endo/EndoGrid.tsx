@@ -21,6 +21,7 @@ import { SendFunctionStatus } from "../../api/send";
 import { SearchBar } from "../SearchBar";
 import { Actions } from "../../utils/actions";
 import { getOperatingSystem } from "../../utils/keyboardShortcuts";
+import { useSheetDataWithWindows } from "../../hooks/useSheetDataWithWindows";
 
 // NOTE: these should match the css
 export const DEFAULT_WIDTH = 123;
@@ -30,6 +31,11 @@ export const MIN_WIDTH = 50;
 // The maximum number of rows sent in the sheet data by the backend
 export const MAX_ROWS = 1500;
 
+// The maximum number of rows the user can scroll through. The rows after the first MAX_ROWS
+// are requested from the backend as they are displayed (see useSheetDataWithWindows). Browsers
+// cannot display elements that are much taller than this many rows
+export const MAX_DISPLAYED_ROWS = 500000;
+
 
 export const KEYS_TO_IGNORE_IF_PRESSED_ALONE = [
     'Shift',
@@ -116,16 +122,19 @@ function EndoGrid(props: {
         mitoAPI
     } = props;
 
-    const sheetData = sheetDataArray[sheetIndex];
+    const currentSheetView: SheetView = useMemo(() => {
+        return calculateCurrentSheetView(gridState)
+    }, [gridState])
+
+    // The sheet data from the backend, with the rows in the current sheet view beyond 
+    // the rows in the sheet data added to it
+    const backendSheetData = sheetDataArray[sheetIndex];
+    const sheetData = useSheetDataWithWindows(mitoAPI, backendSheetData, sheetIndex, currentSheetView);
 
     const totalSize: Dimension = {
         width: gridState.widthDataArray[gridState.sheetIndex]?.totalWidth || 0,
-        height: DEFAULT_HEIGHT * Math.min(sheetData?.numRows || 0, MAX_ROWS)
+        height: DEFAULT_HEIGHT * Math.min(sheetData?.numRows || 0, MAX_DISPLAYED_ROWS)
     }
-    
-    const currentSheetView: SheetView = useMemo(() => {
-        return calculateCurrentSheetView(gridState)
-    }, [gridState])
 
     const translate: RendererTranslate = useMemo(() => {
         return calculateTranslate(gridState);
@@ -143,7 +152,7 @@ function EndoGrid(props: {
         setGridState(gridState => {
             return {
                 ...gridState,
-                selections: reconciliateSelections(gridState.sheetIndex, sheetIndex, gridState.selections, gridState.columnIDsArray[gridState.sheetIndex], sheetData),
+                selections: reconciliateSelections(gridState.sheetIndex, sheetIndex, gridState.selections, gridState.columnIDsArray[gridState.sheetIndex], backendSheetData),
                 widthDataArray: reconciliateWidthDataArray(gridState.widthDataArray, gridState.columnIDsArray, sheetDataArray),
                 columnIDsArray: getColumnIDsArrayFromSheetDataArray(sheetDataArray),
                 sheetIndex: sheetIndex,
@@ -151,7 +160,7 @@ function EndoGrid(props: {
                 copiedSelections: []
             }
         })
-    }, [sheetData, setGridState, sheetIndex])
+    }, [backendSheetData, setGridState, sheetIndex])
 
     // A helper function that should be run when the viewport changes sizes
     const resizeViewport = () => {
@@ -1,7 +1,7 @@
 // Copyright (c) Mito
 // Distributed under the terms of the Modified BSD License.
 
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import DefaultTaskpane from '../DefaultTaskpane/DefaultTaskpane';
 import { MitoAPI } from '../../../api/api';
 
@@ -68,14 +68,19 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
     
     const [exportFormatting, setExportFormatting] = useState<boolean>(props.userProfile.isPro);
     
+    // The id of the most recent export we loaded, so that older exports that finish
+    // loading later do not replace it
+    const latestLoadID = useRef<number>(0);
+
     const emptySheet = props.sheetDataArray.length === 0;
     const numRows = props.sheetDataArray[props.selectedSheetIndex]?.numRows;
     
-    const loadExport = async () => {
+    const loadExport = async (retryIfExpired = true) => {
         // Don't try and load data if the sheet is empty
         if (emptySheet) {
             return;
         }
+        const loadID = ++latestLoadID.current;
 
         if (props.uiState.exportConfiguration.exportType === 'csv') {
             const response = await props.mitoAPI.getDataframeAsCSV(props.selectedSheetIndex);
@@ -86,14 +91,40 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
             )));
         } else if (props.uiState.exportConfiguration.exportType === 'excel') {
             const response = await props.mitoAPI.getDataframesAsExcel((props.uiState.exportConfiguration as ExcelExportState).sheetIndexes, exportFormatting);
-            const excelString = 'error' in response ? '' : response.result;
+            const excelExport = 'error' in response ? undefined : response.result;
+            if (!excelExport) {
+                return;
+            }
             try {
-                const arr = [ Uint8Array.from(window.atob(excelString), c => c.charCodeAt(0)) ];
-                setExportHref(URL.createObjectURL(new Blob(
+                // We read the file in chunks, so that it is never one large string
+                const arr: Uint8Array[] = [];
+                for (let chunkIndex = 0; chunkIndex < excelExport.num_chunks; chunkIndex++) {
+                    if (loadID !== latestLoadID.current) {
+                        return;
+                    }
+                    const chunkResponse = await props.mitoAPI.getExcelExportChunk(excelExport.export_id, chunkIndex);
+                    const chunkStringOrError = 'error' in chunkResponse ? undefined : chunkResponse.result;
+                    if (chunkStringOrError !== undefined && typeof chunkStringOrError === 'object') {
+                        // If the export expired before we read it all, we export again once
+                        console.error(chunkStringOrError.error);
+                        if (retryIfExpired && loadID === latestLoadID.current) {
+                            await loadExport(false);
+                        }
+                        return;
+                    }
+                    if (!chunkStringOrError) {
+                        return;
+                    }
                     /* 
-                        First, we convert the export string out of base 64 encoding, 
+                        First, we convert the chunk string out of base 64 encoding, 
                         and the convert it back into bytes
                     */
+                    arr.push(Uint8Array.from(window.atob(chunkStringOrError), c => c.charCodeAt(0)));
+                }
+                if (loadID !== latestLoadID.current) {
+                    return;
+                }
+                setExportHref(URL.createObjectURL(new Blob(
                     arr,
                     { type: 'text/csv' } // TODO: for some reason, text/csv works fine here
                 )));
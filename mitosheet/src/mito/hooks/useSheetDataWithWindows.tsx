@@ -0,0 +1,128 @@
+import { useEffect, useMemo, useRef, useState } from "react";
+import { MitoAPI } from "../api/api";
+import { SheetData, SheetView } from "../types";
+
+// The number of rows in each window of sheet data we get from the backend. Windows start
+// at multiples of this, so scrolling back and forth requests the same windows
+export const SHEET_DATA_WINDOW_NUM_ROWS = 1500;
+
+// The most windows we keep for a sheet, as each window holds all its rows
+const MAX_SHEET_DATA_WINDOWS = 10;
+
+type SheetDataWindow = SheetData & {startRow: number, startColumn: number};
+
+/*
+    The sheet data only contains the first rows of the sheet. This hook gets windows of
+    the sheet data that contain the rows in the current sheet view from the backend
+    as the user scrolls, and returns the sheet data with these rows added, so that the
+    rest of the grid can display them like any other rows.
+
+    Windows are only used with the sheet data they were requested for, so they are
+    dropped whenever the sheet data changes.
+*/
+export const useSheetDataWithWindows = (
+    mitoAPI: MitoAPI,
+    sheetData: SheetData | undefined,
+    sheetIndex: number,
+    currentSheetView: SheetView,
+): SheetData | undefined => {
+    const [sheetDataWindows, setSheetDataWindows] = useState<{sheetData: SheetData | undefined, windows: SheetDataWindow[]}>({sheetData: sheetData, windows: []});
+    // The start rows of the windows we have requested for the current sheet data
+    const requestedWindowStartRows = useRef<{sheetData: SheetData | undefined, startRows: Set<number>}>({sheetData: sheetData, startRows: new Set()});
+
+    const numSheetDataRows = sheetData?.index.length || 0;
+    const firstRowIndex = currentSheetView.startingRowIndex;
+    const lastRowIndex = Math.min(currentSheetView.startingRowIndex + currentSheetView.numRowsRendered, sheetData?.numRows || 0) - 1;
+
+    useEffect(() => {
+        if (sheetData === undefined || lastRowIndex < numSheetDataRows) {
+            return;
+        }
+
+        if (requestedWindowStartRows.current.sheetData !== sheetData) {
+            requestedWindowStartRows.current = {sheetData: sheetData, startRows: new Set()};
+        }
+        const startRows = requestedWindowStartRows.current.startRows;
+
+        const firstWindowStartRow = Math.floor(Math.max(firstRowIndex, numSheetDataRows) / SHEET_DATA_WINDOW_NUM_ROWS) * SHEET_DATA_WINDOW_NUM_ROWS;
+        for (let startRow = firstWindowStartRow; startRow <= lastRowIndex; startRow += SHEET_DATA_WINDOW_NUM_ROWS) {
+            if (startRows.has(startRow)) {
+                continue;
+            }
+            startRows.add(startRow);
+
+            void mitoAPI.getDataframeWindow(sheetIndex, startRow, SHEET_DATA_WINDOW_NUM_ROWS, 0, sheetData.data.length).then((response) => {
+                if ('error' in response || response.result === null || response.result === undefined) {
+                    // Let the window be requested again the next time it is displayed
+                    startRows.delete(startRow);
+                    return;
+                }
+                const sheetDataWindow = response.result;
+
+                setSheetDataWindows(prevSheetDataWindows => {
+                    const prevWindows = prevSheetDataWindows.sheetData === sheetData ? prevSheetDataWindows.windows : [];
+                    const windows = [...prevWindows, sheetDataWindow];
+
+                    // Drop the oldest windows, and let them be requested again
+                    while (windows.length > MAX_SHEET_DATA_WINDOWS) {
+                        const droppedWindow = windows.shift();
+                        if (droppedWindow !== undefined) {
+                            startRows.delete(droppedWindow.startRow);
+                        }
+                    }
+
+                    return {sheetData: sheetData, windows: windows};
+                })
+            })
+        }
+    }, [mitoAPI, sheetData, sheetIndex, firstRowIndex, lastRowIndex, numSheetDataRows])
+
+    return useMemo(() => {
+        if (sheetData === undefined || sheetDataWindows.sheetData !== sheetData || sheetDataWindows.windows.length === 0) {
+            return sheetData;
+        }
+        return getSheetDataWithWindows(sheetData, sheetDataWindows.windows);
+    }, [sheetData, sheetDataWindows])
+}
+
+
+/*
+    Returns a copy of the sheet data with the rows in the windows placed at their row
+    indexes, so the data and index of the sheet data are sparse past its first rows.
+*/
+const getSheetDataWithWindows = (sheetData: SheetData, windows: SheetDataWindow[]): SheetData => {
+    const data = sheetData.data.map(column => {return {...column, columnData: [...column.columnData]}});
+    const index = [...sheetData.index];
+    const conditionalFormattingResults = {...sheetData.conditionalFormattingResult.results};
+
+    windows.forEach(sheetDataWindow => {
+        sheetDataWindow.index.forEach((indexLabel, windowRowIndex) => {
+            index[sheetDataWindow.startRow + windowRowIndex] = indexLabel;
+        })
+
+        // NOTE: windows have all the columns of the sheet, but only the columns from their startColumn have data
+        sheetDataWindow.data.forEach((windowColumn, columnIndex) => {
+            const column = data[columnIndex];
+            if (column === undefined || columnIndex < sheetDataWindow.startColumn || column.columnID !== windowColumn.columnID) {
+                return;
+            }
+            windowColumn.columnData.forEach((value, windowRowIndex) => {
+                column.columnData[sheetDataWindow.startRow + windowRowIndex] = value;
+            })
+        })
+
+        Object.entries(sheetDataWindow.conditionalFormattingResult.results).forEach(([columnID, results]) => {
+            conditionalFormattingResults[columnID] = {...conditionalFormattingResults[columnID], ...results};
+        })
+    })
+
+    return {
+        ...sheetData,
+        data: data,
+        index: index,
+        conditionalFormattingResult: {
+            ...sheetData.conditionalFormattingResult,
+            results: conditionalFormattingResults
+        }
+    }
+}
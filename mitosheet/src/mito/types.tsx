@@ -735,6 +735,8 @@ export enum MitoEnterpriseConfigKey {
     ENTERPRISE = 'MITO_CONFIG_ENTERPRISE',
     CUSTOM_SHEET_FUNCTIONS_PATH = 'MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH',
     CUSTOM_IMPORTERS_PATH = 'MITO_CONFIG_CUSTOM_IMPORTERS_PATH',
+    STEP_HISTORY_MEMORY_LIMIT_MB = 'MITO_CONFIG_STEP_HISTORY_MEMORY_LIMIT_MB',
+    ENABLE_PYARROW_CSV_ENGINE = 'MITO_CONFIG_FEATURE_ENABLE_PYARROW_CSV_ENGINE',
 }
 
 export type PublicInterfaceVersion = 1 | 2 | 3;
@@ -824,6 +826,8 @@ export interface MitoConfig {
     [MitoEnterpriseConfigKey.LOG_SERVER_URL]: string,
     [MitoEnterpriseConfigKey.LOG_SERVER_BATCH_INTERVAL]: string,
     [MitoEnterpriseConfigKey.ANALYTICS_URL]: string
+    [MitoEnterpriseConfigKey.STEP_HISTORY_MEMORY_LIMIT_MB]: number | null
+    [MitoEnterpriseConfigKey.ENABLE_PYARROW_CSV_ENGINE]: boolean
 }
 
 
@@ -25,7 +25,8 @@ const getCopyStringForRow = (sheetData: SheetData, rowIndex: number, lowColIndex
             }
         } else {
             if (columnIndex === -1) {
-                copyString += sheetData.index[rowIndex];
+                // Rows beyond the sheet data are only in the sheet data once they are displayed
+                copyString += sheetData.index[rowIndex] ?? '';
             } else {
                 const columnID = getColumnIDByIndex(sheetData, columnIndex);
                 copyString += getCopyStringForValue(